@@ -18,7 +18,7 @@
 
 from math import pi
 
-__all__ = ["TODEGREES", "TORADIANS"]
+__all__ = ["TODEGREES", "TORADIANS", "K_BOLTZMANN"]
 
 RED = "#FF4D67"
 GREEN = "#58EC2E"
@@ -30,3 +30,6 @@ TODEGREES = 180.0 / pi
 
 
 TORADIANS = pi / 180.0
+
+# Boltzmann constant in meV / K
+K_BOLTZMANN = 8.617333262e-2
@@ -31,6 +31,7 @@ from .kpoints import *
 from .lattice import *
 from .lattice_plotter import *
 from .properties import *
+from .symmetry import *
 
 __all__ = ["Atom", "Crystal", "Cell", "crystal_constants"]
 __all__.extend(bravais_lattice.__all__)
@@ -39,3 +40,4 @@ __all__.extend(kpoints.__all__)
 __all__.extend(identify.__all__)
 __all__.extend(properties.__all__)
 __all__.extend(lattice_plotter.__all__)
+__all__.extend(symmetry.__all__)
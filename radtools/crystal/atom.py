@@ -116,7 +116,7 @@ class Atom:
         return self.name == other.name and self.index == other.index
 
     def __hash__(self):
-        return hash(str(self.name) + str(self.index))
+        return hash((self._name, self.index))
 
     # !=
     def __neq__(self, other):
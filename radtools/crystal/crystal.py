@@ -17,9 +17,11 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from math import floor, log10
+from operator import attrgetter, is_
 from typing import Union
 
 import numpy as np
+from scipy.spatial import cKDTree
 
 import radtools.crystal.cell as Cell
 from radtools.crystal.atom import Atom
@@ -76,6 +78,8 @@ class Crystal(Lattice):
         standardize=True,
         **kwargs,
     ) -> None:
+        self._lookup = None
+        self._atoms_version = 0
         self.atoms = []
         if lattice is None:
             if len(kwargs) == 0:
@@ -100,7 +104,7 @@ class Crystal(Lattice):
                 return True
             except ValueError:
                 return False
-        return atom in self.atoms
+        return self._has_atom(atom)
 
     def __len__(self):
         return self.atoms.__len__()
@@ -110,7 +114,7 @@ class Crystal(Lattice):
 
     def __getattr__(self, name):
         # Fix copy/deepcopy RecursionError
-        if name in ["__setstate__"]:
+        if name in ["__setstate__", "_lookup", "_atoms_version"]:
             raise AttributeError(name)
         try:
             atom = self.get_atom(name=name)
@@ -118,6 +122,149 @@ class Crystal(Lattice):
         except ValueError:
             raise AttributeError(f"'Crystal' object has no attribute '{name}'")
 
+    def _atom_lookup(self, rebuild=False):
+        r"""
+        Dictionaries for the lookup of the atoms.
+
+        They are rebuilt if :py:attr:`.atoms` is replaced by another list, if its length
+        changes or if the atoms are added or removed by the methods of the crystal.
+        Changes of the atoms in place are detected by :py:meth:`._find_slots`.
+
+        Parameters
+        ----------
+        rebuild : bool, default False
+            Whether to rebuild the dictionaries unconditionally.
+
+        Returns
+        -------
+        lookup : dict
+            Dictionaries "name", "key" ((name, index)) and "fullname" with the lists
+            of the positions of matching atoms in :py:attr:`.atoms` and the copy of
+            :py:attr:`.atoms` ("atoms") and of their names and indices ("keys")
+            at the moment of the build.
+        """
+
+        state = (id(self.atoms), len(self.atoms), self._atoms_version)
+        if rebuild or self._lookup is None or self._lookup["state"] != state:
+            self._lookup = {
+                "state": state,
+                "atoms": [],
+                "keys": [],
+                "name": {},
+                "key": {},
+                "fullname": {},
+            }
+            for atom in self.atoms:
+                self._register_atom(atom)
+        return self._lookup
+
+    def _register_atom(self, atom: Atom):
+        slot = len(self._lookup["atoms"])
+        self._lookup["atoms"].append(atom)
+        self._lookup["keys"].append((atom._name, atom._index))
+        self._lookup["name"].setdefault(atom.name, []).append(slot)
+        self._lookup["key"].setdefault((atom.name, atom._index), []).append(slot)
+        self._lookup["fullname"].setdefault(atom.fullname, []).append(slot)
+
+    def _valid_slots(self, slots, matches):
+        r"""
+        Whether the positions still hold the same atoms, which match the query.
+        """
+
+        atoms = self._lookup["atoms"]
+        for slot in slots:
+            if slot >= len(self.atoms) or self.atoms[slot] is not atoms[slot]:
+                return False
+            if not matches(atoms[slot]):
+                return False
+        return True
+
+    def _lookup_is_current(self):
+        r"""
+        Whether :py:attr:`.atoms` holds the same atoms with the same names and indices
+        as at the moment of the build of the dictionaries.
+        """
+
+        return (
+            all(map(is_, self.atoms, self._lookup["atoms"]))
+            and list(map(attrgetter("_name", "_index"), self.atoms))
+            == self._lookup["keys"]
+        )
+
+    def _find_slots(self, name, index=None):
+        r"""
+        Positions of the matching atoms in :py:attr:`.atoms`.
+
+        Cached positions are checked and the dictionaries are rebuilt if they are
+        stale or if nothing is found and the atoms were modified in place.
+        """
+
+        if index is None and "__" in name:
+            dictionary, key = "fullname", name
+            matches = lambda atom: atom.fullname == name
+        elif index is None:
+            dictionary, key = "name", name
+            matches = lambda atom: atom.name == name
+        else:
+            dictionary, key = "key", (name, index)
+            matches = lambda atom: atom.name == name and atom._index == index
+
+        slots = self._atom_lookup()[dictionary].get(key, [])
+        if len(slots) != 0 and self._valid_slots(slots, matches):
+            return list(slots)
+        # Stale hit or a miss after the atoms were modified in place
+        if len(slots) != 0 or not self._lookup_is_current():
+            slots = self._atom_lookup(rebuild=True)[dictionary].get(key, [])
+            if len(slots) != 0:
+                return list(slots)
+
+        if index is None and "__" in name:
+            name, index = name.split("__")
+            return self._find_slots(name, int(index))
+        return []
+
+    def _has_atom(self, atom: Atom):
+        try:
+            key = (atom.name, atom.index)
+        except ValueError:
+            return atom in self.atoms
+        return len(self._find_slots(*key)) != 0
+
+    def get_atom_slot(self, atom: Union[Atom, str], index=None) -> int:
+        r"""
+        Position of the atom in :py:attr:`.Crystal.atoms`.
+
+        Lets the array-based code refer to the atoms by integers, for example in
+        :py:meth:`.get_vectors`.
+
+        .. versionadded:: 0.8.10
+
+        Parameters
+        ----------
+        atom : :py:class:`.Atom` or str
+            :py:class`.Atom` object or atom`s name.
+            If name, then it has to be unique among atoms of the crystal.
+        index : int, optional
+            Index of the atom.
+
+        Returns
+        -------
+        slot : int
+            Position of the atom in :py:attr:`.Crystal.atoms`.
+
+        Raises
+        ------
+        ValueError
+            If there is no such atom in the crystal.
+        """
+
+        if isinstance(atom, str):
+            atom = self.get_atom(atom, index=index)
+        slots = self._find_slots(atom.name, atom.index)
+        if len(slots) == 0:
+            raise ValueError(f"There is no {atom} in the crystal.")
+        return slots[0]
+
     @property
     def lattice(self):
         r"""
@@ -185,8 +332,12 @@ class Crystal(Lattice):
         if not relative:
             new_atom.position = absolute_to_relative(self.cell, new_atom.position)
 
-        if new_atom not in self.atoms:
+        if not self._has_atom(new_atom):
+            lookup = self._atom_lookup()
             self.atoms.append(new_atom)
+            self._atoms_version += 1
+            self._register_atom(new_atom)
+            lookup["state"] = (id(self.atoms), len(self.atoms), self._atoms_version)
         else:
             raise ValueError("Atom is already in the crystal.")
 
@@ -219,6 +370,7 @@ class Crystal(Lattice):
             atoms = [atom]
         for atom in atoms:
             self.atoms.remove(atom)
+        self._atoms_version += 1
 
     # Modification of position has to be avoided here.
     def get_atom(self, name, index=None, return_all=False):
@@ -254,17 +406,12 @@ class Crystal(Lattice):
             If no match is found or the match is not unique and ``return_all`` is ``False``.
         """
 
-        atoms = []
-        if "__" in name and index is None:
-            name, index = name.split("__")
-            index = int(index)
-
-        for atom in self.atoms:
-            if atom.name == name:
-                if index is None or atom.index == index:
-                    atoms.append(atom)
+        atoms = [self.atoms[slot] for slot in self._find_slots(name, index)]
 
         if len(atoms) == 0:
+            if "__" in name and index is None:
+                name, index = name.split("__")
+                index = int(index)
             raise ValueError(f"No match found for name = {name}, index = {index}")
         elif len(atoms) == 1:
             if return_all:
@@ -302,7 +449,7 @@ class Crystal(Lattice):
 
         if isinstance(atom, str):
             atom = self.get_atom(atom, index=index)
-        elif atom not in self.atoms:
+        elif not self._has_atom(atom):
             raise ValueError(f"There is no {atom} in the crystal.")
 
         rel_coordinates = np.array(R + atom.position)
@@ -393,6 +540,190 @@ class Crystal(Lattice):
             )
         )
 
+    def get_vectors(self, i, j, R=None, atoms=None, relative=False):
+        r"""
+        Vectors between many pairs of atoms at once.
+
+        Array version of :py:meth:`.get_vector`.
+
+        .. versionadded:: 0.8.10
+
+        Parameters
+        ----------
+        i : (M,) |array_like|_
+            Indices of the first atoms (in (0, 0, 0) unit cell) in ``atoms``.
+        j : (M,) |array_like|_
+            Indices of the second atoms (in ``R`` unit cell) in ``atoms``.
+        R : (M, 3) |array_like|_, optional
+            Radius vectors of the unit cells for the second atoms (relative
+            coordinates). By default all are (0, 0, 0).
+        atoms : list of :py:class:`.Atom`, optional
+            Atoms to which ``i`` and ``j`` refer. By default :py:attr:`.Crystal.atoms`.
+        relative : bool, default False
+            Whether to return the vectors in relative coordinates.
+
+        Returns
+        -------
+        vectors : (M, 3) :numpy:`ndarray`
+            Vectors from atoms ``i`` in (0, 0, 0) cell to atoms ``j`` in R cells.
+
+        See Also
+        --------
+        get_distances
+        """
+
+        if atoms is None:
+            atoms = self.atoms
+        positions = np.array([atom.position for atom in atoms], dtype=float).reshape(
+            (-1, 3)
+        )
+        coordinates1 = positions[np.asarray(i, dtype=int)]
+        coordinates2 = positions[np.asarray(j, dtype=int)]
+        if R is not None:
+            coordinates2 = np.asarray(R, dtype=float).reshape((-1, 3)) + coordinates2
+        if relative:
+            return coordinates2 - coordinates1
+        return coordinates2 @ self.cell - coordinates1 @ self.cell
+
+    def get_distances(self, i, j, R=None, atoms=None, relative=False):
+        r"""
+        Distances between many pairs of atoms at once.
+
+        Array version of :py:meth:`.get_distance`.
+
+        .. versionadded:: 0.8.10
+
+        Parameters
+        ----------
+        i : (M,) |array_like|_
+            Indices of the first atoms (in (0, 0, 0) unit cell) in ``atoms``.
+        j : (M,) |array_like|_
+            Indices of the second atoms (in ``R`` unit cell) in ``atoms``.
+        R : (M, 3) |array_like|_, optional
+            Radius vectors of the unit cells for the second atoms (relative
+            coordinates). By default all are (0, 0, 0).
+        atoms : list of :py:class:`.Atom`, optional
+            Atoms to which ``i`` and ``j`` refer. By default :py:attr:`.Crystal.atoms`.
+        relative : bool, default False
+            Whether to use relative coordinates.
+
+        Returns
+        -------
+        distances : (M,) :numpy:`ndarray`
+            Distances between atoms ``i`` in (0, 0, 0) cell and atoms ``j`` in R cells.
+
+        See Also
+        --------
+        get_vectors
+        """
+
+        return np.linalg.norm(
+            self.get_vectors(i, j, R, atoms=atoms, relative=relative), axis=1
+        )
+
+    def find_neighbors(self, cutoff, atoms=None, eps=1e-5, unique=False, shells=False):
+        r"""
+        All pairs of atoms within the cutoff distance.
+
+        Periodic images of the atoms are generated in all unit cells, which can
+        host a neighbor, and the pairs are found with the KD-tree
+        (:py:class:`scipy.spatial.cKDTree`), without the loop over the pairs.
+
+        .. versionadded:: 0.8.10
+
+        Parameters
+        ----------
+        cutoff : float
+            Maximum distance between the atoms (inclusive).
+        atoms : list of :py:class:`.Atom`, optional
+            Atoms to consider. By default :py:attr:`.Crystal.atoms`.
+        eps : float, default 1e-5
+            Tolerance for the cutoff and for the grouping into the shells.
+        unique : bool, default False
+            Whether to keep only one of the bonds (atom1, atom2, R) and
+            (atom2, atom1, -R). The kept one has R with the first non-zero
+            component positive or, if R = (0, 0, 0), ``i < j``.
+        shells : bool, default False
+            Whether to return the numbers of the distance shells.
+
+        Returns
+        -------
+        i : (M,) :numpy:`ndarray`
+            Indices of the first atoms (in (0, 0, 0) unit cell) in ``atoms``.
+        j : (M,) :numpy:`ndarray`
+            Indices of the second atoms (in ``R`` unit cell) in ``atoms``.
+        R : (M, 3) :numpy:`ndarray`
+            Radius vectors of the unit cells for the second atoms (relative
+            coordinates).
+        distances : (M,) :numpy:`ndarray`
+            Distances between the atoms. Pairs are sorted by them.
+        shells : (M,) :numpy:`ndarray`
+            Returned only if ``shells`` is True. Number of the shell (starting
+            from 0) for each pair. Distances of the pairs in the same shell
+            differ by no more than ``eps`` from the neighboring ones.
+
+        See Also
+        --------
+        get_distances
+        SpinHamiltonian.add_bonds
+
+        Examples
+        --------
+
+        .. doctest::
+
+            >>> import radtools as rad
+            >>> crystal = rad.Crystal()
+            >>> crystal.add_atom(rad.Atom("Fe", (0, 0, 0)))
+            >>> i, j, R, d, shells = crystal.find_neighbors(1.5, shells=True)
+            >>> len(d), int(shells.max())
+            (18, 1)
+        """
+
+        if atoms is None:
+            atoms = self.atoms
+        positions = np.array([atom.position for atom in atoms], dtype=float).reshape(
+            (-1, 3)
+        )
+        n_atoms = len(positions)
+
+        # Distance between the planes of the lattice along each lattice vector
+        heights = 1 / np.linalg.norm(np.linalg.inv(self.cell), axis=0)
+        if n_atoms != 0:
+            span = positions.max(axis=0) - positions.min(axis=0)
+        else:
+            span = np.zeros(3)
+        n_cells = np.ceil((cutoff + eps) / heights + span).astype(int)
+        cells = np.indices(2 * n_cells + 1).reshape((3, -1)).T - n_cells
+
+        images = (cells[:, np.newaxis, :] + positions).reshape((-1, 3)) @ self.cell
+        pairs = cKDTree(positions @ self.cell).sparse_distance_matrix(
+            cKDTree(images), cutoff + eps, output_type="ndarray"
+        )
+        i = pairs["i"].astype(int)
+        j = pairs["j"] % max(n_atoms, 1)
+        R = cells[pairs["j"] // max(n_atoms, 1)]
+        distances = pairs["v"]
+
+        zero = (R == 0).all(axis=1)
+        keep = ~(zero & (i == j))
+        if unique:
+            first = np.where(
+                R[:, 0] != 0, R[:, 0], np.where(R[:, 1] != 0, R[:, 1], R[:, 2])
+            )
+            keep &= (first > 0) | (zero & (i < j))
+        i, j, R, distances = i[keep], j[keep], R[keep], distances[keep]
+
+        sorted_distances = np.sort(distances)
+        steps = np.concatenate(([0], np.diff(sorted_distances) > eps))
+        shell_numbers = np.cumsum(steps)[np.searchsorted(sorted_distances, distances)]
+
+        order = np.lexsort((R[:, 2], R[:, 1], R[:, 0], j, i, shell_numbers))
+        result = (i[order], j[order], R[order], distances[order])
+        if shells:
+            return result + (shell_numbers[order],)
+        return result
+
     def find_primitive_cell(self):
         r"""
         Detect primitive cell.
@@ -26,7 +26,7 @@ import numpy as np
 
 from radtools.geometry import absolute_to_relative
 
-__all__ = ["Kpoints"]
+__all__ = ["Kpoints", "monkhorst_pack"]
 
 
 class Kpoints:
@@ -385,3 +385,164 @@ class Kpoints:
                     delta += flatten_points[-1]
                     flatten_points = np.concatenate((flatten_points, delta))
         return flatten_points
+
+    def adaptive_points(
+        self, function, relative=False, tolerance=1e-2, n_start=10, max_depth=8
+    ):
+        r"""
+        Non-uniform points along the path, refined where the dispersion is not linear.
+
+        Each segment between the high symmetry points starts with ``n_start`` points
+        (high symmetry points excluded). Each interval between the neighbouring points
+        is bisected if the value at the midpoint deviates from the linear interpolation
+        by more than ``tolerance`` or if the bands become nearly degenerate inside
+        the interval. Intervals are refined recursively, up to ``max_depth`` times.
+        Midpoints of all intervals are computed with one call of ``function``
+        on each level of the refinement.
+
+        .. versionadded:: 0.8.10
+
+        Parameters
+        ----------
+        function : callable
+            Dispersion, for example :py:class:`.MagnonDispersion`. It takes (M, 3)
+            :numpy:`ndarray` of k points and returns (M,) or (n_bands, M) |array_like|_.
+        relative : bool, optional
+            Whether to use relative coordinates instead of the absolute ones.
+            Both for the points, which are passed to the ``function``,
+            and for the returned ones.
+        tolerance : float, default 1e-2
+            Tolerance of the linear interpolation, relative to the range of the values
+            on the initial points.
+        n_start : int, default 10
+            Number of points between each pair of the high symmetry points
+            (high symmetry points excluded) before the refinement.
+        max_depth : int, default 8
+            Maximum number of bisections of each initial interval.
+
+        Returns
+        -------
+        points : (N, 3) :numpy:`ndarray`
+            Coordinates of all points, same layout as in :py:meth:`.Kpoints.points`.
+        flatten_points : (N,) :numpy:`ndarray`
+            Flatten coordinates of all points, same as in :py:meth:`.Kpoints.flatten_points`.
+        values : (N,) or (n_bands, N) :numpy:`ndarray`
+            Values of the ``function`` at the points.
+        """
+
+        if relative:
+            cell = np.eye(3)
+        else:
+            cell = np.array([self.b1, self.b2, self.b3])
+
+        # Segments of the path and their starting flatten coordinates
+        starts, ends, offsets = [], [], []
+        offset = 0
+        for subpath in self.path:
+            for i in range(len(subpath) - 1):
+                starts.append(self.hs_coordinates[subpath[i]] @ cell)
+                ends.append(self.hs_coordinates[subpath[i + 1]] @ cell)
+                offsets.append(offset)
+                offset += np.linalg.norm(ends[-1] - starts[-1])
+        starts, ends = np.array(starts).reshape((-1, 3)), np.array(ends).reshape(
+            (-1, 3)
+        )
+        offsets = np.array(offsets)
+
+        def evaluate(segments, t):
+            points = starts[segments] + t[:, None] * (ends[segments] - starts[segments])
+            values = np.array(function(points), dtype=float)
+            squeeze = values.ndim == 1
+            return values.reshape((-1, len(t))), squeeze
+
+        # Initial uniform points
+        t = np.tile(np.linspace(0, 1, n_start + 2), len(starts))
+        segments = np.repeat(np.arange(len(starts)), n_start + 2)
+        values, squeeze = evaluate(segments, t)
+        scale = np.ptp(values) if values.size != 0 else 0
+        if scale == 0:
+            scale = 1
+        scale *= tolerance
+
+        # Intervals between the neighbouring initial points
+        left = np.nonzero(t[:-1] < t[1:])[0]
+        right = left + 1
+        for _ in range(max_depth):
+            if len(left) == 0:
+                break
+            middle = (t[left] + t[right]) / 2
+            middle_values, _ = evaluate(segments[left], middle)
+
+            linear = (values[:, left] + values[:, right]) / 2
+            refine = np.abs(middle_values - linear).max(axis=0) > scale
+            if len(values) > 1:
+                # Gap closes inside the interval
+                gaps = [
+                    np.diff(np.sort(array, axis=0), axis=0).min(axis=0)
+                    for array in [values[:, left], middle_values, values[:, right]]
+                ]
+                refine |= (gaps[1] < scale) & (
+                    gaps[1] < np.minimum(gaps[0], gaps[2]) / 2
+                )
+
+            # Store new points and prepare the next level
+            n_old = len(t)
+            new = np.arange(n_old, n_old + len(middle))
+            t = np.concatenate((t, middle))
+            segments = np.concatenate((segments, segments[left]))
+            values = np.concatenate((values, middle_values), axis=1)
+            left, right = (
+                np.concatenate((left[refine], new[refine])),
+                np.concatenate((new[refine], right[refine])),
+            )
+
+        order = np.lexsort((t, segments))
+        t, segments, values = t[order], segments[order], values[:, order]
+        points = starts[segments] + t[:, None] * (ends[segments] - starts[segments])
+        flatten_points = (
+            offsets[segments] + t * np.linalg.norm(ends - starts, axis=1)[segments]
+        )
+        if squeeze:
+            values = values[0]
+        return points, flatten_points, values
+
+
+def monkhorst_pack(n1, n2, n3, shift=(0, 0, 0)):
+    r"""
+    Uniform grid of k points in the reciprocal cell.
+
+    .. math::
+
+        \boldsymbol{k}_{ijk} = \dfrac{i + s_1}{n_1}\boldsymbol{b}_1
+        + \dfrac{j + s_2}{n_2}\boldsymbol{b}_2
+        + \dfrac{k + s_3}{n_3}\boldsymbol{b}_3
+
+    Grid is :math:`\Gamma`-centered for zero ``shift``. With ``shift = (0.5, 0.5, 0.5)``
+    it is the original Monkhorst-Pack grid for even :math:`n_1`, :math:`n_2`, :math:`n_3`.
+
+    .. versionadded:: 0.8.10
+
+    Parameters
+    ----------
+    n1 : int
+        Number of points along :math:`\boldsymbol{b}_1`.
+    n2 : int
+        Number of points along :math:`\boldsymbol{b}_2`.
+    n3 : int
+        Number of points along :math:`\boldsymbol{b}_3`.
+    shift : (3,) |array_like|_, default (0, 0, 0)
+        Shift of the grid in the units of the grid spacing.
+
+    Returns
+    -------
+    points : (n1 * n2 * n3, 3) :numpy:`ndarray`
+        Relative coordinates of the k points. Point :math:`(i, j, k)`
+        has index :math:`i n_2 n_3 + j n_3 + k`.
+    """
+
+    shape = np.array([n1, n2, n3], dtype=int)
+    if (shape < 1).any():
+        raise ValueError(f"Number of points has to be positive, got {tuple(shape)}.")
+
+    indices = np.indices(shape).reshape((3, -1)).T
+    return (indices + np.array(shift, dtype=float)) / shape
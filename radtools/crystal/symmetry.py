@@ -0,0 +1,503 @@
+# RAD-tools - program for spin Hamiltonian and magnons.
+# Copyright (C) 2022-2023  Andrey Rybakov
+#
+# e-mail: anry@uv.es, web: adrybakov.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+r"""
+Symmetry of the crystal and reduction of the k point grids.
+"""
+
+from itertools import product
+
+import numpy as np
+
+from radtools.crystal.kpoints import monkhorst_pack
+
+__all__ = [
+    "symmetry_operations",
+    "irreducible_kpoints",
+    "bond_orbits",
+    "symmetrize_bonds",
+]
+
+# All integer matrices with the elements -1, 0 and 1
+_CANDIDATES = np.array(list(product([-1, 0, 1], repeat=9)), dtype=int).reshape(
+    (-1, 3, 3)
+)
+
+
+def _moments(crystal):
+    r"""
+    Magnetic moments of the atoms: magmom if defined, otherwise the spin vector.
+    """
+
+    moments = np.zeros((len(crystal.atoms), 3), dtype=float)
+    for a_i, atom in enumerate(crystal.atoms):
+        try:
+            moments[a_i] = atom.magmom
+        except ValueError:
+            try:
+                moments[a_i] = atom.spin_vector
+            except (ValueError, TypeError):
+                pass
+    return moments
+
+
+def symmetry_operations(crystal, magnetic=True, tolerance=1e-5):
+    r"""
+    Symmetry operations of the crystal.
+
+    Operation :math:`(\boldsymbol{W}, \boldsymbol{t})` maps the relative coordinates
+    of each atom to the relative coordinates of the atom with the same name
+    (up to the lattice translation):
+
+    .. math::
+
+        \boldsymbol{r}^{\prime} = \boldsymbol{W}\boldsymbol{r} + \boldsymbol{t}
+
+    If ``magnetic``, then magnetic moments are transformed as axial vectors
+
+    .. math::
+
+        \boldsymbol{m}^{\prime} = \det(\boldsymbol{R})\boldsymbol{R}\boldsymbol{m}
+
+    where :math:`\boldsymbol{R}` is the rotation in the Cartesian coordinates,
+    and have to match as well. Time reversal is not combined with the operations.
+
+    Rotations are searched among the integer matrices with the elements
+    :math:`-1, 0, 1`, which preserve the metric of the lattice. It covers all
+    point-group operations for the reduced (i.e. standardized) cells.
+
+    .. versionadded:: 0.8.10
+
+    Parameters
+    ----------
+    crystal : :py:class:`.Crystal`
+        Crystal structure.
+    magnetic : bool, default True
+        Whether to check the magnetic moments (or spin vectors) of the atoms.
+    tolerance : float, default 1e-5
+        Tolerance for the relative coordinates and metric.
+
+    Returns
+    -------
+    rotations : (n, 3, 3) :numpy:`ndarray`
+        Rotations :math:`\boldsymbol{W}` in the relative coordinates. Integer.
+        Each rotation appears once, the first one is identity.
+    translations : (n, 3) :numpy:`ndarray`
+        Translations :math:`\boldsymbol{t}` in the relative coordinates.
+    """
+
+    cell = np.array(crystal.cell, dtype=float)
+    metric = cell @ cell.T
+
+    # Point group of the lattice
+    transformed = np.einsum("nji,jk,nkl->nil", _CANDIDATES, metric, _CANDIDATES)
+    lattice_group = _CANDIDATES[
+        np.all(
+            np.abs(transformed - metric) < tolerance * np.abs(metric).max(),
+            axis=(1, 2),
+        )
+    ]
+    # Identity first
+    lattice_group = lattice_group[
+        np.argsort(~np.all(lattice_group == np.eye(3, dtype=int), axis=(1, 2)))
+    ]
+
+    if len(crystal.atoms) == 0:
+        return lattice_group, np.zeros((len(lattice_group), 3), dtype=float)
+
+    positions = np.array([atom.position for atom in crystal.atoms], dtype=float)
+    _, species = np.unique([atom.name for atom in crystal.atoms], return_inverse=True)
+    same_species = species[:, None] == species[None, :]
+    if magnetic:
+        moments = _moments(crystal)
+        moment_tolerance = tolerance * max(1.0, np.abs(moments).max())
+
+    rotations = []
+    translations = []
+    for W in lattice_group:
+        R = cell.T @ W @ np.linalg.inv(cell.T)
+        if magnetic:
+            rotated = np.linalg.det(R) * moments @ R.T
+            same_moments = np.all(
+                np.abs(rotated[:, None, :] - moments[None, :, :]) < moment_tolerance,
+                axis=2,
+            )
+            allowed = same_species & same_moments
+        else:
+            allowed = same_species
+
+        rotated = positions @ W.T
+        # Translations, which map the first atom to the atoms of the same kind
+        for t in (positions - rotated[0])[allowed[0]]:
+            difference = (rotated + t)[:, None, :] - positions[None, :, :]
+            difference -= np.round(difference)
+            matches = np.all(np.abs(difference) < tolerance, axis=2) & allowed
+            if matches.any(axis=1).all():
+                rotations.append(W)
+                translations.append(t - np.floor(t + tolerance))
+                break
+
+    return np.array(rotations, dtype=int), np.array(translations, dtype=float)
+
+
+def irreducible_kpoints(
+    crystal,
+    n1: int,
+    n2: int,
+    n3: int,
+    shift=(0, 0, 0),
+    magnetic=True,
+    time_reversal=False,
+    tolerance=1e-5,
+):
+    r"""
+    Irreducible k points of the uniform grid.
+
+    Points of the grid (see :py:func:`.monkhorst_pack`) are grouped into the
+    stars of the point group of the crystal (see :py:func:`.symmetry_operations`).
+    Rotation :math:`\boldsymbol{W}` acts on the relative coordinates of the
+    k points as :math:`\boldsymbol{W}^{-T}`. Operations, which do not map the
+    grid onto itself, are ignored.
+
+    .. versionadded:: 0.8.10
+
+    Parameters
+    ----------
+    crystal : :py:class:`.Crystal`
+        Crystal structure.
+    n1 : int
+        Number of points along :math:`\boldsymbol{b}_1`.
+    n2 : int
+        Number of points along :math:`\boldsymbol{b}_2`.
+    n3 : int
+        Number of points along :math:`\boldsymbol{b}_3`.
+    shift : (3,) |array_like|_, default (0, 0, 0)
+        Shift of the grid in the units of the grid spacing.
+    magnetic : bool, default True
+        Whether to check the magnetic moments (or spin vectors) of the atoms.
+    time_reversal : bool, default False
+        Whether :math:`\boldsymbol{k}` and :math:`-\boldsymbol{k}` are equivalent.
+        It is not the case for the magnons in general
+        (i.e. nonreciprocal dispersion due to DMI).
+    tolerance : float, default 1e-5
+        Tolerance for the relative coordinates.
+
+    Returns
+    -------
+    kpoints : (n, 3) :numpy:`ndarray`
+        Irreducible k points in relative coordinates.
+    weights : (n,) :numpy:`ndarray`
+        Number of the grid points, which are equivalent to each irreducible point.
+        Integer, sum of the weights is ``n1 * n2 * n3``.
+    mapping : (n1 * n2 * n3,) :numpy:`ndarray`
+        Index of the irreducible point for each point of the full grid.
+
+    Examples
+    --------
+
+    .. doctest::
+
+        >>> import radtools as rad
+        >>> crystal = rad.Crystal(rad.lattice_example("CUB"))
+        >>> crystal.add_atom(rad.Atom("Fe", (0, 0, 0)))
+        >>> kpoints, weights, mapping = rad.irreducible_kpoints(crystal, 4, 4, 4)
+        >>> len(kpoints), int(weights.sum())
+        (10, 64)
+    """
+
+    shape = np.array([n1, n2, n3], dtype=int)
+    shift = np.array(shift, dtype=float)
+    points = monkhorst_pack(*shape, shift=shift)
+
+    rotations, _ = symmetry_operations(crystal, magnetic=magnetic, tolerance=tolerance)
+    # Action on the reciprocal relative coordinates (row vectors): k W^{-1}
+    operations = np.round(np.linalg.inv(rotations)).astype(int)
+    if time_reversal:
+        operations = np.concatenate((operations, -operations))
+
+    # (n_operations, M, 3) grid coordinates of the images
+    images = np.einsum("mi,nij->nmj", points, operations) * shape - shift
+    on_grid = np.all(
+        np.abs(images - np.round(images)) < tolerance * shape.max(), axis=(1, 2)
+    )
+    images = np.round(images[on_grid]).astype(int) % shape
+    images = np.ravel_multi_index(np.moveaxis(images, -1, 0), shape)
+
+    # Representative of the star is the point with the smallest index
+    representatives = images.min(axis=0)
+    irreducible, mapping, weights = np.unique(
+        representatives, return_inverse=True, return_counts=True
+    )
+
+    return points[irreducible], weights, mapping
+
+
+def _space_group(crystal, magnetic, tolerance):
+    r"""
+    All operations of the space group, modulo the lattice translations.
+
+    Operations of :py:func:`.symmetry_operations` are combined with the pure
+    translations, which map the crystal onto itself (i.e. centering).
+    """
+
+    rotations, translations = symmetry_operations(
+        crystal, magnetic=magnetic, tolerance=tolerance
+    )
+    positions = np.array([atom.position for atom in crystal.atoms], dtype=float)
+    _, species = np.unique([atom.name for atom in crystal.atoms], return_inverse=True)
+    allowed = species[:, None] == species[None, :]
+    if magnetic:
+        moments = _moments(crystal)
+        moment_tolerance = tolerance * max(1.0, np.abs(moments).max())
+        allowed &= np.all(
+            np.abs(moments[:, None, :] - moments[None, :, :]) < moment_tolerance,
+            axis=2,
+        )
+
+    centering = []
+    for t in (positions - positions[0])[allowed[0]]:
+        difference = (positions + t)[:, None, :] - positions[None, :, :]
+        difference -= np.round(difference)
+        if (np.all(np.abs(difference) < tolerance, axis=2) & allowed).any(axis=1).all():
+            centering.append(t - np.floor(t + tolerance))
+    centering = np.array(centering, dtype=float)
+
+    translations = translations[:, None, :] + centering[None, :, :]
+    return (
+        np.repeat(rotations, len(centering), axis=0),
+        (translations - np.floor(translations + tolerance)).reshape((-1, 3)),
+    )
+
+
+def _bond_images(crystal, i, j, R, rotations, translations, tolerance):
+    r"""
+    Images of the bonds under the symmetry operations.
+
+    Atom :math:`a` is mapped to the atom :math:`a^{\prime}` in the unit cell
+    :math:`\boldsymbol{L}`, then the bond (i, j, R) is mapped to
+    (i', j', W R + L_j - L_i).
+
+    Returns
+    -------
+    i : (n, M) :numpy:`ndarray`
+    j : (n, M) :numpy:`ndarray`
+    R : (n, M, 3) :numpy:`ndarray`
+    """
+
+    positions = np.array([atom.position for atom in crystal.atoms], dtype=float)
+    # (n_operations, n_atoms, 3)
+    images = np.einsum("nij,aj->nai", rotations, positions) + translations[:, None, :]
+    difference = images[:, :, None, :] - positions[None, None, :, :]
+    matches = np.all(np.abs(difference - np.round(difference)) < tolerance, axis=3)
+    if not matches.any(axis=2).all():
+        raise ValueError("Atoms are not mapped onto each other by the operations.")
+    permutation = np.argmax(matches, axis=2)
+    shifts = np.round(images - positions[permutation].reshape(images.shape)).astype(int)
+
+    i = np.asarray(i, dtype=int)
+    j = np.asarray(j, dtype=int)
+    R = np.asarray(R, dtype=int).reshape((-1, 3))
+    return (
+        permutation[:, i],
+        permutation[:, j],
+        np.einsum("nij,mj->nmi", rotations, R) + shifts[:, j] - shifts[:, i],
+    )
+
+
+def _bond_keys(n_atoms, i, j, R, R_max):
+    r"""
+    Integer keys of the bonds (i, j, R) with :math:`|R| \le` ``R_max``.
+    """
+
+    base = 2 * R_max + 1
+    key = i.astype(np.int64) * n_atoms + j
+    for component in range(3):
+        key = key * base + R[..., component] + R_max
+    return key
+
+
+def bond_orbits(crystal, i, j, R, magnetic=False, tolerance=1e-5):
+    r"""
+    Group the bonds into the orbits of the space group of the crystal.
+
+    Bond (i, j, R) connects atom i in (0, 0, 0) unit cell with atom j in R unit
+    cell. Two bonds are equivalent if one of them is mapped onto the other one
+    (or onto its reversed version (j, i, -R)) by the symmetry operation of the
+    crystal (see :py:func:`.symmetry_operations`, in addition the pure translations,
+    which map the crystal onto itself, are taken into account). All images of every bond are
+    encoded as integer keys at once, the smallest key identifies the orbit.
+
+    .. versionadded:: 0.8.10
+
+    Parameters
+    ----------
+    crystal : :py:class:`.Crystal`
+        Crystal structure.
+    i : (M,) |array_like|_
+        Indices of the first atoms in ``crystal.atoms``.
+    j : (M,) |array_like|_
+        Indices of the second atoms in ``crystal.atoms``.
+    R : (M, 3) |array_like|_
+        Radius vectors of the unit cells for the second atoms (relative coordinates).
+    magnetic : bool, default False
+        Whether to use the magnetic symmetry (see :py:func:`.symmetry_operations`)
+        instead of the symmetry of the atomic structure.
+    tolerance : float, default 1e-5
+        Tolerance for the relative coordinates.
+
+    Returns
+    -------
+    orbits : (M,) :numpy:`ndarray`
+        Number of the orbit for each bond. Orbits are numbered from 0
+        in the order of the first appearance of their bonds.
+
+    See Also
+    --------
+    symmetrize_bonds
+
+    Examples
+    --------
+
+    .. doctest::
+
+        >>> import radtools as rad
+        >>> crystal = rad.Crystal()
+        >>> crystal.add_atom(rad.Atom("Fe", (0, 0, 0)))
+        >>> R = [(1, 0, 0), (0, -1, 0), (1, 1, 0), (0, 0, 1)]
+        >>> orbits = rad.bond_orbits(crystal, [0, 0, 0, 0], [0, 0, 0, 0], R)
+        >>> orbits.tolist()
+        [0, 0, 1, 0]
+    """
+
+    i = np.asarray(i, dtype=int).reshape(-1)
+    if len(i) == 0:
+        return np.zeros(0, dtype=int)
+    rotations, translations = _space_group(crystal, magnetic, tolerance)
+    images_i, images_j, images_R = _bond_images(
+        crystal, i, j, R, rotations, translations, tolerance
+    )
+    R_max = np.abs(images_R).max()
+    n_atoms = len(crystal.atoms)
+    canonical = np.minimum(
+        _bond_keys(n_atoms, images_i, images_j, images_R, R_max).min(axis=0),
+        _bond_keys(n_atoms, images_j, images_i, -images_R, R_max).min(axis=0),
+    )
+    _, first, inverse = np.unique(canonical, return_index=True, return_inverse=True)
+    return np.argsort(np.argsort(first))[inverse]
+
+
+def symmetrize_bonds(crystal, i, j, R, J, magnetic=False, tolerance=1e-5):
+    r"""
+    Symmetrize the exchange matrices of the bonds.
+
+    Each matrix is replaced by the average of the images of the matrices of
+    the equivalent bonds (see :py:func:`.bond_orbits`) under the symmetry
+    operations, which map them onto the bond:
+
+    .. math::
+
+        \boldsymbol{J}^{\prime} = \boldsymbol{R}\boldsymbol{J}\boldsymbol{R}^T
+
+    where :math:`\boldsymbol{R}` is the rotation in the Cartesian coordinates.
+    Since spins are axial vectors the DMI vector is rotated as
+    :math:`\det(\boldsymbol{R})\boldsymbol{R}\boldsymbol{D}`. Reversed bond
+    (j, i, -R) carries the transposed matrix. Bonds, which are absent from the
+    input, do not contribute to the averages. For the complete orbits the result
+    satisfies all symmetry constraints, i.e. DMI vanishes for the bonds with the
+    inversion centre.
+
+    The average is accumulated for all bonds at once for each operation.
+
+    .. versionadded:: 0.8.10
+
+    Parameters
+    ----------
+    crystal : :py:class:`.Crystal`
+        Crystal structure.
+    i : (M,) |array_like|_
+        Indices of the first atoms in ``crystal.atoms``.
+    j : (M,) |array_like|_
+        Indices of the second atoms in ``crystal.atoms``.
+    R : (M, 3) |array_like|_
+        Radius vectors of the unit cells for the second atoms (relative coordinates).
+    J : (M, 3, 3) |array_like|_
+        Exchange matrices of the bonds.
+    magnetic : bool, default False
+        Whether to use the magnetic symmetry (see :py:func:`.symmetry_operations`)
+        instead of the symmetry of the atomic structure.
+    tolerance : float, default 1e-5
+        Tolerance for the relative coordinates.
+
+    Returns
+    -------
+    J : (M, 3, 3) :numpy:`ndarray`
+        Symmetrized exchange matrices.
+
+    See Also
+    --------
+    bond_orbits
+    """
+
+    i = np.asarray(i, dtype=int).reshape(-1)
+    j = np.asarray(j, dtype=int).reshape(-1)
+    R = np.asarray(R, dtype=int).reshape((-1, 3))
+    J = np.asarray(J, dtype=float).reshape((-1, 3, 3))
+    if len(i) == 0:
+        return J.copy()
+
+    rotations, translations = _space_group(crystal, magnetic, tolerance)
+    images_i, images_j, images_R = _bond_images(
+        crystal, i, j, R, rotations, translations, tolerance
+    )
+    R_max = np.abs(images_R).max()
+    n_atoms = len(crystal.atoms)
+    direct_keys = _bond_keys(n_atoms, images_i, images_j, images_R, R_max)
+    reversed_keys = _bond_keys(n_atoms, images_j, images_i, -images_R, R_max)
+
+    keys = _bond_keys(n_atoms, i, j, R, R_max)
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+
+    def find(searched_keys):
+        positions = np.searchsorted(sorted_keys, searched_keys)
+        positions[positions == len(keys)] = 0
+        return np.where(sorted_keys[positions] == searched_keys, order[positions], -1)
+
+    cell = np.array(crystal.cell, dtype=float)
+    cartesian = cell.T @ rotations @ np.linalg.inv(cell.T)
+
+    total = np.zeros(J.shape, dtype=float)
+    counts = np.zeros(len(J), dtype=int)
+    for n in range(len(rotations)):
+        images = cartesian[n] @ J @ cartesian[n].T
+        direct_rows = find(direct_keys[n])
+        reversed_rows = find(reversed_keys[n])
+        # Each operation contributes twice: as is and with the reversed bond.
+        # If one of the two bonds is absent, the other one takes both contributions.
+        direct_weights = (direct_rows != -1) * (1 + (reversed_rows == -1))
+        reversed_weights = (reversed_rows != -1) * (1 + (direct_rows == -1))
+        for rows, weights, matrices in [
+            (direct_rows, direct_weights, images),
+            (reversed_rows, reversed_weights, np.transpose(images, (0, 2, 1))),
+        ]:
+            # Operation maps different bonds to different ones: rows are unique
+            present = weights != 0
+            total[rows[present]] += matrices[present] * weights[present, None, None]
+            counts[rows[present]] += weights[present]
+
+    return total / counts[:, None, None]
@@ -31,6 +31,7 @@ __all__ = [
     "parallelepiped_check",
     "absolute_to_relative",
     "span_orthonormal_set",
+    "fibonacci_sphere",
 ]
 
 
@@ -345,3 +346,39 @@ def span_orthonormal_set(vec):
     rotation_matrix = Rotation.from_rotvec(n).as_matrix()
 
     return rotation_matrix
+
+
+def fibonacci_sphere(n):
+    r"""
+    Quasi-uniform set of directions on the unit sphere.
+
+    Points are placed on the Fibonacci spiral:
+
+    .. math::
+
+        z_i = 1 - \dfrac{2i + 1}{n}, \quad \varphi_i = \pi(3 - \sqrt{5})i,
+        \quad i = 0, ..., n - 1
+
+    Each point represents the same area of the sphere.
+
+    .. versionadded:: 0.8.10
+
+    Parameters
+    ----------
+    n : int
+        Number of points.
+
+    Returns
+    -------
+    points : (n, 3) :numpy:`ndarray`
+        Unit vectors.
+    """
+
+    if n < 1:
+        raise ValueError(f"Number of points has to be positive, got {n}.")
+
+    i = np.arange(n)
+    z = 1 - (2 * i + 1) / n
+    phi = np.pi * (3 - np.sqrt(5)) * i
+    rho = np.sqrt(1 - z**2)
+    return np.array([rho * np.cos(phi), rho * np.sin(phi), z]).T
@@ -26,8 +26,13 @@ __all__ = [
     "dump_spinham_txt",
     "dump_pickle",
     "load_pickle",
+    "dump_npy",
+    "load_npy",
 ]
 
+import json
+import os
+
 import numpy as np
 
 from radtools.decorate.array import print_2d_array
@@ -72,6 +77,103 @@ def load_pickle(filename):
     return object
 
 
+def dump_npy(filename, chunks, shape, dtype=float, metadata=None):
+    r"""
+    Stream chunks of an array into the memory-mappable binary file.
+
+    The ".npy" file with the full ``shape`` is allocated at once and each chunk is
+    written into it as soon as it is produced, therefore the whole array is
+    never kept in memory. Small sidecar file "filename.json" stores
+    the shape, data type, number of the written rows and ``metadata``.
+
+    .. versionadded:: 0.8.10
+
+    Parameters
+    ----------
+    filename : str
+        Name of the file for the array to be saved in.
+        ".npy" is added automatically.
+    chunks : iterable
+        Chunks of the array, each one is a tuple ``(start, block)``: rows
+        ``start : start + len(block)`` of the array are set to ``block``.
+        For example :py:meth:`.MagnonDispersion.omegas_chunks`.
+    shape : tuple of int
+        Shape of the full array.
+    dtype : data-type, default float
+        Data type of the array.
+    metadata : dict, optional
+        Any information, which can be serialized to JSON (:numpy:`ndarray` are
+        converted to lists).
+
+    Returns
+    -------
+    written : int
+        Number of the written rows.
+
+    See Also
+    --------
+    load_npy
+    """
+
+    if metadata is None:
+        metadata = {}
+    array = np.lib.format.open_memmap(
+        f"{filename}.npy", mode="w+", dtype=dtype, shape=tuple(shape)
+    )
+    written = 0
+    for start, block in chunks:
+        block = np.asarray(block)
+        array[start : start + len(block)] = block
+        written += len(block)
+    array.flush()
+    del array
+
+    sidecar = {
+        "shape": list(shape),
+        "dtype": np.dtype(dtype).str,
+        "written": written,
+        "metadata": metadata,
+    }
+    with open(f"{filename}.json", "w", encoding="utf-8") as file:
+        json.dump(
+            sidecar,
+            file,
+            indent=4,
+            default=lambda x: x.tolist() if isinstance(x, np.ndarray) else str(x),
+        )
+    return written
+
+
+def load_npy(filename, mmap_mode="r"):
+    r"""
+    Load an array, written by :py:func:`.dump_npy`, without reading it into memory.
+
+    .. versionadded:: 0.8.10
+
+    Parameters
+    ----------
+    filename : str
+        Name of the .npy file.
+    mmap_mode : str, default "r"
+        Memory-map mode, see :numpy:`load`. None reads the whole array.
+
+    Returns
+    -------
+    array : :numpy:`memmap` or :numpy:`ndarray`
+        Stored array.
+    metadata : dict
+        Content of the sidecar file. Empty if it is absent.
+    """
+
+    array = np.load(filename, mmap_mode=mmap_mode)
+    sidecar = f"{os.path.splitext(filename)[0]}.json"
+    metadata = {}
+    if os.path.isfile(sidecar):
+        with open(sidecar, "r", encoding="utf-8") as file:
+            metadata = json.load(file)
+    return array, metadata
+
+
 def load_template(filename):
     r"""
     Read template from the template file.
@@ -290,9 +392,10 @@ def dump_spinham_txt(
             f"{'Atom1':6} {'Atom2':6} (  i,   j,   k) {'J_iso':^{decimals+4}} {'Distance':^8}\n"
         )
         bonds_data = []
-        for atom1, atom2, (i, j, k), J in spinham:
+        bonds = spinham.bonds
+        distances = spinham.get_distances(bonds.i, bonds.j, bonds.R, atoms=bonds.atoms)
+        for (atom1, atom2, (i, j, k), J), distance in zip(spinham, distances):
             data_entry = []
-            distance = spinham.get_distance(atom1, atom2, (i, j, k))
             atom1 = f"{atom1.name}({atom1.index})"
             atom2 = f"{atom2.name}({atom2.index})"
             data_entry.append(separator)
@@ -160,12 +160,15 @@ def load_tb2j_model(filename, quiet=True, bravais_type=None) -> SpinHamiltonian:
         if model.type() != bravais_type:
             raise ValueError(f"Bravais type {bravais_type} could not be reached.")
 
+    bond_atoms = []
+    bond_R = []
+    read_distances = []
     while line:
         while line and minor_sep not in line:
             line = file.readline()
         line = file.readline().translate(garbage).split()
-        atom1 = line[0]
-        atom2 = line[1]
+        atom1 = model.get_atom(line[0])
+        atom2 = model.get_atom(line[1])
         R = tuple(map(int, line[2:5]))
         distance = float(line[-1])
         iso = None
@@ -194,13 +197,22 @@ def load_tb2j_model(filename, quiet=True, bravais_type=None) -> SpinHamiltonian:
 
         # Adding info from the exchange block to the SpinHamiltonian structure
         model.add_bond(atom1, atom2, R, iso=iso, aniso=aniso, dmi=dmi)
-        computed_distance = model.get_distance(atom1, atom2, R)
-        if abs(computed_distance - distance) > 0.001 and not quiet:
-            print(
-                f"\nComputed distance is a different from the read one:\n"
-                + f"  Computed: {computed_distance:.4f}\n  "
-                + f"Read: {distance:.4f}\n"
-            )
+        bond_atoms.append((model.get_atom_slot(atom1), model.get_atom_slot(atom2)))
+        bond_R.append(R)
+        read_distances.append(distance)
+
+    if not quiet and len(bond_R) > 0:
+        bond_atoms = np.array(bond_atoms, dtype=int)
+        computed_distances = model.get_distances(
+            bond_atoms[:, 0], bond_atoms[:, 1], bond_R
+        )
+        for computed_distance, distance in zip(computed_distances, read_distances):
+            if abs(computed_distance - distance) > 0.001:
+                print(
+                    f"\nComputed distance is a different from the read one:\n"
+                    + f"  Computed: {computed_distance:.4f}\n  "
+                    + f"Read: {distance:.4f}\n"
+                )
 
     return model
 
@@ -20,8 +20,29 @@ r"""
 Magnon dispersion via linearized spin-wave theory
 """
 
-
-from radtools.magnons.diagonalization import solve_via_colpa
+from radtools.magnons.correlations import StructureFactor
+from radtools.magnons.diagonalization import solve_via_colpa, solve_via_colpa_stack
 from radtools.magnons.dispersion import MagnonDispersion
+from radtools.magnons.ensemble import MagnonEnsemble
+from radtools.magnons.fitting import ExchangeFit
+from radtools.magnons.grid import MagnonGrid
+from radtools.magnons.incremental import IncrementalDispersion
+from radtools.magnons.kernel import MagnonKernel
+from radtools.magnons.phases import PhaseCache
+from radtools.magnons.powder import powder_average
+from radtools.magnons.topology import BerryCurvature
 
-__all__ = ["solve_via_colpa", "MagnonDispersion"]
+__all__ = [
+    "solve_via_colpa",
+    "solve_via_colpa_stack",
+    "MagnonDispersion",
+    "MagnonKernel",
+    "MagnonGrid",
+    "PhaseCache",
+    "StructureFactor",
+    "powder_average",
+    "ExchangeFit",
+    "MagnonEnsemble",
+    "BerryCurvature",
+    "IncrementalDispersion",
+]
@@ -0,0 +1,317 @@
+# RAD-tools - program for spin Hamiltonian and magnons.
+# Copyright (C) 2022-2023  Andrey Rybakov
+#
+# e-mail: anry@uv.es, web: adrybakov.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+r"""
+Spin-spin correlation functions in the linear spin wave theory.
+"""
+
+from typing import Callable, Iterable
+
+import numpy as np
+
+from radtools.crystal.kpoints import Kpoints
+
+__all__ = ["StructureFactor"]
+
+# Number of q points, which are processed at once
+_CHUNK_SIZE = 4096
+
+
+class StructureFactor:
+    r"""
+    Dynamical structure factor :math:`S^{\alpha\beta}(\boldsymbol{q}, \omega)`.
+
+    One-magnon part of the spin-spin correlation function at zero temperature:
+
+    .. math::
+
+        S^{\alpha\beta}(\boldsymbol{q}, \omega) = \sum_{\nu}
+        \langle 0\vert S^{\alpha}(-\boldsymbol{q})\vert\nu\rangle
+        \langle\nu\vert S^{\beta}(\boldsymbol{q})\vert 0\rangle
+        \delta(\omega - \omega_{\nu}(\boldsymbol{q}))
+
+    where
+
+    .. math::
+
+        S^{\alpha}(\boldsymbol{q}) = \sum_i f_i(\vert\boldsymbol{q}\vert)
+        e^{i\boldsymbol{q}\boldsymbol{r}_i}\sqrt{\dfrac{S_i}{2}}
+        \left(\overline{u}_i^{\alpha}b_i(-\boldsymbol{q}) + u_i^{\alpha}b_i^{\dagger}(\boldsymbol{q})\right)
+
+    is the transverse part of the spin operator and :math:`f_i` is the magnetic form factor.
+    Bosonic operators are expressed through the magnon operators with the transformation
+    matrix :math:`\boldsymbol{G}(-\boldsymbol{q})` (see :py:meth:`.MagnonDispersion.modes`).
+    Intensities are given per unit cell. Spin spirals (non-zero ``Q``) are not supported.
+
+    .. versionadded:: 0.8.10
+
+    Parameters
+    ----------
+    dispersion : :py:class:`.MagnonDispersion`
+        Magnon dispersion.
+    form_factors : callable or list of callable, optional
+        Magnetic form factors. Function, which takes an array of :math:`\vert\boldsymbol{q}\vert`
+        (in absolute units) and returns an array of the same shape. Either one function for all
+        magnetic atoms or one function per magnetic atom. By default :math:`f_i = 1`.
+
+    Examples
+    --------
+
+    .. doctest::
+
+        >>> import numpy as np
+        >>> import radtools as rad
+        >>> model = rad.SpinHamiltonian(lattice=rad.lattice_example("CUB"), notation="standard")
+        >>> model.add_atom(rad.Atom("Fe", (0, 0, 0), spin=[0, 0, 2]))
+        >>> model.add_bond("Fe", "Fe", (1, 0, 0), iso=1)
+        >>> structure_factor = rad.StructureFactor(rad.MagnonDispersion(model))
+        >>> omegas, S = structure_factor.correlations([[0.5, 0, 0]])
+        >>> S.shape
+        (1, 1, 3, 3)
+        >>> np.round(S[0, 0].real, 4)
+        array([[1., 0., 0.],
+               [0., 1., 0.],
+               [0., 0., 0.]])
+    """
+
+    def __init__(self, dispersion, form_factors=None) -> None:
+        if not np.allclose(dispersion.Q, 0):
+            raise ValueError("Structure factor is not supported for the spin spirals.")
+        self.dispersion = dispersion
+        N = dispersion.N
+        if form_factors is None or callable(form_factors):
+            form_factors = [form_factors] * N
+        form_factors = list(form_factors)
+        if len(form_factors) != N:
+            raise ValueError(
+                f"Expected {N} form factors (one per magnetic atom), "
+                + f"got {len(form_factors)}."
+            )
+        self.form_factors = form_factors
+
+    def _amplitudes(self, qpoints):
+        r"""
+        Amplitudes :math:`\langle\nu\vert S^{\alpha}(\boldsymbol{q})\vert 0\rangle`.
+
+        Parameters
+        ----------
+        qpoints : (M, 3) :numpy:`ndarray`
+            Scattering vectors, in absolute coordinates.
+
+        Returns
+        -------
+        omegas : (M, N) :numpy:`ndarray`
+            Magnon energies.
+        amplitudes : (M, N, 3) :numpy:`ndarray`
+            Amplitudes for each mode and each component of the spin.
+        """
+
+        dispersion = self.dispersion
+        N = dispersion.N
+
+        E, G = dispersion.modes(-qpoints)
+        # Failed points are not visible
+        failed = np.isnan(E).any(axis=1)
+        E[failed] = 0
+        G[failed] = np.eye(2 * N)
+
+        # Weights of the bosonic operators in the spin operator, (M, 2N, 3)
+        norms = np.linalg.norm(qpoints, axis=1)
+        factors = np.ones((len(qpoints), N), dtype=complex)
+        for a_i, form_factor in enumerate(self.form_factors):
+            if form_factor is not None:
+                factors[:, a_i] = form_factor(norms)
+        factors *= np.exp(1j * qpoints @ dispersion.kernel.positions.T)
+        factors *= np.sqrt(np.linalg.norm(dispersion.S, axis=1) / 2)
+        weights = np.concatenate(
+            (
+                factors[:, :, None] * np.conjugate(dispersion.u)[None, :, :],
+                factors[:, :, None] * dispersion.u[None, :, :],
+            ),
+            axis=1,
+        )
+
+        # Coefficients of the magnon creation operators at q
+        amplitudes = np.einsum("mix,mij->mjx", weights, np.linalg.inv(G)[:, :, N:])
+        amplitudes[failed] = 0
+        return E[:, N:], amplitudes
+
+    def correlations(self, qpoints):
+        r"""
+        Spin-spin correlation tensors of each magnon mode.
+
+        Parameters
+        ----------
+        qpoints : (M, 3) |array_like|_ or :py:class:`.Kpoints`
+            Scattering vectors, in absolute coordinates.
+
+        Returns
+        -------
+        omegas : (M, N) :numpy:`ndarray`
+            Magnon energies.
+        S : (M, N, 3, 3) :numpy:`ndarray`
+            Tensors :math:`S^{\alpha\beta}` for each q point and each mode.
+        """
+
+        qpoints = self._prepare(qpoints)
+        omegas, amplitudes = self._amplitudes(qpoints)
+        S = np.conjugate(amplitudes)[:, :, :, None] * amplitudes[:, :, None, :]
+        return omegas, S
+
+    @staticmethod
+    def _prepare(qpoints):
+        if isinstance(qpoints, Kpoints):
+            qpoints = qpoints.points()
+        return np.array(qpoints, dtype=float).reshape((-1, 3))
+
+    def intensities(self, qpoints, polarization=True):
+        r"""
+        Neutron scattering intensities of each magnon mode.
+
+        .. math::
+
+            I_{\nu}(\boldsymbol{q}) = \sum_{\alpha\beta}
+            (\delta_{\alpha\beta} - \hat{q}_{\alpha}\hat{q}_{\beta})S^{\alpha\beta}_{\nu}(\boldsymbol{q})
+
+        Points are processed in chunks, only the intensities are stored.
+
+        Parameters
+        ----------
+        qpoints : (M, 3) |array_like|_ or :py:class:`.Kpoints`
+            Scattering vectors, in absolute coordinates.
+        polarization : bool, default True
+            Whether to apply the polarization factor of the unpolarized neutrons.
+            If False, then the trace of :math:`S^{\alpha\beta}` is returned.
+
+        Returns
+        -------
+        omegas : (M, N) :numpy:`ndarray`
+            Magnon energies.
+        intensities : (M, N) :numpy:`ndarray`
+            Intensities for each q point and each mode.
+        """
+
+        qpoints = self._prepare(qpoints)
+        N = self.dispersion.N
+
+        omegas = np.zeros((len(qpoints), N), dtype=float)
+        intensities = np.zeros((len(qpoints), N), dtype=float)
+        for start in range(0, len(qpoints), _CHUNK_SIZE):
+            chunk = qpoints[start : start + _CHUNK_SIZE]
+            chunk_omegas, amplitudes = self._amplitudes(chunk)
+            values = np.sum(np.abs(amplitudes) ** 2, axis=2)
+            if polarization:
+                norms = np.linalg.norm(chunk, axis=1)
+                directions = np.divide(
+                    chunk,
+                    norms[:, None],
+                    out=np.zeros(chunk.shape),
+                    where=norms[:, None] > 0,
+                )
+                values -= np.abs(np.einsum("mjx,mx->mj", amplitudes, directions)) ** 2
+            omegas[start : start + _CHUNK_SIZE] = chunk_omegas
+            intensities[start : start + _CHUNK_SIZE] = values
+        return omegas, intensities
+
+    def intensities_chunks(self, qpoints, chunk_size=_CHUNK_SIZE, polarization=True):
+        r"""
+        Neutron scattering intensities, chunk by chunk.
+
+        Generator version of :py:meth:`.StructureFactor.intensities`, the memory does
+        not grow with the number of q points. Pair it with :py:func:`.dump_npy`
+        to write the results to the disk.
+
+        .. versionadded:: 0.8.10
+
+        Parameters
+        ----------
+        qpoints : (M, 3) |array_like|_ or :py:class:`.Kpoints`
+            Scattering vectors, in absolute coordinates.
+        chunk_size : int, default 4096
+            Number of q points in one chunk.
+        polarization : bool, default True
+            Whether to apply the polarization factor of the unpolarized neutrons.
+
+        Yields
+        ------
+        start : int
+            Index of the first q point of the chunk.
+        omegas : (n, N) :numpy:`ndarray`
+            Magnon energies.
+        intensities : (n, N) :numpy:`ndarray`
+            Intensities for each q point of the chunk and each mode.
+        """
+
+        qpoints = self._prepare(qpoints)
+        for start in range(0, len(qpoints), chunk_size):
+            omegas, intensities = self.intensities(
+                qpoints[start : start + chunk_size], polarization=polarization
+            )
+            yield start, omegas, intensities
+
+    def map(self, qpoints, energies, sigma, polarization=True):
+        r"""
+        Intensity map on the (q, :math:`\omega`) grid.
+
+        Delta functions are broadened by the gaussian:
+
+        .. math::
+
+            I(\boldsymbol{q}, \omega) = \sum_{\nu}I_{\nu}(\boldsymbol{q})
+            \dfrac{1}{\sigma\sqrt{2\pi}}e^{-(\omega - \omega_{\nu}(\boldsymbol{q}))^2/2\sigma^2}
+
+        Parameters
+        ----------
+        qpoints : (M, 3) |array_like|_ or :py:class:`.Kpoints`
+            Scattering vectors, in absolute coordinates.
+        energies : (n,) |array_like|_
+            Energies of the grid.
+        sigma : float or callable
+            Standard deviation of the gaussian. If callable, then it is called
+            with the array of the magnon energies and has to return the array
+            of the same shape (i.e. energy-dependent resolution).
+        polarization : bool, default True
+            Whether to apply the polarization factor. See :py:meth:`.StructureFactor.intensities`.
+
+        Returns
+        -------
+        intensity : (M, n) :numpy:`ndarray`
+            Broadened intensities.
+        """
+
+        omegas, intensities = self.intensities(qpoints, polarization=polarization)
+        energies = np.array(energies, dtype=float).reshape(-1)
+
+        if callable(sigma):
+            sigmas = np.array(sigma(omegas), dtype=float)
+        else:
+            sigmas = np.full(omegas.shape, sigma, dtype=float)
+
+        result = np.zeros((len(omegas), len(energies)), dtype=float)
+        for start in range(0, len(omegas), _CHUNK_SIZE):
+            part = slice(start, start + _CHUNK_SIZE)
+            # (chunk, N, n)
+            x = (energies[None, None, :] - omegas[part, :, None]) / sigmas[
+                part, :, None
+            ]
+            result[part] = np.einsum(
+                "mj,mjn->mn",
+                intensities[part] / (sigmas[part] * np.sqrt(2 * np.pi)),
+                np.exp(-0.5 * x**2),
+            )
+        return result
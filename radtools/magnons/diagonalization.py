@@ -18,13 +18,14 @@
 
 import numpy as np
 from numpy.linalg import LinAlgError
+from scipy.linalg import solve_triangular
 
 from radtools.exceptions import ColpaFailed
 
-__all__ = ["solve_via_colpa"]
+__all__ = ["solve_via_colpa", "solve_via_colpa_stack"]
 
 
-def solve_via_colpa(D):
+def solve_via_colpa(D, method="eig"):
     r"""
     Diagonalize grand-dynamical matrix following the method of Colpa [1]_.
 
@@ -78,6 +79,15 @@ def solve_via_colpa(D):
                 \boldsymbol{\Delta_3} & \boldsymbol{\Delta_4}
             \end{pmatrix}
 
+    method : str, default "eig"
+        Method of the diagonalization of :math:`\boldsymbol{K}\boldsymbol{g}\boldsymbol{K}^{\dagger}`.
+
+        * "eig" - general eigensolver and explicit inverse of :math:`\boldsymbol{K}`.
+        * "eigh" - Hermitian eigensolver and triangular solve with :math:`\boldsymbol{K}`.
+          Cheaper and numerically more stable for large matrices.
+
+        .. versionadded:: 0.8.10
+
     Returns
     -------
     E : (2N,) :numpy:`ndarray`
@@ -110,6 +120,10 @@ def solve_via_colpa(D):
 
 
 
+    See Also
+    --------
+    solve_via_colpa_stack
+
     References
     ----------
     .. [1] Colpa, J.H.P., 1978.
@@ -120,30 +134,140 @@ def solve_via_colpa(D):
 
     D = np.array(D)
 
-    N = len(D) // 2
-    g = np.diag(np.concatenate((np.ones(N), -np.ones(N))))
-
-    try:
-        # In Colpa article decomposition is K^{\dag}K, while numpy gives KK^{\dag}
-        K = np.conjugate(np.linalg.cholesky(D)).T
-    except LinAlgError:
+    E, G, success = solve_via_colpa_stack(D[None, :, :], method=method)
+    if not success[0]:
         raise ColpaFailed
 
-    L, U = np.linalg.eig(K @ g @ np.conjugate(K).T)
+    return E[0], G[0]
+
 
-    # Sort with respect to L, in descending order
-    U = np.concatenate((L[:, None], U.T), axis=1).T
-    U = U[:, np.argsort(U[0])]
-    L = U[0, ::-1]
-    U = U[1:, ::-1]
+def solve_via_colpa_stack(D, method="eig", only_energies=False):
+    r"""
+    Diagonalize a stack of grand-dynamical matrices following the method of Colpa [1]_.
+
+    Cholesky decomposition and diagonalization are performed for the whole stack at once.
+    Matrices, for which Cholesky decomposition fails, are marked in the returned
+    mask and are not diagonalized. See :py:func:`.solve_via_colpa` for the details
+    of the algorithm.
 
-    E = g @ L
+    Parameters
+    ----------
+    D : (M, 2N, 2N) |array_like|_
+        Stack of M grand dynamical matrices. Each one is expected to be Hermitian
+        and positive-defined.
+    method : str, default "eig"
+        Method of the diagonalization. See :py:func:`.solve_via_colpa`.
+    only_energies : bool, default False
+        If True, then the transformation matrices are not computed and
+        the eigenvalues are computed with the Hermitian solver without the eigenvectors,
+        regardless of ``method``.
+
+        .. versionadded:: 0.8.10
 
-    G_minus_one = np.linalg.inv(K) @ U @ np.sqrt(np.diag(E))
+    Returns
+    -------
+    E : (M, 2N) :numpy:`ndarray`
+        The eigenvalues for each matrix of the stack, sorted as in :py:func:`.solve_via_colpa`.
+        ``nan`` for the matrices, which are not positive-defined.
+    G : (M, 2N, 2N) :numpy:`ndarray` or None
+        Transformation matrices for each matrix of the stack.
+        ``nan`` for the matrices, which are not positive-defined.
+        None if ``only_energies``.
+    success : (M,) :numpy:`ndarray` of bool
+        Whether the diagonalization succeeded for the corresponding matrix.
+
+    See Also
+    --------
+    solve_via_colpa
+
+    References
+    ----------
+    .. [1] Colpa, J.H.P., 1978.
+        Diagonalization of the quadratic boson hamiltonian.
+        Physica A: Statistical Mechanics and its Applications,
+        93(3-4), pp.327-353.
+    """
+
+    if method not in ["eig", "eigh"]:
+        raise ValueError(f"Supported methods are 'eig' and 'eigh', got: {method}")
+
+    D = np.array(D)
+
+    M = D.shape[0]
+    N = D.shape[1] // 2
+    g = np.concatenate((np.ones(N), -np.ones(N)))
+
+    E = np.full((M, 2 * N), np.nan, dtype=complex)
+    if only_energies:
+        G = None
+    else:
+        G = np.full((M, 2 * N, 2 * N), np.nan, dtype=complex)
+
+    # Try the whole stack first, fall back to the individual matrices
+    # only if some of them are not positive-defined
+    success = np.ones(M, dtype=bool)
+    try:
+        L = np.linalg.cholesky(D)
+    except LinAlgError:
+        # Vectorized test first, the matrices on the edge are checked one by one
+        success = np.linalg.eigvalsh(D)[:, 0] > 0
+        try:
+            L = np.linalg.cholesky(D[success])
+        except LinAlgError:
+            L = np.zeros(D.shape, dtype=complex)
+            for i in np.nonzero(success)[0]:
+                try:
+                    L[i] = np.linalg.cholesky(D[i])
+                except LinAlgError:
+                    success[i] = False
+            L = L[success]
+
+    if not success.any():
+        return E, G, success
+
+    # In Colpa article decomposition is K^{\dag}K, while numpy gives KK^{\dag}
+    K = np.conjugate(np.transpose(L, (0, 2, 1)))
+    K_dagger = L
+
+    if only_energies:
+        eigenvalues = np.linalg.eigvalsh((K * g[None, None, :]) @ K_dagger)[:, ::-1]
+        E[success] = g * eigenvalues
+        return E, G, success
+
+    if method == "eigh":
+        # K g K^{\dag} is Hermitian, eigenvalues are real and sorted in ascending order
+        eigenvalues, U = np.linalg.eigh((K * g[None, None, :]) @ K_dagger)
+        eigenvalues = eigenvalues[:, ::-1]
+        U = U[:, :, ::-1]
+    else:
+        eigenvalues, U = np.linalg.eig((K * g[None, None, :]) @ K_dagger)
+
+        # Sort with respect to eigenvalues, in descending order
+        order = np.argsort(eigenvalues, axis=1)[:, ::-1]
+        eigenvalues = np.take_along_axis(eigenvalues, order, axis=1)
+        U = np.take_along_axis(U, order[:, None, :], axis=2)
+
+    E_success = g * eigenvalues
+    U = U * np.sqrt(E_success)[:, None, :]
+
+    if method == "eigh":
+        # K is upper triangular
+        try:
+            G_minus_one = solve_triangular(K, U, lower=False)
+        # Older versions of scipy do not support stacks of matrices
+        except ValueError:
+            G_minus_one = np.array(
+                [solve_triangular(K[i], U[i], lower=False) for i in range(len(K))]
+            )
+    else:
+        G_minus_one = np.linalg.inv(K) @ U
 
     # Compute G from G^-1 following Colpa, see equation (3.7) for details
-    G = np.conjugate(G_minus_one).T
-    G[:N, N:] *= -1
-    G[N:, :N] *= -1
+    G_success = np.conjugate(np.transpose(G_minus_one, (0, 2, 1)))
+    G_success[:, :N, N:] *= -1
+    G_success[:, N:, :N] *= -1
+
+    E[success] = E_success
+    G[success] = G_success
 
-    return E, G
+    return E, G, success
@@ -16,19 +16,43 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from copy import deepcopy
-from math import sqrt
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Union
 
 import numpy as np
+from scipy.sparse import coo_matrix, diags
+from scipy.sparse import identity as identity_matrix
+from scipy.sparse.linalg import LinearOperator, eigsh, splu
 from scipy.spatial.transform import Rotation
 
 from radtools.crystal.kpoints import Kpoints
-from radtools.geometry import span_orthonormal_set
-from radtools.magnons.diagonalization import ColpaFailed, solve_via_colpa
+from radtools.magnons.diagonalization import solve_via_colpa_stack
+from radtools.magnons.kernel import MagnonKernel
+from radtools.magnons.phases import PhaseCache
+from radtools.numerical import _pairs_reduction, _sum_over_pairs
 from radtools.spinham.hamiltonian import SpinHamiltonian
 
 __all__ = ["MagnonDispersion"]
 
+# Arrays, which are placed in the shared memory for the worker processes
+_SHARED_ATTRIBUTES = [
+    "J_matrices",
+    "indices_i",
+    "indices_j",
+    "dis_vectors",
+    "S",
+    "u",
+    "v",
+]
+
+# Default number of k points in one chunk of the streaming output
+_CHUNK_SIZE = 2**14
+
+# Dispersion of the worker process, see _init_worker()
+_worker_dispersion = None
+_worker_memory = []
+
 
 class MagnonDispersion:
     r"""
@@ -36,8 +60,9 @@ class MagnonDispersion:
 
     Parameters
     ----------
-    model : :py:class:`.SpinHamiltonian`
-        Spin Hamiltonian.
+    model : :py:class:`.SpinHamiltonian` or :py:class:`.MagnonKernel`
+        Spin Hamiltonian or its compiled version. The spin Hamiltonian is not modified
+        nor copied, it is compiled with :py:meth:`.MagnonKernel.from_spinham`.
     Q : (3,) |array_like|_
         Ordering wave vector of the spin-spiral.
         In relative coordinates with respect to the model`s reciprocal cell.
@@ -47,14 +72,29 @@ class MagnonDispersion:
         Global rotational axis. If None provided, then it is set to the direction of ``Q``.
     nodmi : bool, default=False
         If True, then DMI is not included in the dispersion.
+        Not supported if ``model`` is a :py:class:`.MagnonKernel`.
     noaniso : bool, default=False
         If True, then anisotropy is not included in the dispersion.
+        Not supported if ``model`` is a :py:class:`.MagnonKernel`.
     custom_mask : func
         Custom mask for the exchange parameter. Function which take (3,3) :numpy:`ndarray`
         as an input and returns (3,3) :numpy:`ndarray` as an output.
+        Not supported if ``model`` is a :py:class:`.MagnonKernel`.
+    colpa_method : str, default "eig"
+        Method for the diagonalization via Colpa, either "eig" or "eigh".
+        See :py:func:`.solve_via_colpa` for details.
+
+        .. versionadded:: 0.8.10
+    phase_cache : :py:class:`.PhaseCache`, optional
+        Cache of the phase factors. Share it between the dispersions,
+        which are computed for the same bonds and k points.
+
+        .. versionadded:: 0.8.10
 
     Attributes
     ----------
+    kernel : :py:class:`.MagnonKernel`
+        Compiled spin Hamiltonian.
     Q : (3,) :numpy:`ndarray`
         Ordering wave vector of the spin-spiral. in absolute coordinates in reciprocal space.
     n : (3,) :numpy:`ndarray`
@@ -75,26 +115,44 @@ class MagnonDispersion:
         Defined from local spin directions.
     v : (N, 3) :numpy:`ndarray`
         Defined from local spin directions.
+    colpa_method : str
+        Method for the diagonalization via Colpa.
+    phase_cache : :py:class:`.PhaseCache` or None
+        Cache of the phase factors.
     """
 
     def __init__(
         self,
-        model: SpinHamiltonian,
+        model: Union[SpinHamiltonian, MagnonKernel],
         Q=None,
         n=None,
         nodmi=False,
         noaniso=False,
         custom_mask=None,
+        colpa_method="eig",
+        phase_cache: PhaseCache = None,
     ):
         self._C = None
-        # Store the exchange model, but privately
-        self._model = deepcopy(model)
-        self._model.notation = "SpinW"
+        self._projections = None
+        self.colpa_method = colpa_method
+        self.phase_cache = phase_cache
+        # Compile the exchange model
+        if isinstance(model, MagnonKernel):
+            if nodmi or noaniso or custom_mask is not None:
+                raise ValueError(
+                    "Masks are applied when the kernel is compiled, "
+                    + "see MagnonKernel.from_spinham()."
+                )
+            self.kernel = model
+        else:
+            self.kernel = MagnonKernel.from_spinham(
+                model, nodmi=nodmi, noaniso=noaniso, custom_mask=custom_mask
+            )
 
         # Convert Q to absolute coordinates
         if Q is None:
             Q = [0, 0, 0]
-        self.Q = np.array(Q, dtype=float) @ self._model.reciprocal_cell
+        self.Q = np.array(Q, dtype=float) @ self.kernel.reciprocal_cell
 
         # Convert n to absolute coordinates, use Q if n is not provided
         if n is None:
@@ -106,40 +164,112 @@ class MagnonDispersion:
             self.n = np.array(n, dtype=float) / np.linalg.norm(n)
 
         # Get the number of magnetic atoms
-        self.N = len(self._model.magnetic_atoms)
-
-        # Get the exchange parameters, indices and vectors form the SpinHamiltonian
-        (
-            self.J_matrices,
-            self.indices_i,
-            self.indices_j,
-            self.dis_vectors,
-        ) = self._model.input_for_magnons(
-            nodmi=nodmi, noaniso=noaniso, custom_mask=custom_mask
-        )
+        self.N = self.kernel.N
 
-        # Initialize spin vector, u vector and v vector arrays
-        self.S = np.zeros((self.N, 3), dtype=float)
-        self.u = np.zeros((self.N, 3), dtype=complex)
-        self.v = np.zeros((self.N, 3), dtype=complex)
-
-        # Get spin vectors and compute u and v vectors from local spin directions
-        for a_i, atom in enumerate(self._model.magnetic_atoms):
-            try:
-                self.S[a_i] = atom.spin_vector
-                e1, e2, e3 = span_orthonormal_set(self.S[a_i])
-                self.v[a_i] = e3
-                self.u[a_i] = e1 + 1j * e2
-            except ValueError:
-                raise ValueError(
-                    f"Spin vector is not defined for {atom.fullname} atom."
-                )
+        # Get the exchange parameters, indices and vectors form the kernel
+        self.J_matrices = np.array(self.kernel.J)
+        self.indices_i = np.array(self.kernel.i)
+        self.indices_j = np.array(self.kernel.j)
+        self.dis_vectors = np.array(self.kernel.d)
+
+        # Spin vectors, u and v vectors from local spin directions
+        self.S = np.array(self.kernel.spins)
+        self.u = np.array(self.kernel.u)
+        self.v = np.array(self.kernel.v)
 
         # Rotate exchange matrices
-        for i in range(len(self.J_matrices)):
-            rotvec = self.n * (self.Q @ self.dis_vectors[i])
-            R_nm = Rotation.from_rotvec(rotvec).as_matrix()
-            self.J_matrices[i] = self.J_matrices[i] @ R_nm
+        if len(self.J_matrices) != 0:
+            rotvecs = np.outer(self.dis_vectors @ self.Q, self.n)
+            R_nm = Rotation.from_rotvec(rotvecs).as_matrix()
+            self.J_matrices = np.einsum("bij,bjk->bik", self.J_matrices, R_nm)
+
+        self._prepare_pairs()
+
+    def _prepare_pairs(self):
+        r"""
+        Prepare the bookkeeping for the summation over the bonds.
+
+        Bonds are grouped by the (i, j) pair of atoms, which allows to sum
+        the contributions of all bonds of the same pair with one
+        :numpy:`add.reduceat` call.
+        """
+
+        self._pairs = _pairs_reduction(self.indices_i, self.indices_j, self.N)
+
+    def _sum_over_pairs(self, values):
+        r"""
+        Sum bond-resolved values over the bonds with the same (i, j) pair.
+
+        Parameters
+        ----------
+        values : (M, n_bonds, ...) :numpy:`ndarray`
+            Values for each k point and each bond.
+
+        Returns
+        -------
+        result : (M, N, N, ...) :numpy:`ndarray`
+            Summed values.
+        """
+
+        return _sum_over_pairs(values, self._pairs, self.N)
+
+    def _phases(self, kpoints):
+        r"""
+        Computes phase factors for each bond.
+
+        .. math::
+
+            e^{-i\boldsymbol{k}\boldsymbol{d}}
+
+        Parameters
+        ----------
+        kpoints : (M, 3) :numpy:`ndarray`
+            Reciprocal vectors. In absolute coordinates.
+
+        Returns
+        -------
+        phases : (M, n_bonds) :numpy:`ndarray`
+            Phase factors.
+        """
+
+        if self.phase_cache is not None:
+            return self.phase_cache(kpoints, self.dis_vectors)
+        return np.exp(-1j * (kpoints @ self.dis_vectors.T))
+
+    def _bond_projections(self):
+        r"""
+        Projections of the exchange matrices on the local spin frames.
+
+        They do not depend on k and are computed once for each bond:
+
+        .. math::
+
+            a_b = \dfrac{\sqrt{S_i\cdot S_j}}{2}\boldsymbol{u}^T_i\boldsymbol{J}_b\overline{\boldsymbol{u}}_j
+
+            b_b = \dfrac{\sqrt{S_i\cdot S_j}}{2}\boldsymbol{u}^T_i\boldsymbol{J}_b\boldsymbol{u}_j
+
+            c_b = S_j \boldsymbol{v}^T_i\boldsymbol{J}_b\boldsymbol{v}_j
+
+        Returns
+        -------
+        a : (n_bonds,) :numpy:`ndarray`
+        b : (n_bonds,) :numpy:`ndarray`
+        c : (n_bonds,) :numpy:`ndarray`
+        """
+
+        if self._projections is None:
+            i, j = self.indices_i, self.indices_j
+            S = np.linalg.norm(self.S, axis=1)
+            prefactor = np.sqrt(S[i] * S[j]) / 2
+            a = prefactor * np.einsum(
+                "bx,bxy,by->b", self.u[i], self.J_matrices, np.conjugate(self.u[j])
+            )
+            b = prefactor * np.einsum(
+                "bx,bxy,by->b", self.u[i], self.J_matrices, self.u[j]
+            )
+            c = S[j] * np.einsum("bx,bxy,by->b", self.v[i], self.J_matrices, self.v[j])
+            self._projections = (a, b, c)
+        return self._projections
 
     def J(self, k):
         r"""
@@ -153,21 +283,24 @@ class MagnonDispersion:
 
         Parameters
         ----------
-        k : (3,) |array_like|_
-            Reciprocal vector.
+        k : (3,) or (M, 3) |array_like|_
+            Reciprocal vector or a set of reciprocal vectors.
             In absolute coordinates.
+
+        Returns
+        -------
+        J : (N, N, 3, 3) or (M, N, N, 3, 3) :numpy:`ndarray`
         """
-        # Initialize matrix
-        result = np.zeros((self.N, self.N, 3, 3), dtype=complex)
-        k = np.array(k)
-        # Compute J(k)
-        for index in range(len(self.J_matrices)):
-            i = self.indices_i[index]
-            j = self.indices_j[index]
-
-            result[i][j] += self.J_matrices[index] * np.exp(
-                -1j * (k @ self.dis_vectors[index])
-            )
+
+        k = np.array(k, dtype=float)
+        kpoints = k.reshape((-1, 3))
+
+        result = self._sum_over_pairs(
+            np.einsum("mb,bxy->mbxy", self._phases(kpoints), self.J_matrices)
+        )
+
+        if k.ndim == 1:
+            return result[0]
         return result
 
     def A(self, k):
@@ -182,23 +315,24 @@ class MagnonDispersion:
 
         Parameters
         ----------
-        k : (3,) |array_like|_
-            Reciprocal vector.
+        k : (3,) or (M, 3) |array_like|_
+            Reciprocal vector or a set of reciprocal vectors.
             In absolute coordinates.
+
+        Returns
+        -------
+        A : (N, N) or (M, N, N) :numpy:`ndarray`
         """
-        # Initialize matrix
-        result = np.zeros((self.N, self.N), dtype=complex)
-        k = np.array(k)
-
-        # Compute A(k)
-        J = self.J(-k)
-        for i in range(len(J)):
-            for j in range(len(J[i])):
-                result[i][j] += (
-                    sqrt(np.linalg.norm(self.S[i]) * np.linalg.norm(self.S[j]))
-                    / 2
-                    * (self.u[i] @ J[i][j] @ np.conjugate(self.u[j]))
-                )
+
+        k = np.array(k, dtype=float)
+        a, _, _ = self._bond_projections()
+
+        result = self._sum_over_pairs(
+            np.conjugate(self._phases(k.reshape((-1, 3)))) * a
+        )
+
+        if k.ndim == 1:
+            return result[0]
         return result
 
     def B(self, k):
@@ -213,23 +347,24 @@ class MagnonDispersion:
 
         Parameters
         ----------
-        k : (3,) |array_like|_
-            Reciprocal vector.
+        k : (3,) or (M, 3) |array_like|_
+            Reciprocal vector or a set of reciprocal vectors.
             In absolute coordinates.
+
+        Returns
+        -------
+        B : (N, N) or (M, N, N) :numpy:`ndarray`
         """
-        # Initialize matrix
-        result = np.zeros((self.N, self.N), dtype=complex)
-        k = np.array(k)
-
-        # Compute B(k)
-        J = self.J(-k)
-        for i in range(len(J)):
-            for j in range(len(J[i])):
-                result[i][j] += (
-                    sqrt(np.linalg.norm(self.S[i]) * np.linalg.norm(self.S[j]))
-                    / 2
-                    * (self.u[i] @ J[i][j] @ self.u[j])
-                )
+
+        k = np.array(k, dtype=float)
+        _, b, _ = self._bond_projections()
+
+        result = self._sum_over_pairs(
+            np.conjugate(self._phases(k.reshape((-1, 3)))) * b
+        )
+
+        if k.ndim == 1:
+            return result[0]
         return result
 
     def C(self):
@@ -243,29 +378,314 @@ class MagnonDispersion:
         where indices :math:`i` and :math:`j` correspond to the atoms in the exchange pair.
         """
 
+        return np.diag(self._C_diagonal())
+
+    def _C_diagonal(self):
+        r"""
+        Diagonal of the C matrix.
+
+        Returns
+        -------
+        C : (N,) :numpy:`ndarray`
+        """
+
         if self._C is None:
-            self._C = np.zeros((self.N, self.N), dtype=complex)
-
-            # Compute C matrix, note: sum over l is hidden here
-            J = self.J(np.zeros(3))
-            for i in range(len(J)):
-                for j in range(len(J[i])):
-                    self._C[i][i] += (
-                        np.linalg.norm(self.S[j]) * self.v[i] @ J[i][j] @ self.v[j]
-                    )
+            _, _, c = self._bond_projections()
+            # Sum over l is hidden in the summation over bonds
+            self._C = np.bincount(
+                self.indices_i, weights=c.real, minlength=self.N
+            ) + 1j * np.bincount(self.indices_i, weights=c.imag, minlength=self.N)
         return self._C
 
     def h(self, k):
-        k = np.array(k)
-        # Compute h matrix
-        left = np.concatenate(
-            (2 * self.A(k) - 2 * self.C(), 2 * np.conjugate(self.B(k)).T), axis=0
+        r"""
+        Computes h(k) matrix.
+
+        .. math::
+
+            \boldsymbol{h}(\boldsymbol{k}) =
+            \begin{pmatrix}
+            2\boldsymbol{A}(\boldsymbol{k}) - 2\boldsymbol{C} & 2\boldsymbol{B}(\boldsymbol{k}) \\
+            2\boldsymbol{B}^{\dagger}(\boldsymbol{k}) & 2\overline{\boldsymbol{A}(-\boldsymbol{k})} - 2\boldsymbol{C} \\
+            \end{pmatrix}
+
+        Parameters
+        ----------
+        k : (3,) or (M, 3) |array_like|_
+            Reciprocal vector or a set of reciprocal vectors.
+            In absolute coordinates.
+
+        Returns
+        -------
+        h : (2N, 2N) or (M, 2N, 2N) :numpy:`ndarray`
+        """
+
+        k = np.array(k, dtype=float)
+        kpoints = k.reshape((-1, 3))
+        N = self.N
+
+        a, b, _ = self._bond_projections()
+        # A(k), B(k) and conj(A(-k)) are computed with exp(+ik·d)
+        phases = np.conjugate(self._phases(kpoints))
+        A, B, A_conj = np.moveaxis(
+            self._sum_over_pairs(
+                phases[:, :, None] * np.stack((a, b, np.conjugate(a)), axis=1)
+            ),
+            3,
+            0,
         )
-        right = np.concatenate(
-            (2 * self.B(k), 2 * np.conjugate(self.A(-k)) - 2 * self.C()), axis=0
+        C = self.C()
+
+        result = np.zeros((len(kpoints), 2 * N, 2 * N), dtype=complex)
+        result[:, :N, :N] = 2 * A - 2 * C
+        result[:, :N, N:] = 2 * B
+        result[:, N:, :N] = 2 * np.conjugate(np.transpose(B, (0, 2, 1)))
+        result[:, N:, N:] = 2 * A_conj - 2 * C
+
+        if k.ndim == 1:
+            return result[0]
+        return result
+
+    def h_sparse(self, k):
+        r"""
+        Computes h(k) matrix in the sparse format.
+
+        Same matrix as :py:meth:`.MagnonDispersion.h`, but it is assembled directly
+        from the list of bonds. Memory scales with the number of bonds, not with
+        :math:`N^2`.
+
+        .. versionadded:: 0.8.10
+
+        Parameters
+        ----------
+        k : (3,) |array_like|_
+            Reciprocal vector. In absolute coordinates.
+
+        Returns
+        -------
+        h : (2N, 2N) ``scipy.sparse.csr_matrix``
+        """
+
+        N = self.N
+        i, j = self.indices_i, self.indices_j
+        a, b, _ = self._bond_projections()
+        phases = np.conjugate(self._phases(np.array(k, dtype=float).reshape((1, 3))))[0]
+        diagonal = np.arange(2 * N)
+
+        rows = np.concatenate((i, i, N + j, N + i, diagonal))
+        columns = np.concatenate((j, N + j, i, N + j, diagonal))
+        data = np.concatenate(
+            (
+                2 * a * phases,
+                2 * b * phases,
+                2 * np.conjugate(b * phases),
+                2 * np.conjugate(a) * phases,
+                -2 * np.tile(self._C_diagonal(), 2),
+            )
+        )
+        # Duplicates (i.e. bonds of the same pair) are summed
+        return coo_matrix((data, (rows, columns)), shape=(2 * N, 2 * N)).tocsr()
+
+    def lowest_omegas(self, kpoints, n_modes=6, shift=1e-8):
+        r"""
+        Lowest magnon energies computed with the sparse iterative solver.
+
+        Bosonic eigenproblem :math:`\boldsymbol{g}\boldsymbol{h}\boldsymbol{x} = \omega\boldsymbol{x}`,
+        where :math:`\boldsymbol{g} = diag(1, ..., 1, -1, ..., -1)`, is solved in the form
+
+        .. math::
+
+            \boldsymbol{g}\boldsymbol{x} = \dfrac{1}{\omega}\boldsymbol{h}\boldsymbol{x}
+
+        which is the generalized Hermitian problem with the positive-defined
+        :math:`\boldsymbol{h}` as the metric. Largest eigenvalues :math:`1/\omega`
+        correspond to the lowest magnon energies. Only the sparse
+        :py:meth:`.MagnonDispersion.h_sparse` is built for each k point.
+
+        Positive-defined :math:`\boldsymbol{h}(\boldsymbol{k})` is expected
+        (i.e. stable ground state).
+
+        .. versionadded:: 0.8.10
+
+        Parameters
+        ----------
+        kpoints : (M, 3) |array_like|_ or :py:class:`.Kpoints`
+            K points in absolute coordinates.
+        n_modes : int, default 6
+            Number of the lowest modes. Has to be less than N.
+        shift : float, default 1e-8
+            Small positive number, which is added to the diagonal of
+            :math:`\boldsymbol{h}` (i.e. for the Goldstone modes).
+
+        Returns
+        -------
+        omegas : (n_modes, M) :numpy:`ndarray`
+            Lowest magnon energies for each k point, sorted in ascending order.
+        """
+
+        if isinstance(kpoints, Kpoints):
+            kpoints = kpoints.points()
+        kpoints = np.array(kpoints, dtype=float).reshape((-1, 3))
+
+        if not 0 < n_modes < self.N:
+            raise ValueError(
+                f"Number of modes has to be in (0, {self.N}), got {n_modes}."
+            )
+
+        N = self.N
+        g = diags(np.concatenate((np.ones(N), -np.ones(N))).astype(complex))
+        identity = identity_matrix(2 * N, dtype=complex, format="csr")
+
+        omegas = np.zeros((len(kpoints), n_modes), dtype=float)
+        for k_i, k in enumerate(kpoints):
+            h = (self.h_sparse(k) + shift * identity).tocsc()
+            # Ordering for the symmetric structure reduces the fill-in
+            factorization = splu(
+                h, permc_spec="MMD_AT_PLUS_A", options=dict(SymmetricMode=True)
+            )
+            eigenvalues = eigsh(
+                g,
+                k=n_modes,
+                M=h,
+                Minv=LinearOperator(h.shape, matvec=factorization.solve, dtype=complex),
+                which="LA",
+                return_eigenvectors=False,
+            )
+            omegas[k_i] = np.sort(1 / eigenvalues.real)
+
+        omegas[np.abs(omegas) <= max(1e-8, 10 * shift)] = 0
+        return omegas.T
+
+    def _colpa_from_h(self, h, method=None, only_energies=False):
+        r"""
+        Diagonalizes the stack of h matrices.
+
+        All matrices are diagonalized at once. If the diagonalization fails
+        for some of them, then the following strategies are applied only to the
+        failed ones:
+
+        * Add small positive number to the diagonal (positive semidefinite matrix).
+        * Multiply the matrix by -1 (negative defined matrix).
+        * Multiply the matrix by -1 and add small positive number to the diagonal
+          (negative semidefinite matrix).
+
+        Parameters
+        ----------
+        h : (M, 2N, 2N) :numpy:`ndarray`
+            Matrices h(k) for M k points.
+        method : str, optional
+            Method for the diagonalization via Colpa. By default ``colpa_method`` is used.
+        only_energies : bool, default False
+            Whether to skip the computation of the transformation matrices.
+
+        Returns
+        -------
+        E : (M, 2N) :numpy:`ndarray`
+            Eigenvalues, ``nan`` if all strategies failed.
+        G : (M, 2N, 2N) :numpy:`ndarray` or None
+            Transformation matrices, ``nan`` if all strategies failed.
+            None if ``only_energies``.
+        success : (M,) :numpy:`ndarray` of bool
+            Whether any of the strategies succeeded for the corresponding k point.
+        """
+
+        E = np.full((len(h), 2 * self.N), np.nan, dtype=float)
+        G = None if only_energies else np.full(h.shape, np.nan, dtype=complex)
+        success = np.zeros(len(h), dtype=bool)
+        shift = 1e-8 * np.eye(2 * self.N)
+
+        for sign, addition in [(1, 0), (1, shift), (-1, 0), (-1, shift)]:
+            failed = np.nonzero(~success)[0]
+            if len(failed) == 0:
+                break
+            E_failed, G_failed, solved = solve_via_colpa_stack(
+                sign * (h[failed] + addition),
+                method=self.colpa_method if method is None else method,
+                only_energies=only_energies,
+            )
+            E[failed[solved]] = sign * E_failed[solved].real
+            if not only_energies:
+                G[failed[solved]] = G_failed[solved]
+            success[failed[solved]] = True
+
+        return E, G, success
+
+    def _omegas_from_h(self, h, zeros_to_none=False):
+        r"""
+        Computes magnon energies from the stack of h matrices.
+
+        See :py:meth:`.MagnonDispersion._colpa_from_h` for the details.
+
+        Parameters
+        ----------
+        h : (M, 2N, 2N) :numpy:`ndarray`
+            Matrices h(k) for M k points.
+        zeros_to_none : bool, default=False
+            If True, then return ``None`` instead of 0 if Colpa fails.
+
+        Returns
+        -------
+        omegas : (M, N) :numpy:`ndarray`
+            Magnon energies.
+        success : (M,) :numpy:`ndarray` of bool
+            Whether any of the strategies succeeded for the corresponding k point.
+        """
+
+        E, _, success = self._colpa_from_h(h, only_energies=True)
+        omegas = np.where(success[:, None], E[:, : self.N], 0.0)
+        omegas[np.abs(omegas) <= 1e-8] = 0
+
+        # If all fails, return None or 0
+        if zeros_to_none and not success.all():
+            omegas = omegas.astype(object)
+            omegas[~success] = None
+
+        return omegas, success
+
+    def modes(self, kpoints):
+        r"""
+        Magnon energies together with the Bogoliubov transformation.
+
+        Matrices :math:`\boldsymbol{h}(\boldsymbol{k})` are diagonalized via Colpa
+        (see :py:func:`.solve_via_colpa_stack`) and the transformation matrices are kept:
+
+        .. math::
+
+            \boldsymbol{E}(\boldsymbol{k}) =
+            (\boldsymbol{G}^{\dagger}(\boldsymbol{k}))^{-1}
+            \boldsymbol{h}(\boldsymbol{k})
+            \boldsymbol{G}^{-1}(\boldsymbol{k})
+
+        First N energies are the magnon energies at :math:`\boldsymbol{k}`
+        (see :py:meth:`.MagnonDispersion.omegas`), last N are the energies at
+        :math:`-\boldsymbol{k}`.
+
+        Hermitian eigensolver is always used (``method="eigh"`` of
+        :py:func:`.solve_via_colpa_stack`), because it returns orthonormal
+        eigenvectors for the degenerate modes.
+
+        .. versionadded:: 0.8.10
+
+        Parameters
+        ----------
+        kpoints : (M, 3) |array_like|_ or :py:class:`.Kpoints`
+            K points in absolute coordinates.
+
+        Returns
+        -------
+        E : (M, 2N) :numpy:`ndarray`
+            Energies for each k point, ``nan`` if diagonalization fails.
+        G : (M, 2N, 2N) :numpy:`ndarray`
+            Transformation matrices for each k point, ``nan`` if diagonalization fails.
+        """
+
+        if isinstance(kpoints, Kpoints):
+            kpoints = kpoints.points()
+
+        E, G, _ = self._colpa_from_h(
+            self.h(np.array(kpoints, dtype=float).reshape((-1, 3))), method="eigh"
         )
-        h = np.concatenate((left, right), axis=1)
-        return h
+        return E, G
 
     def omega(self, k, zeros_to_none=False):
         r"""
@@ -284,59 +704,204 @@ class MagnonDispersion:
         omegas : (N,) :numpy:`ndarray`
             Magnon energies for the vector ``k``.
         """
-        # Diagonalize h matrix via Colpa
-        k = np.array(k)
-        h = self.h(k)
-        try:
-            omegas, U = solve_via_colpa(h)
-            omegas = omegas.real[: self.N]
-        except ColpaFailed:
-            # Try to solve for positive semidefinite matrix
-            try:
-                omegas, U = solve_via_colpa(h + np.diag(1e-8 * np.ones(2 * self.N)))
-                omegas = omegas.real[: self.N]
-            except ColpaFailed:
-                # Try to solve for negative defined matrix
-                try:
-                    omegas, U = solve_via_colpa(-h)
-                    omegas = omegas.real[: self.N] * -1
-                except ColpaFailed:
-                    # Try to solve for negative semidefinite matrix
-                    try:
-                        omegas, U = solve_via_colpa(
-                            -h - np.diag(1e-8 * np.ones(h.shape[0]))
-                        )
-                        omegas = omegas.real[: self.N] * -1
-                    except ColpaFailed:
-                        # If all fails, return None or 0
-                        if zeros_to_none:
-                            omegas = np.array([None] * self.N)
-                        else:
-                            omegas = np.zeros(self.N)
-        omegas[np.abs(omegas) <= 1e-8] = 0
-        return omegas
 
-    def omegas(self, kpoints, zeros_to_none=False):
+        omegas, _ = self._omegas_from_h(
+            self.h(np.array(k, dtype=float).reshape((1, 3))),
+            zeros_to_none=zeros_to_none,
+        )
+        return omegas[0]
+
+    def omegas(self, kpoints, zeros_to_none=False, n_workers=None):
         r"""
         Dispersion spectra.
 
+        Matrices :math:`\boldsymbol{h}(\boldsymbol{k})` are computed and diagonalized
+        for all k points at once (see :py:func:`.solve_via_colpa_stack`).
+
         Parameters
         ----------
-        kpoints : (M, 3) |array_like|_
+        kpoints : (M, 3) |array_like|_ or :py:class:`.Kpoints`
             K points in absolute coordinates.
         zeros_to_none : bool, default=False
             If True, then return ``None`` instead of 0 if Colpa fails.
+        n_workers : int, optional
+            Number of worker processes. If more than one, then k points are split
+            in chunks, which are computed in parallel. Exchange parameters are passed
+            to the workers via shared memory.
+
+            .. versionadded:: 0.8.10
+
+        Returns
+        -------
+        omegas : (N, M) :numpy:`ndarray`
+            Magnon energies for each k point.
         """
 
-        data = []
+        if isinstance(kpoints, Kpoints):
+            kpoints = kpoints.points()
+
+        kpoints = np.array(kpoints, dtype=float).reshape((-1, 3))
+
+        if n_workers is not None and n_workers > 1 and len(kpoints) > 1:
+            omegas = self._omegas_parallel(kpoints, zeros_to_none, n_workers)
+        else:
+            omegas, _ = self._omegas_from_h(
+                self.h(kpoints), zeros_to_none=zeros_to_none
+            )
+
+        return omegas.T
+
+    def omegas_chunks(
+        self, kpoints, chunk_size=_CHUNK_SIZE, zeros_to_none=False, n_workers=None
+    ):
+        r"""
+        Dispersion spectra, chunk by chunk.
+
+        Generator, which computes the energies for ``chunk_size`` k points at a time
+        (see :py:meth:`.MagnonDispersion.omegas`), therefore the memory does not grow
+        with the number of k points. Pair it with :py:func:`.dump_npy` to write
+        the results to the disk.
+
+        .. versionadded:: 0.8.10
+
+        Parameters
+        ----------
+        kpoints : (M, 3) |array_like|_ or :py:class:`.Kpoints`
+            K points in absolute coordinates.
+        chunk_size : int, default 16384
+            Number of k points in one chunk.
+        zeros_to_none : bool, default=False
+            If True, then return ``None`` instead of 0 if Colpa fails.
+        n_workers : int, optional
+            Number of worker processes for each chunk. See :py:meth:`.MagnonDispersion.omegas`.
+
+        Yields
+        ------
+        start : int
+            Index of the first k point of the chunk.
+        omegas : (n, N) :numpy:`ndarray`
+            Magnon energies, one row per k point of the chunk.
+        """
 
         if isinstance(kpoints, Kpoints):
             kpoints = kpoints.points()
+        kpoints = np.array(kpoints, dtype=float).reshape((-1, 3))
 
-        for point in kpoints:
-            data.append(self.omega(point, zeros_to_none=zeros_to_none))
+        for start in range(0, len(kpoints), chunk_size):
+            yield start, self.omegas(
+                kpoints[start : start + chunk_size],
+                zeros_to_none=zeros_to_none,
+                n_workers=n_workers,
+            ).T
 
-        return np.array(data).T
+    def _omegas_parallel(self, kpoints, zeros_to_none, n_workers):
+        r"""
+        Computes magnon energies with the pool of processes.
+
+        Parameters
+        ----------
+        kpoints : (M, 3) :numpy:`ndarray`
+            K points in absolute coordinates.
+        zeros_to_none : bool
+            If True, then return ``None`` instead of 0 if Colpa fails.
+        n_workers : int
+            Number of worker processes.
+
+        Returns
+        -------
+        omegas : (M, N) :numpy:`ndarray`
+            Magnon energies in the order of ``kpoints``.
+        """
+
+        # Several chunks per worker for the load balancing
+        chunks = np.array_split(kpoints, min(len(kpoints), 4 * n_workers))
+
+        memory = []
+        try:
+            descriptors = {}
+            for name in _SHARED_ATTRIBUTES:
+                array = getattr(self, name)
+                block = shared_memory.SharedMemory(
+                    create=True, size=max(1, array.nbytes)
+                )
+                memory.append(block)
+                view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+                view[...] = array
+                descriptors[name] = (block.name, array.shape, array.dtype.str)
+
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=_init_worker,
+                initargs=(descriptors, self.N, self.colpa_method),
+            ) as executor:
+                results = list(
+                    executor.map(_worker_omegas, chunks, [zeros_to_none] * len(chunks))
+                )
+        finally:
+            for block in memory:
+                block.close()
+                block.unlink()
+
+        # Some chunks may contain None
+        if any(result.dtype == object for result in results):
+            results = [result.astype(object) for result in results]
+        return np.concatenate(results)
 
     def __call__(self, *args, **kwargs):
         return self.omegas(*args, **kwargs)
+
+
+def _init_worker(descriptors, N, colpa_method):
+    r"""
+    Creates the dispersion of the worker process on top of the shared memory.
+
+    Parameters
+    ----------
+    descriptors : dict
+        Name of the shared memory block, shape and dtype for each of the
+        attributes from ``_SHARED_ATTRIBUTES``.
+    N : int
+        Number of magnetic atoms.
+    colpa_method : str
+        Method for the diagonalization via Colpa.
+    """
+
+    global _worker_dispersion
+
+    dispersion = MagnonDispersion.__new__(MagnonDispersion)
+    for name, (block_name, shape, dtype) in descriptors.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        # Keep the reference, otherwise the buffer is released
+        _worker_memory.append(block)
+        setattr(dispersion, name, np.ndarray(shape, dtype=dtype, buffer=block.buf))
+
+    dispersion.N = N
+    dispersion.colpa_method = colpa_method
+    dispersion.phase_cache = None
+    dispersion._C = None
+    dispersion._projections = None
+    dispersion._prepare_pairs()
+
+    _worker_dispersion = dispersion
+
+
+def _worker_omegas(kpoints, zeros_to_none):
+    r"""
+    Computes magnon energies for the chunk of k points in the worker process.
+
+    Parameters
+    ----------
+    kpoints : (M, 3) :numpy:`ndarray`
+        K points in absolute coordinates.
+    zeros_to_none : bool
+        If True, then return ``None`` instead of 0 if Colpa fails.
+
+    Returns
+    -------
+    omegas : (M, N) :numpy:`ndarray`
+    """
+
+    omegas, _ = _worker_dispersion._omegas_from_h(
+        _worker_dispersion.h(kpoints), zeros_to_none=zeros_to_none
+    )
+    return omegas
@@ -0,0 +1,239 @@
+# RAD-tools - program for spin Hamiltonian and magnons.
+# Copyright (C) 2022-2023  Andrey Rybakov
+#
+# e-mail: anry@uv.es, web: adrybakov.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+r"""
+Magnon dispersion for an ensemble of the exchange parameters.
+"""
+
+from typing import Union
+
+import numpy as np
+from scipy.spatial.transform import Rotation
+
+from radtools.crystal.kpoints import Kpoints
+from radtools.magnons.dispersion import MagnonDispersion
+from radtools.magnons.kernel import MagnonKernel
+from radtools.spinham.hamiltonian import SpinHamiltonian
+
+__all__ = ["MagnonEnsemble"]
+
+# Maximum number of h(k) matrices, which are diagonalized at once
+_CHUNK_SIZE = 2**14
+
+
+class MagnonEnsemble:
+    r"""
+    Magnon dispersion for an ensemble of the exchange parameters.
+
+    All samples share the bonds, spins and the ordering of the reference model,
+    only the exchange matrices differ. Matrices :math:`\boldsymbol{h}(\boldsymbol{k})`
+    are linear in the exchange matrices, therefore they are computed for all samples
+    and k points at once, with the ensemble as the leading axis.
+
+    .. versionadded:: 0.8.10
+
+    Parameters
+    ----------
+    model : :py:class:`.SpinHamiltonian` or :py:class:`.MagnonKernel`
+        Reference model. Defines the bonds, spins and the exchange matrices
+        if ``J`` is not given.
+    J : (n_samples, n_bonds, 3, 3) |array_like|_
+        Exchange matrices of each sample, in the order of the bonds of the compiled
+        model (see :py:attr:`.MagnonKernel.J`). In the "SpinW" notation.
+    Q : (3,) |array_like|_, optional
+        Ordering wave vector of the spin-spiral. See :py:class:`.MagnonDispersion`.
+    n : (3,) |array_like|_, optional
+        Global rotational axis. See :py:class:`.MagnonDispersion`.
+
+    Attributes
+    ----------
+    dispersion : :py:class:`.MagnonDispersion`
+        Dispersion of the reference model.
+    J : (n_samples, n_bonds, 3, 3) :numpy:`ndarray`
+        Exchange matrices of each sample.
+    n_samples : int
+        Number of samples.
+
+    See Also
+    --------
+    MagnonEnsemble.from_models
+    """
+
+    def __init__(self, model: Union[SpinHamiltonian, MagnonKernel], J, Q=None, n=None):
+        self.dispersion = MagnonDispersion(model, Q=Q, n=n)
+        self.J = np.array(J, dtype=float)
+        n_bonds = len(self.dispersion.indices_i)
+        if self.J.ndim != 4 or self.J.shape[1:] != (n_bonds, 3, 3):
+            raise ValueError(
+                f"Expected exchange matrices of shape (n_samples, {n_bonds}, 3, 3), "
+                + f"got {self.J.shape}."
+            )
+        self.n_samples = len(self.J)
+
+    @staticmethod
+    def from_models(models, Q=None, n=None):
+        r"""
+        Ensemble from the set of spin Hamiltonians.
+
+        Parameters
+        ----------
+        models : list of :py:class:`.SpinHamiltonian` or :py:class:`.MagnonKernel`
+            Samples. Bonds and spins have to be the same for all of them.
+        Q : (3,) |array_like|_, optional
+            Ordering wave vector of the spin-spiral. See :py:class:`.MagnonDispersion`.
+        n : (3,) |array_like|_, optional
+            Global rotational axis. See :py:class:`.MagnonDispersion`.
+
+        Returns
+        -------
+        ensemble : :py:class:`.MagnonEnsemble`
+
+        Raises
+        ------
+        ValueError
+            If the bonds or spins differ between the samples.
+        """
+
+        kernels = [
+            (
+                model
+                if isinstance(model, MagnonKernel)
+                else MagnonKernel.from_spinham(model)
+            )
+            for model in models
+        ]
+        reference = kernels[0]
+        for kernel in kernels[1:]:
+            if not (
+                len(kernel) == len(reference)
+                and np.array_equal(kernel.i, reference.i)
+                and np.array_equal(kernel.j, reference.j)
+                and np.allclose(kernel.d, reference.d)
+                and np.allclose(kernel.spins, reference.spins)
+            ):
+                raise ValueError("Bonds and spins have to be the same for all models.")
+        return MagnonEnsemble(reference, [kernel.J for kernel in kernels], Q=Q, n=n)
+
+    def _projections(self):
+        r"""
+        Projections of the exchange matrices on the local spin frames for each sample.
+
+        See :py:meth:`.MagnonDispersion._bond_projections`.
+
+        Returns
+        -------
+        a : (n_samples, n_bonds) :numpy:`ndarray`
+        b : (n_samples, n_bonds) :numpy:`ndarray`
+        C : (n_samples, N) :numpy:`ndarray`
+            Diagonal of the C matrix.
+        """
+
+        dispersion = self.dispersion
+        i, j = dispersion.indices_i, dispersion.indices_j
+        J = self.J
+        if len(dispersion.dis_vectors) != 0:
+            rotvecs = np.outer(dispersion.dis_vectors @ dispersion.Q, dispersion.n)
+            R_nm = Rotation.from_rotvec(rotvecs).as_matrix()
+            J = np.einsum("sbij,bjk->sbik", J, R_nm)
+
+        u, v = dispersion.u, dispersion.v
+        S = np.linalg.norm(dispersion.S, axis=1)
+        prefactor = np.sqrt(S[i] * S[j]) / 2
+        a = prefactor * np.einsum("bx,sbxy,by->sb", u[i], J, np.conjugate(u[j]))
+        b = prefactor * np.einsum("bx,sbxy,by->sb", u[i], J, u[j])
+        c = S[j] * np.einsum("bx,sbxy,by->sb", v[i], J, v[j])
+
+        # Sum over l is hidden in the summation over bonds
+        atoms = np.zeros((len(i), dispersion.N), dtype=float)
+        atoms[np.arange(len(i)), i] = 1
+        return a, b, c @ atoms
+
+    def omegas(self, kpoints):
+        r"""
+        Magnon energies of each sample.
+
+        Parameters
+        ----------
+        kpoints : (n_k, 3) |array_like|_ or :py:class:`.Kpoints`
+            K points in absolute coordinates.
+
+        Returns
+        -------
+        omegas : (n_samples, n_k, N) :numpy:`ndarray`
+            Magnon energies, sorted in ascending order for each k point.
+        """
+
+        if isinstance(kpoints, Kpoints):
+            kpoints = kpoints.points()
+        kpoints = np.array(kpoints, dtype=float).reshape((-1, 3))
+
+        dispersion = self.dispersion
+        N = dispersion.N
+        a, b, C = self._projections()
+        values = np.stack((a, b, np.conjugate(a)), axis=2)
+
+        omegas = np.zeros((self.n_samples, len(kpoints), N), dtype=float)
+        step = max(1, _CHUNK_SIZE // self.n_samples)
+        for start in range(0, len(kpoints), step):
+            chunk = slice(start, start + step)
+            # A(k), B(k) and conj(A(-k)) are computed with exp(+ik·d)
+            phases = np.conjugate(dispersion._phases(kpoints[chunk]))
+            n_k = len(phases)
+            A, B, A_conj = np.moveaxis(
+                dispersion._sum_over_pairs(
+                    (phases[None, :, :, None] * values[:, None]).reshape(
+                        (self.n_samples * n_k,) + values.shape[1:]
+                    )
+                ),
+                3,
+                0,
+            )
+            C_chunk = np.repeat(C, n_k, axis=0)[:, :, None] * np.eye(N)
+
+            h = np.zeros((self.n_samples * n_k, 2 * N, 2 * N), dtype=complex)
+            h[:, :N, :N] = 2 * A - 2 * C_chunk
+            h[:, :N, N:] = 2 * B
+            h[:, N:, :N] = 2 * np.conjugate(np.transpose(B, (0, 2, 1)))
+            h[:, N:, N:] = 2 * A_conj - 2 * C_chunk
+
+            chunk_omegas, _ = dispersion._omegas_from_h(h)
+            omegas[:, chunk] = np.sort(chunk_omegas, axis=1).reshape(
+                (self.n_samples, n_k, N)
+            )
+
+        return omegas
+
+    def bands(self, kpoints, percentiles=(2.5, 50, 97.5)):
+        r"""
+        Percentiles of the magnon energies over the ensemble.
+
+        Parameters
+        ----------
+        kpoints : (n_k, 3) |array_like|_ or :py:class:`.Kpoints`
+            K points in absolute coordinates.
+        percentiles : (n_p,) |array_like|_, default (2.5, 50, 97.5)
+            Percentiles, from 0 to 100. Default values give the median and
+            the 95% band.
+
+        Returns
+        -------
+        bands : (n_p, n_k, N) :numpy:`ndarray`
+            Percentiles of each mode at each k point.
+        """
+
+        return np.percentile(self.omegas(kpoints), percentiles, axis=0)
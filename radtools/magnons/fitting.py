@@ -0,0 +1,401 @@
+# RAD-tools - program for spin Hamiltonian and magnons.
+# Copyright (C) 2022-2023  Andrey Rybakov
+#
+# e-mail: anry@uv.es, web: adrybakov.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+r"""
+Fit of the exchange parameters to the measured magnon energies.
+"""
+
+from copy import deepcopy
+
+import numpy as np
+from scipy.optimize import least_squares
+
+from radtools.crystal.kpoints import Kpoints
+from radtools.magnons.dispersion import MagnonDispersion
+from radtools.magnons.kernel import MagnonKernel
+from radtools.spinham.template import ExchangeTemplate
+
+__all__ = ["ExchangeFit"]
+
+
+class ExchangeFit:
+    r"""
+    Least-squares fit of the exchange parameters to the measured magnon energies.
+
+    Bonds are grouped by the names of the template. Each group has one isotropic
+    exchange :math:`J_g` and, optionally, one length of the DMI vector :math:`D_g`:
+
+    .. math::
+
+        \boldsymbol{J}_b = J_g\boldsymbol{I} + D_g\hat{\boldsymbol{D}}_b
+        + \boldsymbol{J}^{aniso}_b
+
+    where the directions of the DMI :math:`\hat{\boldsymbol{D}}_b` and the
+    anisotropic part :math:`\boldsymbol{J}^{aniso}_b` are taken from the model
+    and are kept fixed (the same as in :py:meth:`.SpinHamiltonian.form_model`).
+    Bonds, which are not in the template, are kept as they are. In the double
+    counting notation the reversed bond :math:`(atom_2, atom_1, -\boldsymbol{R})`
+    of each bond of the template is changed together with it (its matrix is
+    transposed), unless the template lists the reversed bond itself.
+
+    Matrix :math:`\boldsymbol{h}(\boldsymbol{k})` is linear in the parameters,
+    therefore its derivatives are computed once. Derivatives of the energies follow
+    from the Hellmann-Feynman theorem on the Colpa eigenvectors
+    (see :py:meth:`.MagnonDispersion.modes`):
+
+    .. math::
+
+        \dfrac{\partial\omega_n(\boldsymbol{k})}{\partial p} =
+        \left[(\boldsymbol{G}^{\dagger}(\boldsymbol{k}))^{-1}
+        \dfrac{\partial\boldsymbol{h}(\boldsymbol{k})}{\partial p}
+        \boldsymbol{G}^{-1}(\boldsymbol{k})\right]_{nn}
+
+    and the Jacobian for all data points is computed with one diagonalization per
+    unique k point.
+
+    .. versionadded:: 0.8.10
+
+    Parameters
+    ----------
+    model : :py:class:`.SpinHamiltonian`
+        Spin Hamiltonian with the initial values of the parameters.
+        It is not modified.
+    template : :py:class:`.ExchangeTemplate`
+        Groups of the bonds.
+    kpoints : (n_data, 3) |array_like|_ or :py:class:`.Kpoints`
+        K points of the measured energies. In absolute coordinates.
+    energies : (n_data,) |array_like|_
+        Measured magnon energies.
+    errors : (n_data,) |array_like|_, optional
+        Uncertainties of the measured energies. Ones by default.
+    modes : (n_data,) |array_like|_, optional
+        Index of the magnon mode for each measured energy, modes are sorted in
+        ascending order of energy. By default each measured energy is
+        compared with the closest mode of the model.
+    dmi : bool, default False
+        Whether to fit the lengths of the DMI vectors. The parameter is added only
+        for the groups with non-zero DMI.
+    relative : bool, default False
+        Whether ``kpoints`` are in relative coordinates with respect to the
+        reciprocal cell of the model.
+    Q : (3,) |array_like|_, optional
+        Ordering wave vector of the spin-spiral. See :py:class:`.MagnonDispersion`.
+    n : (3,) |array_like|_, optional
+        Global rotational axis. See :py:class:`.MagnonDispersion`.
+
+    Attributes
+    ----------
+    names : list of str
+        Names of the parameters. DMI parameters are marked with the "_dmi" suffix.
+    initial : (P,) :numpy:`ndarray`
+        Initial values of the parameters: mean values over the bonds of each group.
+    """
+
+    def __init__(
+        self,
+        model,
+        template: ExchangeTemplate,
+        kpoints,
+        energies,
+        errors=None,
+        modes=None,
+        dmi=False,
+        relative=False,
+        Q=None,
+        n=None,
+    ):
+        if not isinstance(template, ExchangeTemplate):
+            raise TypeError("Template has to be an instance of ExchangeTemplate.")
+
+        self._model = model
+        self._template = template
+
+        if isinstance(kpoints, Kpoints):
+            kpoints = kpoints.points()
+        kpoints = np.array(kpoints, dtype=float).reshape((-1, 3))
+        if relative:
+            kpoints = kpoints @ model.reciprocal_cell
+        self.energies = np.array(energies, dtype=float).reshape(-1)
+        if len(self.energies) != len(kpoints):
+            raise ValueError(
+                f"Expected {len(kpoints)} energies, got {len(self.energies)}."
+            )
+        if errors is None:
+            self.errors = np.ones(len(self.energies), dtype=float)
+        else:
+            self.errors = np.array(errors, dtype=float).reshape(-1)
+        if modes is None:
+            self.modes = None
+        else:
+            self.modes = np.array(modes, dtype=int).reshape(-1)
+
+        # Each k point is diagonalized only once
+        self._kpoints, self._inverse = np.unique(kpoints, axis=0, return_inverse=True)
+        self._inverse = self._inverse.reshape(-1)
+
+        # Basis of the linear parametrization: constant part and one part per parameter
+        self.names = []
+        self.initial = []
+        self._dmi_groups = set()
+        self._groups = self._group_bonds(model, template)
+        constant = deepcopy(model)
+        basis = []
+        for name, bonds in self._groups.items():
+            parameters = [constant[bond] for bond, _ in bonds]
+            self.names.append(name)
+            self.initial.append(np.mean([J.iso for J in parameters]))
+            basis.append((bonds, [np.eye(3) for J in parameters]))
+            if dmi and any([J.dmi_module != 0 for J in parameters]):
+                self._dmi_groups.add(name)
+                self.names.append(f"{name}_dmi")
+                self.initial.append(np.mean([J.dmi_module for J in parameters]))
+                basis.append(
+                    (
+                        bonds,
+                        [
+                            (
+                                J.asymm_matrix / J.dmi_module
+                                if J.dmi_module != 0
+                                else np.zeros((3, 3))
+                            )
+                            for J in parameters
+                        ],
+                    )
+                )
+            parameters += [
+                constant[reverse] for _, reverse in bonds if reverse is not None
+            ]
+            for J in parameters:
+                if name in self._dmi_groups:
+                    J.matrix = J.matrix - J.asymm_matrix
+                J.matrix = J.matrix - J.iso_matrix
+        self.initial = np.array(self.initial, dtype=float)
+
+        # h(k) = h_0(k) + sum_p p * h_p(k)
+        self._h = [self._compile(constant, Q, n)]
+        for bonds, matrices in basis:
+            part = deepcopy(model)
+            for _, _, _, J in part:
+                J.matrix = np.zeros((3, 3))
+            for (bond, reverse), matrix in zip(bonds, matrices):
+                part[bond].matrix = matrix
+                if reverse is not None:
+                    part[reverse].matrix = matrix.T
+            self._h.append(self._compile(part, Q, n))
+        self._h = np.array(self._h)
+
+        self._cache = None
+
+    @staticmethod
+    def _group_bonds(model, template):
+        r"""
+        Bonds of each group of the template with their reversed bonds.
+
+        Parameters
+        ----------
+        model : :py:class:`.SpinHamiltonian`
+        template : :py:class:`.ExchangeTemplate`
+
+        Returns
+        -------
+        groups : dict
+            Lists of (bond, reverse) for each name of the template. ``reverse`` is
+            the bond :math:`(atom_2, atom_1, -\boldsymbol{R})`, which changes
+            together with the bond, or None.
+        """
+
+        listed = set()
+        for name in template.names:
+            for atom1, atom2, R in template.names[name]:
+                listed.add((model.get_atom(atom1), model.get_atom(atom2), tuple(R)))
+
+        groups = {}
+        for name in template.names:
+            groups[name] = []
+            for atom1, atom2, R in template.names[name]:
+                reverse = None
+                if model._double_counting:
+                    R_reverse = tuple(-int(x) for x in R)
+                    key = (model.get_atom(atom2), model.get_atom(atom1), R_reverse)
+                    if key not in listed and key in model:
+                        reverse = (atom2, atom1, R_reverse)
+                groups[name].append(((atom1, atom2, R), reverse))
+        return groups
+
+    def _compile(self, model, Q, n):
+        r"""
+        Matrices :math:`\boldsymbol{h}(\boldsymbol{k})` at the unique k points of the data.
+
+        Returns
+        -------
+        h : (M, 2N, 2N) :numpy:`ndarray`
+        """
+
+        self._dispersion = MagnonDispersion(
+            MagnonKernel.from_spinham(model), Q=Q, n=n, colpa_method="eigh"
+        )
+        return self._dispersion.h(self._kpoints)
+
+    def _evaluate(self, parameters):
+        r"""
+        Model energies and their derivatives at the data points.
+
+        Result of the last call is cached, since the residuals and the Jacobian
+        are requested for the same parameters.
+
+        Parameters
+        ----------
+        parameters : (P,) |array_like|_
+
+        Returns
+        -------
+        omegas : (n_data,) :numpy:`ndarray`
+        derivatives : (n_data, P) :numpy:`ndarray`
+        """
+
+        parameters = np.array(parameters, dtype=float).reshape(-1)
+        if self._cache is not None and np.array_equal(self._cache[0], parameters):
+            return self._cache[1], self._cache[2]
+
+        h = self._h[0] + np.einsum("p,pmxy->mxy", parameters, self._h[1:])
+        E, G, success = self._dispersion._colpa_from_h(h, method="eigh")
+        N = self._dispersion.N
+
+        # First N energies are sorted in descending order
+        omegas = np.where(success[:, None], E[:, N - 1 :: -1], 0.0)
+        vectors = np.linalg.inv(np.where(success[:, None, None], G, np.eye(2 * N)))
+        vectors = vectors[:, :, N - 1 :: -1]
+        derivatives = np.einsum(
+            "mxn,pmxy,myn->mnp", np.conjugate(vectors), self._h[1:], vectors
+        ).real
+        derivatives[~success] = 0
+
+        omegas = omegas[self._inverse]
+        derivatives = derivatives[self._inverse]
+        if self.modes is None:
+            modes = np.argmin(np.abs(omegas - self.energies[:, None]), axis=1)
+        else:
+            modes = self.modes
+        data = np.arange(len(self.energies))
+        omegas, derivatives = omegas[data, modes], derivatives[data, modes]
+
+        self._cache = (parameters, omegas, derivatives)
+        return omegas, derivatives
+
+    def residuals(self, parameters):
+        r"""
+        Weighted residuals of the fit.
+
+        .. math::
+
+            r_i = \dfrac{\omega_{n_i}(\boldsymbol{k}_i) - \omega_i}{\sigma_i}
+
+        Parameters
+        ----------
+        parameters : (P,) |array_like|_
+            Values of the parameters, in the order of :py:attr:`.ExchangeFit.names`.
+
+        Returns
+        -------
+        residuals : (n_data,) :numpy:`ndarray`
+        """
+
+        omegas, _ = self._evaluate(parameters)
+        return (omegas - self.energies) / self.errors
+
+    def jacobian(self, parameters):
+        r"""
+        Analytic derivatives of the weighted residuals.
+
+        Parameters
+        ----------
+        parameters : (P,) |array_like|_
+            Values of the parameters, in the order of :py:attr:`.ExchangeFit.names`.
+
+        Returns
+        -------
+        jacobian : (n_data, P) :numpy:`ndarray`
+        """
+
+        _, derivatives = self._evaluate(parameters)
+        return derivatives / self.errors[:, None]
+
+    def fit(self, initial=None, **kwargs):
+        r"""
+        Fit the parameters.
+
+        Parameters
+        ----------
+        initial : (P,) |array_like|_, optional
+            Initial values of the parameters. :py:attr:`.ExchangeFit.initial` by default.
+        **kwargs
+            Passed to ``scipy.optimize.least_squares``.
+
+        Returns
+        -------
+        parameters : (P,) :numpy:`ndarray`
+            Fitted values of the parameters.
+        uncertainties : (P,) :numpy:`ndarray`
+            Standard deviations of the parameters, from the inverse of
+            :math:`\boldsymbol{J}^T\boldsymbol{J}` at the solution.
+        """
+
+        if initial is None:
+            initial = self.initial
+        result = least_squares(
+            self.residuals, np.array(initial, dtype=float), jac=self.jacobian, **kwargs
+        )
+        jacobian = self.jacobian(result.x)
+        covariance = np.linalg.pinv(jacobian.T @ jacobian)
+        return result.x, np.sqrt(np.diag(covariance))
+
+    def model(self, parameters):
+        r"""
+        Spin Hamiltonian with the given values of the parameters.
+
+        Parameters
+        ----------
+        parameters : (P,) |array_like|_
+            Values of the parameters, in the order of :py:attr:`.ExchangeFit.names`.
+
+        Returns
+        -------
+        model : :py:class:`.SpinHamiltonian`
+            New instance, the model given at the creation is not modified.
+        """
+
+        parameters = iter(np.array(parameters, dtype=float).reshape(-1))
+        model = deepcopy(self._model)
+        for name, bonds in self._groups.items():
+            iso = next(parameters)
+            dmi = next(parameters) if name in self._dmi_groups else None
+            for bond, reverse in bonds:
+                J = model[bond]
+                direction = np.zeros((3, 3))
+                if J.dmi_module != 0:
+                    direction = J.asymm_matrix / J.dmi_module
+                # Reversed bond gets the transposed matrices, as in the basis
+                pairs = [(J, direction)]
+                if reverse is not None:
+                    pairs.append((model[reverse], direction.T))
+                for J, direction in pairs:
+                    matrix = J.matrix - J.iso_matrix + iso * np.eye(3)
+                    if dmi is not None:
+                        matrix = matrix - J.asymm_matrix + dmi * direction
+                    J.matrix = matrix
+        return model
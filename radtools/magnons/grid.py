@@ -0,0 +1,371 @@
+# RAD-tools - program for spin Hamiltonian and magnons.
+# Copyright (C) 2022-2023  Andrey Rybakov
+#
+# e-mail: anry@uv.es, web: adrybakov.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from typing import Iterable
+
+import numpy as np
+
+from radtools.constants import K_BOLTZMANN
+from radtools.crystal.kpoints import monkhorst_pack
+from radtools.crystal.symmetry import irreducible_kpoints
+
+__all__ = ["MagnonGrid"]
+
+# Splitting of the grid cell into six tetrahedra, which share the main diagonal.
+# Corner (dx, dy, dz) of the cell has index dx + 2 * dy + 4 * dz.
+_TETRAHEDRA = np.array(
+    [
+        [0, 1, 3, 7],
+        [0, 1, 5, 7],
+        [0, 2, 3, 7],
+        [0, 2, 6, 7],
+        [0, 4, 5, 7],
+        [0, 4, 6, 7],
+    ]
+)
+
+# Maximum number of elements in the temporary arrays of the DOS computation
+_CHUNK_SIZE = 2**22
+
+
+class MagnonGrid:
+    r"""
+    Magnon energies on the uniform grid in the Brillouin zone.
+
+    Energies are computed for all grid points at once
+    (see :py:meth:`.MagnonDispersion.omegas`) and are sorted in the ascending
+    order for each k point. Energies are expected to be in meV.
+
+    .. versionadded:: 0.8.10
+
+    Parameters
+    ----------
+    dispersion : :py:class:`.MagnonDispersion`
+        Magnon dispersion.
+    n1 : int
+        Number of points along :math:`\boldsymbol{b}_1`.
+    n2 : int
+        Number of points along :math:`\boldsymbol{b}_2`.
+    n3 : int
+        Number of points along :math:`\boldsymbol{b}_3`.
+    shift : (3,) |array_like|_, default (0, 0, 0)
+        Shift of the grid in the units of the grid spacing. See :py:func:`.monkhorst_pack`.
+    n_workers : int, optional
+        Number of worker processes. See :py:meth:`.MagnonDispersion.omegas`.
+    crystal : :py:class:`.Crystal`, optional
+        Crystal (or :py:class:`.SpinHamiltonian`) of the dispersion. If given, then
+        the energies are computed only for the irreducible k points
+        (see :py:func:`.irreducible_kpoints`) and copied to the rest of the grid.
+        The crystal has to have the magnetic moments (or spins) of the model and
+        the exchange parameters have to obey its symmetry.
+        Not supported for the spin spirals.
+
+        .. versionadded:: 0.8.10
+
+    Attributes
+    ----------
+    shape : (3,) tuple of int
+        Number of the grid points along each reciprocal lattice vector.
+    kpoints : (M, 3) :numpy:`ndarray`
+        K points of the grid. In absolute coordinates.
+    omegas : (M, N) :numpy:`ndarray`
+        Magnon energies at each k point.
+    weights : (M,) :numpy:`ndarray`
+        Weights of the k points. Sum of the weights is one.
+    mapping : (M,) :numpy:`ndarray`
+        Index of the irreducible k point for each point of the grid.
+        Identity if ``crystal`` is not given.
+    n_irreducible : int
+        Number of k points, for which the energies were computed.
+
+    Examples
+    --------
+
+    .. doctest::
+
+        >>> import radtools as rad
+        >>> model = rad.SpinHamiltonian(lattice=rad.lattice_example("CUB"), notation="standard")
+        >>> model.add_atom(rad.Atom("Fe", (0, 0, 0), spin=[0, 0, 1]))
+        >>> model.add_bond("Fe", "Fe", (1, 0, 0), iso=1)
+        >>> model.add_bond("Fe", "Fe", (0, 1, 0), iso=1)
+        >>> model.add_bond("Fe", "Fe", (0, 0, 1), iso=1)
+        >>> grid = rad.MagnonGrid(rad.MagnonDispersion(model), 8, 8, 8)
+        >>> grid.omegas.shape
+        (512, 1)
+    """
+
+    def __init__(
+        self,
+        dispersion,
+        n1: int,
+        n2: int,
+        n3: int,
+        shift=(0, 0, 0),
+        n_workers=None,
+        crystal=None,
+    ) -> None:
+        self.dispersion = dispersion
+        self.shape = (int(n1), int(n2), int(n3))
+        reciprocal_cell = dispersion.kernel.reciprocal_cell
+        self.kpoints = monkhorst_pack(*self.shape, shift=shift) @ reciprocal_cell
+
+        if crystal is None:
+            irreducible = self.kpoints
+            self.mapping = np.arange(len(self.kpoints))
+        else:
+            if not np.allclose(dispersion.Q, 0):
+                raise ValueError(
+                    "Symmetry reduction of the grid is not supported for the spin spirals."
+                )
+            irreducible, _, self.mapping = irreducible_kpoints(
+                crystal, *self.shape, shift=shift
+            )
+            irreducible = irreducible @ reciprocal_cell
+        self.n_irreducible = len(irreducible)
+
+        omegas = dispersion.omegas(irreducible, n_workers=n_workers).T[self.mapping]
+        self.omegas = np.sort(np.real(omegas.astype(complex)), axis=1)
+        self.weights = np.full(len(self.kpoints), 1 / len(self.kpoints))
+
+    def dos(self, energies, method="gaussian", sigma=None):
+        r"""
+        Magnon density of states.
+
+        Density of states is normalized to the number of magnon modes:
+
+        .. math::
+
+            \int g(E)dE = N
+
+        Parameters
+        ----------
+        energies : (n,) |array_like|_
+            Energies at which the density of states is computed.
+        method : str, default "gaussian"
+            Integration method:
+
+            * "gaussian": each energy is broadened by the gaussian with the
+              standard deviation ``sigma``.
+            * "tetrahedron": linear tetrahedron method. Each grid cell is split
+              into six tetrahedra, within which the energies are interpolated linearly.
+        sigma : float, optional
+            Standard deviation of the gaussian. By default it is 1/100 of the
+            bandwidth. Used only for ``method = "gaussian"``.
+
+        Returns
+        -------
+        dos : (n,) :numpy:`ndarray`
+            Density of states.
+        """
+
+        energies = np.array(energies, dtype=float).reshape(-1)
+        method = method.lower()
+
+        if method == "gaussian":
+            if sigma is None:
+                sigma = max(np.ptp(self.omegas), 1e-8) / 100
+            return self._dos_gaussian(energies, sigma)
+        if method == "tetrahedron":
+            return self._dos_tetrahedron(energies)
+
+        raise ValueError(
+            f'Method has to be "gaussian" or "tetrahedron", got "{method}".'
+        )
+
+    def _dos_gaussian(self, energies, sigma):
+        omegas = self.omegas
+        weights = np.broadcast_to(self.weights[:, None], omegas.shape).reshape(-1)
+        omegas = omegas.reshape(-1)
+
+        dos = np.zeros(energies.shape, dtype=float)
+        step = max(1, _CHUNK_SIZE // max(1, omegas.size))
+        for start in range(0, len(energies), step):
+            x = (energies[start : start + step, None] - omegas[None, :]) / sigma
+            dos[start : start + step] = np.exp(-0.5 * x**2) @ weights
+        return dos / (sigma * np.sqrt(2 * np.pi))
+
+    def _tetrahedra(self):
+        r"""
+        Indices of the tetrahedra corners.
+
+        Returns
+        -------
+        corners : (6 * M, 4) :numpy:`ndarray`
+            Indices of the k points for each tetrahedron.
+        """
+
+        shape = np.array(self.shape)
+        origins = np.indices(shape).reshape((3, -1)).T
+        shifts = np.array([[i & 1, (i >> 1) & 1, (i >> 2) & 1] for i in range(8)])
+        cells = (origins[:, None, :] + shifts[None, :, :]) % shape
+        cells = np.ravel_multi_index(np.moveaxis(cells, -1, 0), shape)
+        return cells[:, _TETRAHEDRA].reshape((-1, 4))
+
+    def _dos_tetrahedron(self, energies):
+        # (n_tetrahedra * N, 4) sorted energies at the corners
+        corners = np.sort(
+            np.moveaxis(self.omegas[self._tetrahedra()], 1, 2).reshape((-1, 4)), axis=1
+        )
+        weight = 1 / len(corners) * self.omegas.shape[1]
+
+        e1, e2, e3, e4 = [corners[:, i] for i in range(4)]
+        # Degenerate tetrahedra do not contribute to the density of states
+        with np.errstate(divide="ignore", invalid="ignore"):
+            e21 = e2 - e1
+            e31 = e3 - e1
+            e41 = e4 - e1
+            e32 = e3 - e2
+            e42 = e4 - e2
+            e43 = e4 - e3
+
+            dos = np.zeros(energies.shape, dtype=float)
+            step = max(1, _CHUNK_SIZE // max(1, len(corners)))
+            for start in range(0, len(energies), step):
+                E = energies[start : start + step, None]
+                g = np.where(
+                    (e1 < E) & (E <= e2),
+                    3 * (E - e1) ** 2 / (e21 * e31 * e41),
+                    0.0,
+                )
+                g += np.where(
+                    (e2 < E) & (E <= e3),
+                    (
+                        3 * e21
+                        + 6 * (E - e2)
+                        - 3 * (e31 + e42) * (E - e2) ** 2 / (e32 * e42)
+                    )
+                    / (e31 * e41),
+                    0.0,
+                )
+                g += np.where(
+                    (e3 < E) & (E < e4),
+                    3 * (e4 - E) ** 2 / (e41 * e42 * e43),
+                    0.0,
+                )
+                dos[start : start + step] = np.nansum(g, axis=1)
+        return dos * weight
+
+    def bose_factors(self, temperatures):
+        r"""
+        Bose-Einstein occupation numbers of the magnon modes.
+
+        .. math::
+
+            n(\omega, T) = \dfrac{1}{e^{\omega / k_BT} - 1}
+
+        Modes with non-positive energy (i.e. Goldstone modes) are not occupied.
+
+        Parameters
+        ----------
+        temperatures : (n_T,) |array_like|_
+            Temperatures, in Kelvin.
+
+        Returns
+        -------
+        factors : (n_T, M, N) :numpy:`ndarray`
+            Occupation numbers for each temperature, k point and mode.
+        """
+
+        x = self._reduced_energies(temperatures)
+        with np.errstate(over="ignore"):
+            return np.where(np.isfinite(x), 1 / np.expm1(x), 0.0)
+
+    def _reduced_energies(self, temperatures):
+        r"""
+        :math:`\omega / k_BT`, infinite for the modes, which are not occupied.
+        """
+
+        temperatures = np.array(temperatures, dtype=float).reshape(-1)
+        if (temperatures <= 0).any():
+            raise ValueError("Temperatures have to be positive.")
+
+        omegas = np.where(self.omegas > 0, self.omegas, np.inf)
+        return omegas[None, :, :] / (K_BOLTZMANN * temperatures[:, None, None])
+
+    def magnon_number(self, temperatures):
+        r"""
+        Number of thermal magnons per unit cell.
+
+        .. math::
+
+            n(T) = \sum_{\boldsymbol{k}, \nu} w_{\boldsymbol{k}} n(\omega_{\nu}(\boldsymbol{k}), T)
+
+        Parameters
+        ----------
+        temperatures : (n_T,) |array_like|_
+            Temperatures, in Kelvin.
+
+        Returns
+        -------
+        number : (n_T,) :numpy:`ndarray`
+            Number of magnons for each temperature.
+        """
+
+        return np.einsum("tkn,k->t", self.bose_factors(temperatures), self.weights)
+
+    def energy(self, temperatures):
+        r"""
+        Thermal energy of the magnons per unit cell.
+
+        .. math::
+
+            E(T) = \sum_{\boldsymbol{k}, \nu} w_{\boldsymbol{k}}
+            \omega_{\nu}(\boldsymbol{k}) n(\omega_{\nu}(\boldsymbol{k}), T)
+
+        Parameters
+        ----------
+        temperatures : (n_T,) |array_like|_
+            Temperatures, in Kelvin.
+
+        Returns
+        -------
+        energy : (n_T,) :numpy:`ndarray`
+            Energy for each temperature, in meV.
+        """
+
+        factors = self.bose_factors(temperatures)
+        omegas = np.where(self.omegas > 0, self.omegas, 0.0)
+        return np.einsum("tkn,kn,k->t", factors, omegas, self.weights)
+
+    def specific_heat(self, temperatures):
+        r"""
+        Magnon specific heat per unit cell.
+
+        .. math::
+
+            C(T) = \dfrac{dE}{dT} = k_B \sum_{\boldsymbol{k}, \nu} w_{\boldsymbol{k}}
+            \dfrac{x^2e^x}{(e^x - 1)^2},
+            \quad x = \dfrac{\omega_{\nu}(\boldsymbol{k})}{k_BT}
+
+        Parameters
+        ----------
+        temperatures : (n_T,) |array_like|_
+            Temperatures, in Kelvin.
+
+        Returns
+        -------
+        specific_heat : (n_T,) :numpy:`ndarray`
+            Specific heat for each temperature, in meV / K.
+        """
+
+        x = self._reduced_energies(temperatures)
+        # x^2 e^x / (e^x - 1)^2 = (x / 2)^2 / sinh^2(x / 2)
+        with np.errstate(over="ignore", invalid="ignore"):
+            values = np.where(np.isfinite(x), (0.5 * x / np.sinh(0.5 * x)) ** 2, 0.0)
+        values = np.nan_to_num(values, nan=0.0)
+        return K_BOLTZMANN * np.einsum("tkn,k->t", values, self.weights)
@@ -0,0 +1,266 @@
+# RAD-tools - program for spin Hamiltonian and magnons.
+# Copyright (C) 2022-2023  Andrey Rybakov
+#
+# e-mail: anry@uv.es, web: adrybakov.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+r"""
+Magnon dispersion, which is updated bond by bond.
+"""
+
+import numpy as np
+from scipy.spatial.transform import Rotation
+
+from radtools.crystal.kpoints import Kpoints
+from radtools.magnons.kernel import MagnonKernel
+
+__all__ = ["IncrementalDispersion"]
+
+
+class IncrementalDispersion:
+    r"""
+    Magnon dispersion on the fixed set of k points, which is updated bond by bond.
+
+    Matrices :math:`\boldsymbol{h}(\boldsymbol{k})` (see :py:meth:`.MagnonDispersion.h`)
+    are computed once and are kept. Each bond contributes to the six elements
+    of each matrix, therefore when a bond is added, removed or changed only its
+    contribution is added or subtracted and the matrices are diagonalized again.
+
+    Bonds are given in the "SpinW" notation, as in :py:class:`.MagnonKernel`.
+    As in :py:meth:`.SpinHamiltonian.add_bond` for the double counting notation,
+    the bond :math:`(j, i, -\boldsymbol{R})` is added (removed, changed)
+    together with the bond :math:`(i, j, \boldsymbol{R})`.
+
+    .. versionadded:: 0.8.10
+
+    Parameters
+    ----------
+    dispersion : :py:class:`.MagnonDispersion`
+        Initial dispersion. It defines the spins, spin-spiral and the initial bonds.
+        It is not modified.
+    kpoints : (M, 3) |array_like|_ or :py:class:`.Kpoints`
+        K points in absolute coordinates.
+
+    Attributes
+    ----------
+    dispersion : :py:class:`.MagnonDispersion`
+        Initial dispersion.
+    kpoints : (M, 3) :numpy:`ndarray`
+        K points in absolute coordinates.
+    """
+
+    def __init__(self, dispersion, kpoints):
+        if isinstance(kpoints, Kpoints):
+            kpoints = kpoints.points()
+        self.dispersion = dispersion
+        self.kpoints = np.array(kpoints, dtype=float).reshape((-1, 3))
+        self._h = dispersion.h(self.kpoints)
+
+        kernel = dispersion.kernel
+        R = np.rint(kernel.d @ np.linalg.inv(kernel.cell)).astype(int)
+        self._bonds = dict(
+            [
+                ((i, j, tuple(R_b)), np.array(J, dtype=float))
+                for i, j, R_b, J in zip(
+                    kernel.i.tolist(), kernel.j.tolist(), R.tolist(), kernel.J
+                )
+            ]
+        )
+
+    def __len__(self):
+        return len(self._bonds)
+
+    def __contains__(self, key):
+        i, j, R = key
+        return (i, j, tuple(R)) in self._bonds
+
+    def _apply(self, i, j, R, J, sign):
+        r"""
+        Adds (``sign=1``) or subtracts (``sign=-1``) contribution of one bond.
+        """
+
+        dispersion = self.dispersion
+        N = dispersion.N
+        d = np.array(R, dtype=float) @ dispersion.kernel.cell
+
+        # Rotation of the spin-spiral, see MagnonDispersion
+        rotation = Rotation.from_rotvec((d @ dispersion.Q) * dispersion.n).as_matrix()
+        J = J @ rotation
+
+        S = np.linalg.norm(dispersion.S, axis=1)
+        u, v = dispersion.u, dispersion.v
+        prefactor = np.sqrt(S[i] * S[j]) / 2
+        a = prefactor * u[i] @ J @ np.conjugate(u[j])
+        b = prefactor * u[i] @ J @ u[j]
+        c = S[j] * v[i] @ J @ v[j]
+
+        phases = sign * 2 * np.exp(1j * self.kpoints @ d)
+        self._h[:, i, j] += phases * a
+        self._h[:, i, N + j] += phases * b
+        self._h[:, N + j, i] += np.conjugate(phases * b)
+        self._h[:, N + i, N + j] += phases * np.conjugate(a)
+        self._h[:, i, i] -= sign * 2 * c
+        self._h[:, N + i, N + i] -= sign * 2 * c
+
+    def _set(self, i, j, R, J):
+        r"""
+        Sets the matrix of one bond, None removes the bond.
+        """
+
+        key = (i, j, R)
+        if key in self._bonds:
+            self._apply(i, j, R, self._bonds[key], -1)
+            del self._bonds[key]
+        if J is not None:
+            self._apply(i, j, R, J, 1)
+            self._bonds[key] = J
+
+    def _check(self, i, j, R):
+        N = self.dispersion.N
+        if not (0 <= i < N and 0 <= j < N):
+            raise ValueError(f"Atom indices have to be in [0, {N}), got ({i}, {j}).")
+        return int(i), int(j), tuple(int(x) for x in R)
+
+    def add_bond(self, i, j, R, J):
+        r"""
+        Add the bond or replace its exchange matrix.
+
+        Parameters
+        ----------
+        i : int
+            Index of the first atom, in the order of the spins of the dispersion.
+        j : int
+            Index of the second atom.
+        R : (3,) tuple of int
+            Unit cell of the second atom, relative coordinates.
+        J : (3, 3) |array_like|_
+            Exchange matrix in the "SpinW" notation.
+        """
+
+        i, j, R = self._check(i, j, R)
+        J = np.array(J, dtype=float).reshape((3, 3))
+        reverse = (j, i, tuple(-x for x in R))
+        self._set(i, j, R, J)
+        if reverse != (i, j, R):
+            self._set(*reverse, J.T)
+
+    def update_bond(self, i, j, R, J):
+        r"""
+        Change the exchange matrix of the existing bond and of the reverse bond.
+
+        Parameters
+        ----------
+        i : int
+            Index of the first atom, in the order of the spins of the dispersion.
+        j : int
+            Index of the second atom.
+        R : (3,) tuple of int
+            Unit cell of the second atom, relative coordinates.
+        J : (3, 3) |array_like|_
+            Exchange matrix in the "SpinW" notation.
+
+        Raises
+        ------
+        KeyError
+            If the bond is not present.
+        """
+
+        i, j, R = self._check(i, j, R)
+        if (i, j, R) not in self._bonds:
+            raise KeyError(f"Bond ({i}, {j}, {R}) is not present.")
+        J = np.array(J, dtype=float).reshape((3, 3))
+        reverse = (j, i, tuple(-x for x in R))
+        self._set(i, j, R, J)
+        if reverse != (i, j, R) and reverse in self._bonds:
+            self._set(*reverse, J.T)
+
+    def remove_bond(self, i, j, R):
+        r"""
+        Remove the bond and the reverse bond.
+
+        Parameters
+        ----------
+        i : int
+            Index of the first atom, in the order of the spins of the dispersion.
+        j : int
+            Index of the second atom.
+        R : (3,) tuple of int
+            Unit cell of the second atom, relative coordinates.
+
+        Raises
+        ------
+        KeyError
+            If the bond is not present.
+        """
+
+        i, j, R = self._check(i, j, R)
+        if (i, j, R) not in self._bonds:
+            raise KeyError(f"Bond ({i}, {j}, {R}) is not present.")
+        reverse = (j, i, tuple(-x for x in R))
+        self._set(i, j, R, None)
+        if reverse in self._bonds:
+            self._set(*reverse, None)
+
+    def h(self):
+        r"""
+        Current matrices :math:`\boldsymbol{h}(\boldsymbol{k})`.
+
+        Returns
+        -------
+        h : (M, 2N, 2N) :numpy:`ndarray`
+        """
+
+        return self._h.copy()
+
+    def omegas(self, zeros_to_none=False):
+        r"""
+        Magnon energies of the current bonds.
+
+        Parameters
+        ----------
+        zeros_to_none : bool, default=False
+            If True, then return ``None`` instead of 0 if Colpa fails.
+
+        Returns
+        -------
+        omegas : (N, M) :numpy:`ndarray`
+            Magnon energies for each k point, as in :py:meth:`.MagnonDispersion.omegas`.
+        """
+
+        omegas, _ = self.dispersion._omegas_from_h(self._h, zeros_to_none=zeros_to_none)
+        return omegas.T
+
+    @property
+    def kernel(self):
+        r"""
+        Compiled model with the current bonds.
+
+        Returns
+        -------
+        kernel : :py:class:`.MagnonKernel`
+        """
+
+        kernel = self.dispersion.kernel
+        keys = list(self._bonds)
+        R = np.array([key[2] for key in keys], dtype=float).reshape((-1, 3))
+        return MagnonKernel(
+            kernel.cell,
+            [self._bonds[key] for key in keys],
+            [key[0] for key in keys],
+            [key[1] for key in keys],
+            R @ kernel.cell,
+            kernel.spins,
+            kernel.positions,
+        )
@@ -0,0 +1,228 @@
+# RAD-tools - program for spin Hamiltonian and magnons.
+# Copyright (C) 2022-2023  Andrey Rybakov
+#
+# e-mail: anry@uv.es, web: adrybakov.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import numpy as np
+
+import radtools.crystal.cell as Cell
+from radtools.geometry import span_orthonormal_set
+from radtools.spinham.hamiltonian import SpinHamiltonian
+
+__all__ = ["MagnonKernel"]
+
+
+class MagnonKernel:
+    r"""
+    Compiled input for the magnon calculations.
+
+    Immutable array-only representation of the :py:class:`.SpinHamiltonian`
+    in the "SpinW" notation. It holds everything what is needed for the
+    :py:class:`.MagnonDispersion` and nothing else, therefore it is cheap to create,
+    to copy and to send to other processes.
+
+    In most cases it is created with :py:meth:`.MagnonKernel.from_spinham`.
+
+    .. versionadded:: 0.8.10
+
+    Parameters
+    ----------
+    cell : (3, 3) |array_like|_
+        Real space cell of the model.
+    J : (M, 3, 3) |array_like|_
+        Exchange matrices of M bonds. In the "SpinW" notation.
+    i : (M,) |array_like|_
+        Indices of the first atom of each bond.
+    j : (M,) |array_like|_
+        Indices of the second atom of each bond.
+    d : (M, 3) |array_like|_
+        Vectors of the bonds, in absolute coordinates.
+    spins : (N, 3) |array_like|_
+        Spin vectors of N magnetic atoms.
+    positions : (N, 3) |array_like|_, optional
+        Positions of the magnetic atoms in the unit cell, in absolute coordinates.
+        Zero by default. Used only for the intensities, not for the energies.
+
+    Attributes
+    ----------
+    cell : (3, 3) :numpy:`ndarray`
+    J : (M, 3, 3) :numpy:`ndarray`
+    i : (M,) :numpy:`ndarray`
+    j : (M,) :numpy:`ndarray`
+    d : (M, 3) :numpy:`ndarray`
+    spins : (N, 3) :numpy:`ndarray`
+    positions : (N, 3) :numpy:`ndarray`
+    u : (N, 3) :numpy:`ndarray`
+        Defined from local spin directions.
+    v : (N, 3) :numpy:`ndarray`
+        Defined from local spin directions.
+    N : int
+        Number of magnetic atoms.
+    """
+
+    def __init__(self, cell, J, i, j, d, spins, positions=None) -> None:
+        arrays = {
+            "cell": np.array(cell, dtype=float).reshape((3, 3)),
+            "J": np.array(J, dtype=float).reshape((-1, 3, 3)),
+            "i": np.array(i, dtype=int).reshape(-1),
+            "j": np.array(j, dtype=int).reshape(-1),
+            "d": np.array(d, dtype=float).reshape((-1, 3)),
+            "spins": np.array(spins, dtype=float).reshape((-1, 3)),
+        }
+        if positions is None:
+            positions = np.zeros(arrays["spins"].shape, dtype=float)
+        arrays["positions"] = np.array(positions, dtype=float).reshape((-1, 3))
+
+        n_bonds = len(arrays["J"])
+        for name in ["i", "j", "d"]:
+            if len(arrays[name]) != n_bonds:
+                raise ValueError(
+                    f"Expected {n_bonds} elements in '{name}', got {len(arrays[name])}."
+                )
+        N = len(arrays["spins"])
+        if len(arrays["positions"]) != N:
+            raise ValueError(
+                f"Expected {N} elements in 'positions', got {len(arrays['positions'])}."
+            )
+        if n_bonds != 0 and (
+            max(arrays["i"].max(), arrays["j"].max()) >= N
+            or min(arrays["i"].min(), arrays["j"].min()) < 0
+        ):
+            raise ValueError(f"Atom indices have to be in [0, {N}).")
+
+        # Local spin frames
+        u = np.zeros((N, 3), dtype=complex)
+        v = np.zeros((N, 3), dtype=complex)
+        for a_i in range(N):
+            e1, e2, e3 = span_orthonormal_set(arrays["spins"][a_i])
+            v[a_i] = e3
+            u[a_i] = e1 + 1j * e2
+        arrays["u"] = u
+        arrays["v"] = v
+
+        for name, array in arrays.items():
+            array.flags.writeable = False
+            object.__setattr__(self, name, array)
+        object.__setattr__(self, "N", N)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"'MagnonKernel' object is immutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"'MagnonKernel' object is immutable.")
+
+    def __reduce__(self):
+        return (
+            MagnonKernel,
+            (self.cell, self.J, self.i, self.j, self.d, self.spins, self.positions),
+        )
+
+    def __len__(self):
+        return len(self.J)
+
+    @property
+    def reciprocal_cell(self):
+        r"""
+        Reciprocal cell.
+
+        Returns
+        -------
+        reciprocal_cell : (3, 3) :numpy:`ndarray`
+        """
+
+        return Cell.reciprocal(self.cell)
+
+    @staticmethod
+    def from_spinham(
+        model: SpinHamiltonian, nodmi=False, noaniso=False, custom_mask=None
+    ):
+        r"""
+        Compile the spin Hamiltonian.
+
+        Bonds are read in one pass, notation is converted to "SpinW" and masks
+        are applied to the arrays of exchange matrices. ``model`` is not modified.
+
+        Parameters
+        ----------
+        model : :py:class:`.SpinHamiltonian`
+            Spin Hamiltonian. Magnetic atoms have to have :py:attr:`.Atom.spin_vector`
+            defined.
+        nodmi : bool, default=False
+            If True, then DMI is not included.
+        noaniso : bool, default=False
+            If True, then anisotropy is not included.
+        custom_mask : func
+            Custom mask for the exchange parameter. Function which take (3,3) :numpy:`ndarray`
+            as an input and returns (3,3) :numpy:`ndarray` as an output.
+            If given, then ``nodmi`` and ``noaniso`` are ignored.
+
+        Returns
+        -------
+        kernel : :py:class:`.MagnonKernel`
+
+        Raises
+        ------
+        ValueError
+            If spin vector is not defined for some of the magnetic atoms.
+        """
+
+        magnetic_atoms = model.magnetic_atoms
+
+        spins = np.zeros((len(magnetic_atoms), 3), dtype=float)
+        positions = np.zeros((len(magnetic_atoms), 3), dtype=float)
+        for a_i, atom in enumerate(magnetic_atoms):
+            positions[a_i] = atom.position @ model.cell
+            try:
+                spins[a_i] = atom.spin_vector
+            except ValueError:
+                raise ValueError(
+                    f"Spin vector is not defined for {atom.fullname} atom."
+                )
+
+        i, j, R, J = model.bonds.arrays(magnetic_atoms)
+
+        # Convert the notation to SpinW: double counting, spin is not normalized, factor 1
+        if not model._double_counting:
+            # Add missing (atom2, atom1, -R) bonds, rows of the arrays follow the table
+            missing = model.bonds.partners() == -1
+            J = np.concatenate((J, np.transpose(J[missing], (0, 2, 1))))
+            i, j = np.concatenate((i, j[missing])), np.concatenate((j, i[missing]))
+            R = np.concatenate((R, -R[missing]))
+        if model._double_counting is not None and not model._double_counting:
+            # Double counting does not affect on-site terms
+            onsite = (i == j) & (R == 0).all(axis=1)
+            J[~onsite] *= 0.5
+        if model._spin_normalized is not None and model._spin_normalized:
+            S = np.linalg.norm(spins, axis=1)
+            J /= (S[i] * S[j])[:, None, None]
+        if model._factor is not None:
+            J *= model._factor
+
+        # Masks
+        if custom_mask is not None:
+            J = np.array([custom_mask(matrix) for matrix in J], dtype=float).reshape(
+                (-1, 3, 3)
+            )
+        else:
+            J_T = np.transpose(J, (0, 2, 1))
+            symm = (J + J_T) / 2
+            if nodmi:
+                J = J - (J - J_T) / 2
+            if noaniso:
+                iso = np.trace(symm, axis1=1, axis2=2) / 3
+                J = J - (symm - iso[:, None, None] * np.identity(3))
+
+        return MagnonKernel(model.cell, J, i, j, R @ model.cell, spins, positions)
@@ -0,0 +1,141 @@
+# RAD-tools - program for spin Hamiltonian and magnons.
+# Copyright (C) 2022-2023  Andrey Rybakov
+#
+# e-mail: anry@uv.es, web: adrybakov.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from collections import OrderedDict
+from hashlib import sha1
+
+import numpy as np
+
+__all__ = ["PhaseCache"]
+
+
+class PhaseCache:
+    r"""
+    Least-recently-used cache of the phase factors.
+
+    Stores the tables of the phase factors
+
+    .. math::
+
+        e^{-i\boldsymbol{k}\boldsymbol{d}}
+
+    for the pairs of the k point set and the set of bond vectors. The same instance can be
+    passed to several :py:class:`.MagnonDispersion` objects, which share the same k points and
+    bonds (i.e. the variants of one :py:class:`.SpinHamiltonian` with different exchange values).
+    In that case the phase factors are computed only once.
+
+    .. versionadded:: 0.8.10
+
+    Parameters
+    ----------
+    max_memory : float, default 512
+        Maximum memory occupied by the stored tables, in megabytes.
+        Least recently used tables are removed when the limit is exceeded.
+
+    Examples
+    --------
+
+    .. doctest::
+
+        >>> import numpy as np
+        >>> import radtools as rad
+        >>> cache = rad.PhaseCache(max_memory=10)
+        >>> kpoints = np.linspace([0, 0, 0], [1, 1, 1], 100)
+        >>> vectors = np.array([[1, 0, 0], [0, 1, 0]])
+        >>> phases = cache(kpoints, vectors)
+        >>> phases.shape
+        (100, 2)
+        >>> cache(kpoints, vectors) is phases
+        True
+    """
+
+    def __init__(self, max_memory=512) -> None:
+        self.max_memory = max_memory
+        self._tables = OrderedDict()
+        self._memory = 0
+
+    def __len__(self):
+        return self._tables.__len__()
+
+    @property
+    def memory(self):
+        r"""
+        Memory occupied by the stored tables.
+
+        Returns
+        -------
+        memory : float
+            In megabytes.
+        """
+
+        return self._memory / 1024**2
+
+    @staticmethod
+    def _key(kpoints, vectors):
+        hasher = sha1()
+        for array in (kpoints, vectors):
+            hasher.update(str(array.shape).encode())
+            hasher.update(array.tobytes())
+        return hasher.hexdigest()
+
+    def __call__(self, kpoints, vectors):
+        r"""
+        Phase factors for the given k points and vectors.
+
+        Parameters
+        ----------
+        kpoints : (M, 3) |array_like|_
+            Reciprocal vectors. In absolute coordinates.
+        vectors : (n, 3) |array_like|_
+            Real space vectors. In absolute coordinates.
+
+        Returns
+        -------
+        phases : (M, n) :numpy:`ndarray`
+            Phase factors. Stored array is returned, it is read-only.
+        """
+
+        kpoints = np.ascontiguousarray(kpoints, dtype=float).reshape((-1, 3))
+        vectors = np.ascontiguousarray(vectors, dtype=float).reshape((-1, 3))
+
+        key = self._key(kpoints, vectors)
+        if key in self._tables:
+            self._tables.move_to_end(key)
+            return self._tables[key]
+
+        phases = np.exp(-1j * (kpoints @ vectors.T))
+        # Stored array is shared by all callers
+        phases.flags.writeable = False
+
+        # Tables, which do not fit in the cache, are not stored
+        if phases.nbytes <= self.max_memory * 1024**2:
+            self._tables[key] = phases
+            self._memory += phases.nbytes
+            while self._memory > self.max_memory * 1024**2:
+                _, removed = self._tables.popitem(last=False)
+                self._memory -= removed.nbytes
+
+        return phases
+
+    def clear(self):
+        r"""
+        Remove all stored tables.
+        """
+
+        self._tables.clear()
+        self._memory = 0
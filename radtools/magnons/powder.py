@@ -0,0 +1,133 @@
+# RAD-tools - program for spin Hamiltonian and magnons.
+# Copyright (C) 2022-2023  Andrey Rybakov
+#
+# e-mail: anry@uv.es, web: adrybakov.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+r"""
+Powder average of the magnon spectrum.
+"""
+
+import numpy as np
+
+from radtools.geometry import fibonacci_sphere
+
+__all__ = ["powder_average"]
+
+# Maximum number of q points, which are computed at once
+_CHUNK_SIZE = 4096
+
+
+def powder_average(
+    structure_factor,
+    q_norms,
+    energies,
+    n_directions=500,
+    sigma=None,
+    polarization=True,
+):
+    r"""
+    Spherical average of the dynamical structure factor.
+
+    .. math::
+
+        I(\vert\boldsymbol{q}\vert, \omega) = \dfrac{1}{4\pi}\int d\Omega_{\hat{q}}
+        I(\vert\boldsymbol{q}\vert\hat{q}, \omega)
+
+    Directions are sampled with the Fibonacci grid (see :py:func:`.fibonacci_sphere`),
+    the same for each shell. Shells are computed in batches of at most few thousands
+    q points and are accumulated into the (:math:`\vert\boldsymbol{q}\vert`, :math:`\omega`)
+    histogram, therefore the memory does not grow with the number of shells.
+
+    .. versionadded:: 0.8.10
+
+    Parameters
+    ----------
+    structure_factor : :py:class:`.StructureFactor`
+        Structure factor of the model.
+    q_norms : (n_q,) |array_like|_
+        Lengths of the scattering vectors, in absolute units.
+    energies : (n_E + 1,) |array_like|_
+        Edges of the energy bins, sorted in ascending order.
+    n_directions : int, default 500
+        Number of directions on each shell.
+    sigma : float, optional
+        Standard deviation of the gaussian broadening. If given, then the broadened
+        intensity is evaluated at the centers of the bins (see :py:meth:`.StructureFactor.map`)
+        instead of the histogram.
+    polarization : bool, default True
+        Whether to apply the polarization factor. See :py:meth:`.StructureFactor.intensities`.
+
+    Returns
+    -------
+    intensity : (n_q, n_E) :numpy:`ndarray`
+        Averaged intensity per unit energy.
+
+    Examples
+    --------
+
+    .. doctest::
+
+        >>> import numpy as np
+        >>> import radtools as rad
+        >>> model = rad.SpinHamiltonian(lattice=rad.lattice_example("CUB"), notation="standard")
+        >>> model.add_atom(rad.Atom("Fe", (0, 0, 0), spin=[0, 0, 1]))
+        >>> model.add_bond("Fe", "Fe", (1, 0, 0), iso=1)
+        >>> structure_factor = rad.StructureFactor(rad.MagnonDispersion(model))
+        >>> intensity = rad.powder_average(
+        ...     structure_factor, np.linspace(0.1, 3, 30), np.linspace(0, 5, 51)
+        ... )
+        >>> intensity.shape
+        (30, 50)
+    """
+
+    q_norms = np.array(q_norms, dtype=float).reshape(-1)
+    energies = np.array(energies, dtype=float).reshape(-1)
+    directions = fibonacci_sphere(n_directions)
+    widths = np.diff(energies)
+    centers = (energies[1:] + energies[:-1]) / 2
+
+    intensity = np.zeros((len(q_norms), len(widths)), dtype=float)
+    shells_per_batch = max(1, _CHUNK_SIZE // n_directions)
+    for start in range(0, len(q_norms), shells_per_batch):
+        shells = q_norms[start : start + shells_per_batch]
+        # (n_shells * n_directions, 3)
+        qpoints = (shells[:, None, None] * directions[None, :, :]).reshape((-1, 3))
+
+        if sigma is None:
+            omegas, values = structure_factor.intensities(
+                qpoints, polarization=polarization
+            )
+            # Index of the shell for each q point and mode
+            shell_index = np.broadcast_to(
+                np.repeat(np.arange(len(shells)), n_directions)[:, None], omegas.shape
+            )
+            bins = np.searchsorted(energies, omegas, side="right") - 1
+            inside = (bins >= 0) & (bins < len(widths))
+            histogram = np.bincount(
+                shell_index[inside] * len(widths) + bins[inside],
+                weights=values[inside],
+                minlength=len(shells) * len(widths),
+            ).reshape((len(shells), len(widths)))
+            intensity[start : start + len(shells)] = histogram / widths
+        else:
+            broadened = structure_factor.map(
+                qpoints, centers, sigma=sigma, polarization=polarization
+            )
+            intensity[start : start + len(shells)] = broadened.reshape(
+                (len(shells), n_directions, len(centers))
+            ).sum(axis=1)
+
+    return intensity / n_directions
@@ -0,0 +1,203 @@
+# RAD-tools - program for spin Hamiltonian and magnons.
+# Copyright (C) 2022-2023  Andrey Rybakov
+#
+# e-mail: anry@uv.es, web: adrybakov.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+r"""
+Topology of the magnon bands.
+"""
+
+import numpy as np
+from scipy.special import spence
+
+from radtools.constants import K_BOLTZMANN
+from radtools.crystal.kpoints import monkhorst_pack
+
+__all__ = ["BerryCurvature"]
+
+
+class BerryCurvature:
+    r"""
+    Berry curvature of the magnon bands on the two-dimensional grid.
+
+    Grid of :math:`n_1 \times n_2` points spans the plane of two reciprocal lattice
+    vectors. Eigenvectors are the columns of :math:`\boldsymbol{T} = \boldsymbol{G}^{-1}`
+    (see :py:meth:`.MagnonDispersion.modes`), which are normalized with the
+    metric :math:`\boldsymbol{g} = diag(1, ..., 1, -1, ..., -1)`.
+    Flux of the Berry curvature through each plaquette of the grid is computed with the
+    gauge-invariant method of Fukui, Hatsugai and Suzuki [1]_:
+
+    .. math::
+
+        U_{\mu}^n(\boldsymbol{k}) = \dfrac{\boldsymbol{T}^{\dagger}_n(\boldsymbol{k})
+        \boldsymbol{g}\boldsymbol{T}_n(\boldsymbol{k} + \boldsymbol{\mu})}
+        {\vert\boldsymbol{T}^{\dagger}_n(\boldsymbol{k})
+        \boldsymbol{g}\boldsymbol{T}_n(\boldsymbol{k} + \boldsymbol{\mu})\vert}
+
+        F^n(\boldsymbol{k}) = \arg\left(U_1^n(\boldsymbol{k})U_2^n(\boldsymbol{k}+\boldsymbol{1})
+        U_1^n(\boldsymbol{k}+\boldsymbol{2})^{-1}U_2^n(\boldsymbol{k})^{-1}\right)
+
+    Link variables are computed for all k points and bands at once.
+    Bands are expected to be isolated, for the degenerate bands only the sum of the
+    Chern numbers is meaningful.
+
+    .. versionadded:: 0.8.10
+
+    Parameters
+    ----------
+    dispersion : :py:class:`.MagnonDispersion`
+        Magnon dispersion.
+    n1 : int
+        Number of points along the first vector of the plane.
+    n2 : int
+        Number of points along the second vector of the plane.
+    plane : (2,) tuple of int, default (0, 1)
+        Indices of the reciprocal lattice vectors, which span the plane.
+    k_perp : float, default 0
+        Relative coordinate of the plane along the third reciprocal lattice vector.
+
+    Attributes
+    ----------
+    kpoints : (n1 * n2, 3) :numpy:`ndarray`
+        K points of the grid, in absolute coordinates. The same order as in
+        :py:func:`.monkhorst_pack`.
+    omegas : (n1 * n2, N) :numpy:`ndarray`
+        Magnon energies, in the order of the bands.
+    fluxes : (n1 * n2, N) :numpy:`ndarray`
+        Flux of the Berry curvature of each band through the plaquette,
+        which starts at the corresponding k point.
+    curvature : (n1 * n2, N) :numpy:`ndarray`
+        Berry curvature, flux divided by the area of the plaquette.
+
+    References
+    ----------
+    .. [1] Fukui, T., Hatsugai, Y. and Suzuki, H., 2005.
+        Chern numbers in discretized Brillouin zone: efficient method of computing
+        (spin) Hall conductances.
+        Journal of the Physical Society of Japan, 74(6), pp.1674-1677.
+    """
+
+    def __init__(self, dispersion, n1: int, n2: int, plane=(0, 1), k_perp=0.0):
+        plane = tuple(plane)
+        if len(plane) != 2 or plane[0] == plane[1] or not set(plane) <= {0, 1, 2}:
+            raise ValueError(f"Plane has to be two different axes, got {plane}.")
+        perpendicular = ({0, 1, 2} - set(plane)).pop()
+
+        shape = np.ones(3, dtype=int)
+        shape[list(plane)] = (n1, n2)
+        relative = monkhorst_pack(*shape)
+        relative[:, perpendicular] = k_perp
+        # Grid of the plane is C ordered with respect to (n1, n2)
+        relative = relative.reshape(tuple(shape) + (3,))
+        relative = np.transpose(relative, plane + (perpendicular, 3)).reshape((-1, 3))
+
+        reciprocal_cell = dispersion.kernel.reciprocal_cell
+        self.kpoints = relative @ reciprocal_cell
+        N = dispersion.N
+
+        E, G = dispersion.modes(self.kpoints)
+        # Bands in ascending order of energy
+        self.omegas = E[:, N - 1 :: -1]
+        T = np.linalg.inv(G)[:, :, N - 1 :: -1]
+        g = np.concatenate((np.ones(N), -np.ones(N)))
+
+        T = T.reshape((n1, n2, 2 * N, N))
+        gT = g[None, None, :, None] * T
+
+        def link(axis):
+            overlap = np.einsum(
+                "abxn,abxn->abn", np.conjugate(T), np.roll(gT, -1, axis=axis)
+            )
+            return overlap / np.abs(overlap)
+
+        U1, U2 = link(0), link(1)
+        fluxes = np.angle(
+            U1
+            * np.roll(U2, -1, axis=0)
+            * np.conjugate(np.roll(U1, -1, axis=1))
+            * np.conjugate(U2)
+        )
+        self.fluxes = fluxes.reshape((n1 * n2, N))
+
+        b1, b2 = reciprocal_cell[plane[0]], reciprocal_cell[plane[1]]
+        self.curvature = self.fluxes / (np.linalg.norm(np.cross(b1, b2)) / n1 / n2)
+
+    @property
+    def chern_numbers(self):
+        r"""
+        Chern numbers of the bands.
+
+        .. math::
+
+            C_n = \dfrac{1}{2\pi}\sum_{\boldsymbol{k}}F^n(\boldsymbol{k})
+
+        Returns
+        -------
+        chern_numbers : (N,) :numpy:`ndarray`
+            Chern numbers, rounded to the nearest integer.
+        """
+
+        return np.rint(self.fluxes.sum(axis=0) / 2 / np.pi).astype(int)
+
+    def thermal_hall(self, temperatures):
+        r"""
+        Thermal Hall conductance of the plane.
+
+        .. math::
+
+            \kappa_{xy} = -\dfrac{k_B^2T}{\hbar}\dfrac{1}{(2\pi)^2}\sum_n
+            \int d^2k\, c_2(\rho_n(\boldsymbol{k}))\Omega_n(\boldsymbol{k})
+
+            c_2(\rho) = (1 + \rho)\left(\ln\dfrac{1 + \rho}{\rho}\right)^2
+            - (\ln\rho)^2 - 2Li_2(-\rho)
+
+        where :math:`\rho_n(\boldsymbol{k})` is the Bose-Einstein occupation
+        number [1]_. The integral is the sum of the plaquette fluxes, weighted with
+        :math:`c_2` at the starting point of the plaquette. Modes with the non-positive
+        energy are not occupied. Energies are expected to be in meV.
+        Divide by the distance between the planes to get the conductivity of
+        the layered crystal.
+
+        Parameters
+        ----------
+        temperatures : (n_T,) |array_like|_
+            Temperatures, in Kelvin.
+
+        Returns
+        -------
+        kappa : (n_T,) :numpy:`ndarray`
+            Thermal Hall conductance in the units of :math:`k_B^2T/\hbar`.
+
+        References
+        ----------
+        .. [1] Matsumoto, R. and Murakami, S., 2011.
+            Rotational motion of magnons and the thermal Hall effect.
+            Physical Review B, 84(18), p.184406.
+        """
+
+        temperatures = np.array(temperatures, dtype=float).reshape(-1)
+        with np.errstate(divide="ignore", over="ignore"):
+            x = self.omegas[None] / (K_BOLTZMANN * temperatures[:, None, None])
+            x = np.where(self.omegas[None] > 0, x, np.inf)
+            rho = np.where(np.isfinite(x), 1 / np.expm1(x), 0.0)
+
+            # ln((1 + rho) / rho) = x, limit of c_2 at rho -> 0 is zero
+            occupied = rho > 0
+            rho = np.where(occupied, rho, 1)
+            c2 = (1 + rho) * x**2 - np.log(rho) ** 2 - 2 * spence(1 + rho)
+            c2 = np.where(occupied, c2, 0.0)
+
+        return -(c2 * self.fluxes[None]).sum(axis=(1, 2)) / (2 * np.pi) ** 2
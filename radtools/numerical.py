@@ -23,6 +23,8 @@ which are used across the whole package.
 It's purpose is to serve as an "other" folder.
 """
 
+import numpy as np
+
 from radtools.crystal.constants import ABS_TOL, REL_TOL
 
 __all__ = [
@@ -102,3 +104,58 @@ def compare_numerically(x, condition, y, eps=None, rtol=REL_TOL, atol=ABS_TOL):
         return x < y - eps or y < x - eps
 
     raise ValueError(f'Condition must be one of "<", ">", "<=", ">=", "==", "!=".')
+
+
+def _pairs_reduction(i, j, N):
+    r"""
+    Grouping of the bonds by the (i, j) pairs for :py:func:`_sum_over_pairs`.
+
+    Parameters
+    ----------
+    i : (n_bonds,) |array_like|_
+        Indices of the first atom of each bond.
+    j : (n_bonds,) |array_like|_
+        Indices of the second atom of each bond.
+    N : int
+        Number of atoms.
+
+    Returns
+    -------
+    order : (n_bonds,) :numpy:`ndarray`
+        Order of the bonds, which puts the bonds of the same pair together.
+    starts : (n_pairs,) :numpy:`ndarray`
+        Positions of the first bond of each pair in the ordered bonds.
+    pairs : (n_pairs,) :numpy:`ndarray`
+        Flat indices ``i * N + j`` of the pairs.
+    """
+
+    keys = np.asarray(i, dtype=int) * N + np.asarray(j, dtype=int)
+    order = np.argsort(keys, kind="stable")
+    pairs, starts = np.unique(keys[order], return_index=True)
+    return order, starts, pairs
+
+
+def _sum_over_pairs(values, reduction, N):
+    r"""
+    Sum bond-resolved values over the bonds with the same (i, j) pair.
+
+    Parameters
+    ----------
+    values : (M, n_bonds, ...) :numpy:`ndarray`
+        Values for each k point and each bond.
+    reduction : tuple
+        Output of :py:func:`_pairs_reduction`.
+    N : int
+        Number of atoms.
+
+    Returns
+    -------
+    result : (M, N, N, ...) :numpy:`ndarray`
+    """
+
+    order, starts, pairs = reduction
+    M = values.shape[0]
+    result = np.zeros((M, N * N) + values.shape[2:], dtype=values.dtype)
+    if len(pairs) != 0:
+        result[:, pairs] = np.add.reduceat(values[:, order], starts, axis=1)
+    return result.reshape((M, N, N) + values.shape[2:])
@@ -38,6 +38,7 @@ def manager(
     distance=None,
     verbose=False,
     eps=1e-3,
+    symmetry=False,
 ):
     r"""
     :ref:`rad-make-template` script.
@@ -115,6 +116,16 @@ def manager(
         Epsilon for the distance comparison.
 
         Console argument: ``--eps``
+    symmetry : bool, default False
+        Whether to group the bonds by the symmetry of the crystal instead of the distance.
+
+        Bonds are grouped into the orbits of the space group
+        (see :py:meth:`.SpinHamiltonian.make_template`) and atoms are
+        written with their fullnames.
+
+        Console argument: ``-s`` / ``--symmetry``
+
+        .. versionadded:: 0.8.10
     """
 
     n_sep = 80
@@ -191,48 +202,58 @@ def manager(
                 + "\n"
             )
 
-            # Get bonds from the model
-            data = []
-            for atom1, atom2, R, J in model:
-                data.append(
-                    (
-                        atom1.name,
-                        atom2.name,
-                        R,
-                        model.get_distance(atom1, atom2, R),
-                    )
+            if symmetry:
+                symmetric_template = model.make_template()
+                for j, name in enumerate(symmetric_template.names):
+                    if j != 0:
+                        file.write("-" * n_sep + "\n")
+                    file.write(f"{name} {symmetric_template.latex_names[name]}\n")
+                    for atom1, atom2, R in symmetric_template.names[name]:
+                        file.write(
+                            f"{atom1:5} {atom2:5} "
+                            + f"{R[0]:3.0f} {R[1]:3.0f} {R[2]:3.0f}\n"
+                        )
+            else:
+                # Get bonds from the model
+                data = []
+                bonds = model.bonds
+                distances = model.get_distances(
+                    bonds.i, bonds.j, bonds.R, atoms=bonds.atoms
                 )
+                for (atom1, atom2, R, J), distance in zip(model, distances):
+                    data.append((atom1.name, atom2.name, R, distance))
 
-            # Sort bonds by distance
-            data.sort(key=lambda x: x[3])
+                # Sort bonds by distance
+                data.sort(key=lambda x: x[3])
 
-            j = 1
-            file.write(f"J{j} " + "$J_{" + f"{j}" + "}$\n")
-            file.write(
-                f"{data[0][0]:5} {data[0][1]:5} "
-                + f"{data[0][2][0]:3.0f} {data[0][2][1]:3.0f} {data[0][2][2]:3.0f}\n"
-            )
-            for i, (atom1, atom2, R, distance) in enumerate(data[1:]):
-                # If distance is the same as the previous one, write the bond
-                if abs(distance - data[i][3]) < eps:
-                    file.write(
-                        f"{atom1:5} {atom2:5} "
-                        + f"{R[0]:3.0f} {R[1]:3.0f} {R[2]:3.0f}\n"
-                    )
-                # If distance is different, start a new group and write the bond
-                else:
-                    j += 1
-                    file.write("-" * n_sep + "\n")
-                    file.write(f"J{j} " + "$J_{" + f"{j}" + "}$\n")
-                    file.write(
-                        f"{atom1:5} {atom2:5} "
-                        + f"{R[0]:3.0f} {R[1]:3.0f} {R[2]:3.0f}\n"
-                    )
+                j = 1
+                file.write(f"J{j} " + "$J_{" + f"{j}" + "}$\n")
+                file.write(
+                    f"{data[0][0]:5} {data[0][1]:5} "
+                    + f"{data[0][2][0]:3.0f} {data[0][2][1]:3.0f} {data[0][2][2]:3.0f}\n"
+                )
+                for i, (atom1, atom2, R, distance) in enumerate(data[1:]):
+                    # If distance is the same as the previous one, write the bond
+                    if abs(distance - data[i][3]) < eps:
+                        file.write(
+                            f"{atom1:5} {atom2:5} "
+                            + f"{R[0]:3.0f} {R[1]:3.0f} {R[2]:3.0f}\n"
+                        )
+                    # If distance is different, start a new group and write the bond
+                    else:
+                        j += 1
+                        file.write("-" * n_sep + "\n")
+                        file.write(f"J{j} " + "$J_{" + f"{j}" + "}$\n")
+                        file.write(
+                            f"{atom1:5} {atom2:5} "
+                            + f"{R[0]:3.0f} {R[1]:3.0f} {R[2]:3.0f}\n"
+                        )
 
             file.write("=" * n_sep + "\n")
     cprint(
         f"Template draft is in "
-        + f"{os.path.abspath(output_name)}, grouped by distance",
+        + f"{os.path.abspath(output_name)}, "
+        + f"grouped by {'symmetry' if symmetry else 'distance'}",
         "blue",
     )
     cprint(f"Do not forget to correct the template draft to your needs!", "yellow")
@@ -302,5 +323,12 @@ def create_parser():
         type=float,
         help="Epsilon for the distance comparison.",
     )
+    parser.add_argument(
+        "-s",
+        "--symmetry",
+        default=False,
+        action="store_true",
+        help="Group the bonds by the symmetry of the crystal instead of the distance.",
+    )
 
     return parser
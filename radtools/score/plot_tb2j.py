@@ -318,8 +318,9 @@ def manager(
         ax.set_xlabel("x, Angstroms")
         ax.set_ylabel("y, Angstroms")
 
-        for atom1, atom2, R, J in model:
-            dis = model.get_distance(atom1, atom2, R)
+        bonds = model.bonds
+        distances = model.get_distances(bonds.i, bonds.j, bonds.R, atoms=bonds.atoms)
+        for (atom1, atom2, R, J), dis in zip(model, distances):
             x1, y1, z1 = model.get_atom_coordinates(atom1, relative=False)
             x2, y2, z2 = model.get_atom_coordinates(atom2, R, relative=False)
             xm = (x1 + x2) / 2
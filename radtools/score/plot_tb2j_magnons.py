@@ -26,7 +26,7 @@ from termcolor import cprint
 from radtools.decorate.array import print_2d_array
 from radtools.decorate.axes import plot_hlines
 from radtools.decorate.stats import logo
-from radtools.io.internal import load_template
+from radtools.io.internal import dump_npy, load_npy, load_template
 from radtools.io.tb2j import load_tb2j_model
 from radtools.magnons.dispersion import MagnonDispersion
 from radtools.spinham.constants import TXT_FLAGS
@@ -52,6 +52,8 @@ def manager(
     join_output=False,
     nodmi=False,
     no_anisotropic=False,
+    n_workers=None,
+    save_npy=False,
 ):
     r"""
     :ref:`rad-plot-tb2j-magnons` script.
@@ -194,6 +196,27 @@ def manager(
         Whether to ignore anisotropic symmetric exchange in the spinham.
 
         Console argument: ``-noa`` / ``--no-anisotropic``
+    n_workers : int, optional
+        Number of processes for the computation of the magnon dispersion.
+
+        K-points are split between the processes. By default
+        the dispersion is computed in the main process.
+
+        .. versionadded:: 0.8.10
+
+        Console argument: ``-nw`` / ``--n-workers``
+
+        Metavar: "n"
+    save_npy : bool, default False
+        Whether to stream the energies to the binary .npy file.
+
+        Two files appears: "output-name.npy" with the (M, N) array of the energies
+        (one row per k point) and "output-name.json" with the description of the data.
+        The energies are written chunk by chunk and are not kept in memory.
+
+        .. versionadded:: 0.8.10
+
+        Console argument: ``-sn`` / ``--save-npy``
     """
 
     head, _ = os.path.split(input_filename)
@@ -287,7 +310,28 @@ def manager(
 
     fig, ax = plt.subplots()
 
-    omegas = dispersion(kp)
+    if save_npy:
+        dump_npy(
+            output_name,
+            dispersion.omegas_chunks(kp, n_workers=n_workers),
+            shape=(len(kp.points()), dispersion.N),
+            metadata={
+                "input_filename": os.path.abspath(input_filename),
+                "cell": spinham.cell,
+                "Q": dispersion.Q,
+                "n": dispersion.n,
+                "k_path": kp.path_string,
+                "n_k": kp.n,
+                "hs_points": dict(
+                    [(name, kp.hs_coordinates[name]) for name in kp.hs_names]
+                ),
+                "labels": kp.labels,
+                "coordinates": kp.coordinates(),
+            },
+        )
+        omegas = load_npy(f"{output_name}.npy")[0].T
+    else:
+        omegas = dispersion(kp, n_workers=n_workers)
 
     ax.set_xticks(kp.coordinates(), kp.labels, fontsize=15)
     ax.set_ylabel("E, meV", fontsize=15)
@@ -629,5 +673,20 @@ def create_parser():
         action="store_true",
         help="Whether to ignore anisotropic symmetric exchange in the spinham.",
     )
+    parser.add_argument(
+        "-nw",
+        "--n-workers",
+        default=None,
+        metavar="n",
+        type=int,
+        help="Number of processes for the computation of the magnon dispersion.",
+    )
+    parser.add_argument(
+        "-sn",
+        "--save-npy",
+        default=False,
+        action="store_true",
+        help="Whether to stream the energies to the binary .npy file.",
+    )
 
     return parser
@@ -20,13 +20,14 @@ r"""
 Exchange Module describes the spin Hamiltonian, defined on some :py:class:`.Crystal`.
 """
 
-
+from .bonds import *
 from .constants import *
 from .hamiltonian import *
 from .parameter import *
 from .template import *
 
 __all__ = []
+__all__.extend(bonds.__all__)
 __all__.extend(constants.__all__)
 __all__.extend(hamiltonian.__all__)
 __all__.extend(parameter.__all__)
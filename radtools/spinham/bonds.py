@@ -0,0 +1,549 @@
+# RAD-tools - program for spin Hamiltonian and magnons.
+# Copyright (C) 2022-2023  Andrey Rybakov
+#
+# e-mail: anry@uv.es, web: adrybakov.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+r"""
+Array-backed storage of the bonds.
+"""
+
+__all__ = ["BondTable"]
+
+import weakref
+
+import numpy as np
+
+from radtools.crystal.atom import Atom
+from radtools.spinham.parameter import ExchangeParameter
+
+
+class BondTable:
+    r"""
+    Bonds of the :py:class:`.SpinHamiltonian` as a structure of arrays.
+
+    Each bond (atom1, atom2, R) is one row of the arrays :py:attr:`.i`,
+    :py:attr:`.j`, :py:attr:`.R` and :py:attr:`.J`. Atoms are stored once in
+    :py:attr:`.atoms` and referenced by their position in it. Lookup by the bond
+    goes through a hash index of the integer keys, removal moves the last row into
+    the removed one.
+
+    Dict-like access (``table[atom1, atom2, R]``) returns an
+    :py:class:`.ExchangeParameter`, which is a view of the row: changes of it
+    are written into the table.
+
+    .. versionadded:: 0.8.10
+
+    Attributes
+    ----------
+    atoms : list of :py:class:`.Atom`
+        Atoms, which are (or were) referenced by the bonds.
+        It should not be modified directly.
+    """
+
+    def __init__(self) -> None:
+        self.atoms = []
+        self._atom_index = {}
+        self._i = np.zeros(0, dtype=np.int32)
+        self._j = np.zeros(0, dtype=np.int32)
+        self._R = np.zeros((0, 3), dtype=int)
+        self._J = np.zeros((0, 3, 3), dtype=float)
+        # Hash index (i, j, R0, R1, R2) -> row, None if it has to be rebuilt
+        self._index_dict = {}
+        self._size = 0
+        # Weak references to the parameters given away, see _parameter()
+        self._proxies = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_proxies"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._proxies = {}
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def _index(self):
+        if self._index_dict is None:
+            self._index_dict = dict(zip(self._keys(), range(self._size)))
+        return self._index_dict
+
+    def _row_view(self, array):
+        view = array[: self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def i(self) -> np.ndarray:
+        r"""
+        Positions of the first atoms of the bonds in :py:attr:`.atoms`.
+
+        Returns
+        -------
+        i : (M,) :numpy:`ndarray`
+            Read-only view.
+        """
+
+        return self._row_view(self._i)
+
+    @property
+    def j(self) -> np.ndarray:
+        r"""
+        Positions of the second atoms of the bonds in :py:attr:`.atoms`.
+
+        Returns
+        -------
+        j : (M,) :numpy:`ndarray`
+            Read-only view.
+        """
+
+        return self._row_view(self._j)
+
+    @property
+    def R(self) -> np.ndarray:
+        r"""
+        Unit cells of the second atoms of the bonds (relative coordinates).
+
+        Returns
+        -------
+        R : (M, 3) :numpy:`ndarray`
+            Read-only view.
+        """
+
+        return self._row_view(self._R)
+
+    @property
+    def J(self) -> np.ndarray:
+        r"""
+        Exchange matrices of the bonds.
+
+        Returns
+        -------
+        J : (M, 3, 3) :numpy:`ndarray`
+            View of the stored matrices, changes of it are changes of the model.
+            It is invalidated by the addition or removal of the bonds.
+        """
+
+        return self._J[: self._size]
+
+    def _key(self, atom1: Atom, atom2: Atom, R):
+        r"""
+        Integer key of the bond or None if one of the atoms is unknown.
+        """
+
+        try:
+            return (
+                self._atom_index[atom1],
+                self._atom_index[atom2],
+                int(R[0]),
+                int(R[1]),
+                int(R[2]),
+            )
+        except KeyError:
+            return None
+
+    def _atom_position(self, atom: Atom):
+        try:
+            return self._atom_index[atom]
+        except KeyError:
+            self._atom_index[atom] = len(self.atoms)
+            self.atoms.append(atom)
+            return self._atom_index[atom]
+
+    def _bond(self, key):
+        i, j, R0, R1, R2 = key
+        return self.atoms[i], self.atoms[j], (R0, R1, R2)
+
+    def _reserve(self, size):
+        capacity = len(self._J)
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity, 16)
+        for name in ["_i", "_j", "_R", "_J"]:
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[: self._size] = old[: self._size]
+            setattr(self, name, new)
+
+    def __contains__(self, bond):
+        key = self._key(*bond)
+        return key is not None and key in self._index
+
+    def __iter__(self):
+        r"""
+        Iterate over the bonds (atom1, atom2, R).
+
+        Bonds are collected before the iteration, therefore the table can be
+        modified inside the loop. Order is the order of the rows.
+        """
+
+        return iter([self._bond(key) for key in self._keys()])
+
+    def _keys(self):
+        return list(
+            map(
+                tuple,
+                np.column_stack(
+                    (
+                        self._i[: self._size],
+                        self._j[: self._size],
+                        self._R[: self._size],
+                    )
+                ).tolist(),
+            )
+        )
+
+    def items(self):
+        r"""
+        Iterate over the bonds and exchange parameters (atom1, atom2, R, J).
+
+        Bonds are collected before the iteration, therefore the table can be
+        modified inside the loop. Bonds removed during the iteration are skipped.
+        Order is the order of the rows.
+
+        Returns
+        -------
+        items : iterator
+            Iterator over the tuples (atom1, atom2, R, J), where J is the
+            :py:class:`.ExchangeParameter`, which is a view of the row.
+        """
+
+        keys = self._keys()
+        return (
+            self._bond(key) + (self._parameter(key),)
+            for key in keys
+            if key in self._index
+        )
+
+    def _parameter(self, key):
+        reference = self._proxies.get(key)
+        parameter = None if reference is None else reference()
+        if parameter is None:
+            parameter = _BondParameter(self, key)
+            self._proxies[key] = weakref.ref(parameter)
+        return parameter
+
+    def __getitem__(self, bond) -> ExchangeParameter:
+        key = self._key(*bond)
+        if key is None or key not in self._index:
+            raise KeyError(bond)
+        return self._parameter(key)
+
+    def __setitem__(self, bond, J):
+        atom1, atom2, R = bond
+        key = (
+            self._atom_position(atom1),
+            self._atom_position(atom2),
+            int(R[0]),
+            int(R[1]),
+            int(R[2]),
+        )
+        if isinstance(J, ExchangeParameter):
+            J = J.matrix
+        row = self._index.get(key)
+        if row is None:
+            row = self._size
+            self._reserve(row + 1)
+            self._i[row], self._j[row] = key[0], key[1]
+            self._R[row] = key[2:]
+            self._index[key] = row
+            self._size += 1
+        self._J[row] = J
+
+    def __delitem__(self, bond):
+        key = self._key(*bond)
+        if key is None or key not in self._index:
+            raise KeyError(bond)
+        self._remove(key)
+
+    def _row_key(self, row):
+        return (int(self._i[row]), int(self._j[row]), *self._R[row].tolist())
+
+    def _remove(self, key):
+        reference = self._proxies.pop(key, None)
+        if reference is not None and reference() is not None:
+            reference()._detach()
+
+        row = self._index.pop(key)
+        last = self._size - 1
+        if row != last:
+            last_key = self._row_key(last)
+            self._i[row] = self._i[last]
+            self._j[row] = self._j[last]
+            self._R[row] = self._R[last]
+            self._J[row] = self._J[last]
+            self._index[last_key] = row
+        self._size = last
+
+    def remove_atom(self, atom: Atom):
+        r"""
+        Remove all bonds, which start or end at the atom.
+
+        Parameters
+        ----------
+        atom : :py:class:`.Atom`
+            Atom object.
+        """
+
+        position = self._atom_index.pop(atom, None)
+        if position is None:
+            return
+        rows = np.nonzero(
+            (self._i[: self._size] == position) | (self._j[: self._size] == position)
+        )[0]
+        for key in [self._row_key(row) for row in rows]:
+            self._remove(key)
+
+    def partners(self) -> np.ndarray:
+        r"""
+        Rows of the reversed bonds.
+
+        For each bond (atom1, atom2, R) finds the row of the bond (atom2, atom1, -R).
+        Bonds are matched through the sorted integer keys, without the lookup of
+        the individual bonds.
+
+        Returns
+        -------
+        partners : (M,) :numpy:`ndarray`
+            Row of the reversed bond or -1 if it is absent.
+            On-site bonds (atom, atom, (0, 0, 0)) are partners of themselves.
+        """
+
+        if self._size == 0:
+            return np.zeros(0, dtype=int)
+        return self._find_rows(self._j[: self._size], self._i[: self._size], -self.R)
+
+    def _find_rows(self, i, j, R):
+        r"""
+        Rows of the bonds (i, j, R) or -1 for the absent ones.
+
+        Bonds are matched through the sorted integer keys, without the lookup of
+        the individual bonds.
+        """
+
+        i = np.asarray(i, dtype=np.int64)
+        j = np.asarray(j, dtype=np.int64)
+        R = np.asarray(R, dtype=np.int64).reshape((-1, 3))
+        if self._size == 0 or len(i) == 0:
+            return np.full(len(i), -1, dtype=int)
+
+        table_R = self._R[: self._size].astype(np.int64)
+        n_atoms = len(self.atoms)
+        R_max = max(np.abs(table_R).max(), np.abs(R).max())
+        base = 2 * R_max + 1
+
+        def encode(i, j, R):
+            key = i * n_atoms + j
+            for component in range(3):
+                key = key * base + R[:, component] + R_max
+            return key
+
+        keys = encode(
+            self._i[: self._size].astype(np.int64),
+            self._j[: self._size].astype(np.int64),
+            table_R,
+        )
+        searched_keys = encode(i, j, R)
+        order = np.argsort(keys)
+        sorted_keys = keys[order]
+        positions = np.searchsorted(sorted_keys, searched_keys)
+        positions[positions == self._size] = 0
+        found = sorted_keys[positions] == searched_keys
+        return np.where(found, order[positions], -1)
+
+    def _append(self, i, j, R, J):
+        r"""
+        Add the bonds, which are not present in the table, at once.
+
+        ``i`` and ``j`` are the positions in :py:attr:`.atoms`.
+        """
+
+        n = len(i)
+        start = self._size
+        self._reserve(start + n)
+        self._i[start : start + n] = i
+        self._j[start : start + n] = j
+        self._R[start : start + n] = R
+        self._J[start : start + n] = J
+        self._size += n
+        if self._index_dict is not None:
+            keys = np.column_stack((i, j, R)).tolist()
+            self._index_dict.update(zip(map(tuple, keys), range(start, start + n)))
+
+    def _remove_rows(self, rows):
+        r"""
+        Remove the bonds from the given rows at once.
+
+        Order of the remaining bonds is kept.
+        """
+
+        keep = np.ones(self._size, dtype=bool)
+        keep[rows] = False
+        # Removed bonds might be still referenced
+        for key, reference in list(self._proxies.items()):
+            if reference() is None:
+                del self._proxies[key]
+            elif not keep[self._index[key]]:
+                reference()._detach()
+                del self._proxies[key]
+
+        n = int(keep.sum())
+        for name in ["_i", "_j", "_R", "_J"]:
+            array = getattr(self, name)
+            array[:n] = array[: self._size][keep]
+        self._size = n
+        self._index_dict = None
+
+    def update(self, i, j, R, J, atoms=None, overwrite=True):
+        r"""
+        Set many bonds at once.
+
+        Array counterpart of ``table[atom1, atom2, R] = J``: existing bonds get
+        the new matrices, the rest are appended to the table.
+
+        .. versionadded:: 0.8.10
+
+        Parameters
+        ----------
+        i : (M,) |array_like|_
+            Indices of the first atoms in ``atoms``.
+        j : (M,) |array_like|_
+            Indices of the second atoms in ``atoms``.
+        R : (M, 3) |array_like|_
+            Unit cells of the second atoms (relative coordinates).
+        J : (M, 3, 3) |array_like|_
+            Exchange matrices.
+        atoms : list of :py:class:`.Atom`, optional
+            Atoms to which ``i`` and ``j`` refer. By default :py:attr:`.atoms`.
+        overwrite : bool, default True
+            Whether to change the matrices of the bonds, which are already present.
+            If the same bond is given several times, the last one is used.
+        """
+
+        i = np.asarray(i, dtype=int).reshape(-1)
+        j = np.asarray(j, dtype=int).reshape(-1)
+        R = np.asarray(R, dtype=int).reshape((-1, 3))
+        J = np.asarray(J, dtype=float).reshape((-1, 3, 3))
+        if len(i) == 0:
+            return
+        if atoms is not None:
+            # Only the atoms of the bonds are registered in the table
+            used = np.unique(np.concatenate((i, j)))
+            mapping = np.zeros(len(atoms), dtype=int)
+            mapping[used] = [self._atom_position(atoms[n]) for n in used]
+            i, j = mapping[i], mapping[j]
+
+        # Keep the last occurrence of every bond
+        keys = np.column_stack((i, j, R))
+        order = np.lexsort(keys.T[::-1])
+        sorted_keys = keys[order]
+        is_last = np.ones(len(keys), dtype=bool)
+        is_last[:-1] = (sorted_keys[1:] != sorted_keys[:-1]).any(axis=1)
+        last = np.sort(order[is_last])
+        i, j, R, J = i[last], j[last], R[last], J[last]
+
+        rows = self._find_rows(i, j, R)
+        present = rows != -1
+        if overwrite:
+            self._J[rows[present]] = J[present]
+        new = ~present
+        self._append(i[new], j[new], R[new], J[new])
+
+    def arrays(self, atoms=None):
+        r"""
+        Copies of the bond arrays.
+
+        Parameters
+        ----------
+        atoms : list of :py:class:`.Atom`, optional
+            Atoms to which the indices refer. By default :py:attr:`.atoms`.
+            Every atom of the bonds has to be present in it.
+
+        Returns
+        -------
+        i : (M,) :numpy:`ndarray`
+            Indices of the first atoms in ``atoms``.
+        j : (M,) :numpy:`ndarray`
+            Indices of the second atoms in ``atoms``.
+        R : (M, 3) :numpy:`ndarray`
+            Unit cells of the second atoms (relative coordinates).
+        J : (M, 3, 3) :numpy:`ndarray`
+            Exchange matrices.
+        """
+
+        i = self._i[: self._size].astype(int)
+        j = self._j[: self._size].astype(int)
+        if atoms is not None:
+            mapping = np.full(len(self.atoms), -1, dtype=int)
+            positions = dict([(atom, n) for n, atom in enumerate(atoms)])
+            for n, atom in enumerate(self.atoms):
+                mapping[n] = positions.get(atom, -1)
+            i, j = mapping[i], mapping[j]
+            if (i == -1).any() or (j == -1).any():
+                raise ValueError("Some atoms of the bonds are not present in atoms.")
+        return i, j, self._R[: self._size].copy(), self._J[: self._size].copy()
+
+    def used_atoms(self):
+        r"""
+        Atoms with at least one bond.
+
+        Returns
+        -------
+        atoms : list of :py:class:`.Atom`
+            In the order of :py:attr:`.atoms`.
+        """
+
+        used = np.zeros(len(self.atoms), dtype=bool)
+        used[self._i[: self._size]] = True
+        used[self._j[: self._size]] = True
+        return [atom for atom, flag in zip(self.atoms, used) if flag]
+
+
+class _BondParameter(ExchangeParameter):
+    r"""
+    Exchange parameter, which reads and writes the row of the :py:class:`.BondTable`.
+
+    After the removal of the bond it keeps the last values.
+    Copies of it are ordinary :py:class:`.ExchangeParameter`.
+    """
+
+    def __init__(self, table: BondTable, key) -> None:
+        self._table = table
+        self._key = key
+        self._detached = None
+
+    @property
+    def _matrix(self):
+        if self._table is None:
+            return self._detached
+        return self._table._J[self._table._index[self._key]]
+
+    @_matrix.setter
+    def _matrix(self, new_matrix):
+        if self._table is None:
+            self._detached = new_matrix
+        else:
+            self._table._J[self._table._index[self._key]] = new_matrix
+
+    def _detach(self):
+        self._detached = np.array(self._matrix, dtype=float)
+        self._table = None
+
+    def __reduce__(self):
+        return (ExchangeParameter, (np.array(self.matrix, dtype=float),))
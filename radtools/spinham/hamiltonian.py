@@ -24,19 +24,41 @@ Write a tutorial with docstring here.
 
 __all__ = ["SpinHamiltonian", "ExchangeHamiltonian"]
 
+import warnings
 from copy import deepcopy
 from typing import Iterable, Tuple
 
 import numpy as np
+from scipy.optimize import minimize
 
-from radtools.constants import TORADIANS
+from radtools.constants import K_BOLTZMANN, TORADIANS
 from radtools.crystal.atom import Atom
 from radtools.crystal.crystal import Crystal
+from radtools.crystal.kpoints import monkhorst_pack
+from radtools.crystal.symmetry import (
+    bond_orbits,
+    irreducible_kpoints,
+    symmetrize_bonds,
+)
 from radtools.exceptions import NotationError
+from radtools.geometry import span_orthonormal_set
+from radtools.numerical import _pairs_reduction, _sum_over_pairs
+from radtools.spinham.bonds import BondTable
 from radtools.spinham.constants import PREDEFINED_NOTATIONS
 from radtools.spinham.parameter import ExchangeParameter
 from radtools.spinham.template import ExchangeTemplate
 
+# Maximum number of (k point, bond) elements, which are processed at once
+_CHUNK_ELEMENTS = 2**20
+
+
+def _kpoints_chunk(n_bonds):
+    r"""
+    Number of k points in one chunk for the given number of bonds.
+    """
+
+    return max(1, _CHUNK_ELEMENTS // max(1, n_bonds))
+
 
 class SpinHamiltonian(Crystal):
     r"""
@@ -78,7 +100,7 @@ class SpinHamiltonian(Crystal):
 
         super().__init__(**kwargs)
 
-        self._bonds = {}
+        self._bonds = BondTable()
 
         # Notation settings
         self._double_counting = None
@@ -259,10 +281,14 @@ class SpinHamiltonian(Crystal):
         (atom2, atom1, -R) is present in the Hamiltonian.
         """
 
-        bonds = list(self)
-        for atom1, atom2, (i, j, k), J in bonds:
-            if (atom2, atom1, (-i, -j, -k)) not in self:
-                self.add_bond(atom2, atom1, (-i, -j, -k), J=J.T)
+        missing = self._bonds.partners() == -1
+        bonds = self._bonds
+        bonds._append(
+            bonds.j[missing],
+            bonds.i[missing],
+            -bonds.R[missing],
+            np.transpose(bonds.J[missing], (0, 2, 1)),
+        )
 
     def _ensure_no_double_counting(self):
         r"""
@@ -275,24 +301,33 @@ class SpinHamiltonian(Crystal):
         * i = 0 and j > 0
         * i = 0, j = 0 and k > 0
         * i = 0, j = 0, k = 0 and atom1.index <= atom2.index
+
+        Bonds, which do not satisfy them, are removed if the reversed bond is present
+        and replaced by the reversed bond (with transposed matrix) otherwise.
         """
 
-        bonds = list(self)
-
-        for atom1, atom2, (i, j, k), J in bonds:
-            if (i, j, k) != (0, 0, 0) or atom1 != atom2:
-                if (
-                    i > 0
-                    or (i == 0 and j > 0)
-                    or (i == 0 and j == 0 and k > 0)
-                    or (i == 0 and j == 0 and k == 0 and atom1.index <= atom2.index)
-                ):
-                    if (atom2, atom1, (-i, -j, -k)) in self:
-                        self.remove_bond(atom2, atom1, (-i, -j, -k))
-                else:
-                    if (atom2, atom1, (-i, -j, -k)) not in self:
-                        self.add_bond(atom2, atom1, (-i, -j, -k), J=J.T)
-                        self.remove_bond(atom1, atom2, (i, j, k))
+        bonds = self._bonds
+        if len(bonds) == 0:
+            return
+        indices = np.array([atom.index for atom in bonds.atoms])
+        i, j, R = bonds.i, bonds.j, bonds.R
+        zero = (R == 0).all(axis=1)
+        kept = (
+            (R[:, 0] > 0)
+            | ((R[:, 0] == 0) & (R[:, 1] > 0))
+            | ((R[:, 0] == 0) & (R[:, 1] == 0) & (R[:, 2] > 0))
+            | (zero & (indices[i] < indices[j]))
+            # Different atoms with the same index: keep one of the two bonds
+            | (zero & (indices[i] == indices[j]) & (i <= j))
+        )
+        reversed_rows = np.nonzero(~kept & (bonds.partners() == -1))[0]
+        bonds._append(
+            j[reversed_rows],
+            i[reversed_rows],
+            -R[reversed_rows],
+            np.transpose(bonds.J[reversed_rows], (0, 2, 1)),
+        )
+        bonds._remove_rows(np.nonzero(~kept)[0])
 
     @double_counting.setter
     def double_counting(self, new_value: bool):
@@ -311,9 +346,10 @@ class SpinHamiltonian(Crystal):
                     self._ensure_double_counting()
                 else:
                     self._ensure_no_double_counting()
-                for atom1, atom2, R, J in self:
-                    if R != (0, 0, 0) or atom1 != atom2:
-                        self[atom1, atom2, R] = J * factor
+                onsite = (self._bonds.i == self._bonds.j) & (self._bonds.R == 0).all(
+                    axis=1
+                )
+                self._bonds.J[~onsite] *= factor
         else:
             if new_value:
                 self._ensure_double_counting()
@@ -350,14 +386,18 @@ class SpinHamiltonian(Crystal):
 
     @spin_normalized.setter
     def spin_normalized(self, new_value: bool):
-        if self._spin_normalized is not None:
-            if self._spin_normalized and not new_value:
-                for atom1, atom2, R, J in self:
-                    self[atom1, atom2, R] = J / atom1.spin / atom2.spin
-            elif not self._spin_normalized and new_value:
-                for atom1, atom2, R, J in self:
-                    self[atom1, atom2, R] = J * atom1.spin * atom2.spin
-        self._spin_normalized = bool(new_value)
+        new_value = bool(new_value)
+        if self._spin_normalized is not None and self._spin_normalized != new_value:
+            bonds = self._bonds
+            spins = np.ones(len(bonds.atoms), dtype=float)
+            for position in np.unique(np.concatenate((bonds.i, bonds.j))):
+                spins[position] = bonds.atoms[position].spin
+            spins = spins[bonds.i] * spins[bonds.j]
+            if self._spin_normalized:
+                bonds.J[:] /= spins[:, None, None]
+            else:
+                bonds.J[:] *= spins[:, None, None]
+        self._spin_normalized = new_value
 
     @property
     def factor(self) -> float:
@@ -393,8 +433,7 @@ class SpinHamiltonian(Crystal):
             factor = self._factor / new_factor
 
             if factor != 1:
-                for atom1, atom2, R, J in self:
-                    self[atom1, atom2, R] = J * factor
+                self._bonds.J[:] *= factor
 
         self._factor = float(new_factor)
 
@@ -429,6 +468,26 @@ class SpinHamiltonian(Crystal):
             raise AttributeError(name)
         raise AttributeError(name)
 
+    @property
+    def bonds(self) -> BondTable:
+        r"""
+        Bonds of the Hamiltonian.
+
+        Array-backed storage: the model`s own dict-like access
+        (``model[atom1, atom2, R]``) is a view of it, while the arrays
+        :py:attr:`.BondTable.i`, :py:attr:`.BondTable.j`, :py:attr:`.BondTable.R`
+        and :py:attr:`.BondTable.J` are available for the vectorized computations.
+
+        .. versionadded:: 0.8.10
+
+        Returns
+        -------
+        bonds : :py:class:`.BondTable`
+            Bonds of the model (not a copy).
+        """
+
+        return self._bonds
+
     @property
     def crystal(self) -> Crystal:
         r"""
@@ -463,10 +522,7 @@ class SpinHamiltonian(Crystal):
             Array of n unit cells.
         """
 
-        cells = set()
-        for atom1, atom2, R, J in self:
-            cells.add(R)
-        return np.array(list(cells))
+        return np.unique(self._bonds.R, axis=0)
 
     @property
     def magnetic_atoms(self):
@@ -482,12 +538,7 @@ class SpinHamiltonian(Crystal):
         magnetic_atoms : list of :py:class:`.Atom`
             List of magnetic atoms.
         """
-        result = set()
-        for atom1, atom2, R, J in self:
-            result.add(atom1)
-            result.add(atom2)
-
-        return sorted(list(result), key=lambda x: x.index)
+        return sorted(self._bonds.used_atoms(), key=lambda x: x.index)
 
     @property
     def number_spins_in_unit_cell(self):
@@ -526,20 +577,15 @@ class SpinHamiltonian(Crystal):
             Maximum z coordinate.
         """
 
-        x_max, y_max, z_max = None, None, None
-        x_min, y_min, z_min = None, None, None
-        for atom1, atom2, R in self._bonds:
-            x1, y1, z1 = self.get_atom_coordinates(atom1, relative=False)
-            x2, y2, z2 = self.get_atom_coordinates(atom2, R, relative=False)
-            if x_max is None:
-                x_min, y_min, z_min = x1, y1, z1
-                x_max, y_max, z_max = x1, y1, z1
-            x_max = max(x1, x2, x_max)
-            y_max = max(y1, y2, y_max)
-            z_max = max(z1, z2, z_max)
-            x_min = min(x1, x2, x_min)
-            y_min = min(y1, y2, y_min)
-            z_min = min(z1, z2, z_min)
+        if len(self._bonds) == 0:
+            return None, None, None, None, None, None
+        bonds = self._bonds
+        positions = np.array([atom.position for atom in bonds.atoms])
+        start = positions[bonds.i] @ self.cell
+        end = start + self.get_vectors(bonds.i, bonds.j, bonds.R, atoms=bonds.atoms)
+        coordinates = np.concatenate((start, end))
+        x_min, y_min, z_min = coordinates.min(axis=0)
+        x_max, y_max, z_max = coordinates.max(axis=0)
         return x_min, y_min, z_min, x_max, y_max, z_max
 
     def __setitem__(self, key, value):
@@ -595,16 +641,18 @@ class SpinHamiltonian(Crystal):
 
         if isinstance(atom1, str):
             atom1 = self.get_atom(atom1)
-        elif atom1 not in self.atoms:
+        elif not self._has_atom(atom1):
             self.add_atom(atom1)
 
         if isinstance(atom2, str):
             atom2 = self.get_atom(atom2)
-        elif atom2 not in self.atoms:
+        elif not self._has_atom(atom2):
             self.add_atom(atom2)
 
         if J is None:
             J = ExchangeParameter(**kwargs)
+        if isinstance(J, ExchangeParameter):
+            J = J.matrix
 
         self._bonds[(atom1, atom2, R)] = J
 
@@ -615,8 +663,74 @@ class SpinHamiltonian(Crystal):
         except NotationError:
             pass
         i, j, k = R
-        if double_counting and (atom2, atom1, (-i, -j, -k)) not in self:
-            self._bonds[(atom2, atom1, (-i, -j, -k))] = J.T
+        if double_counting and (atom2, atom1, (-i, -j, -k)) not in self._bonds:
+            self._bonds[(atom2, atom1, (-i, -j, -k))] = np.transpose(J)
+
+    def add_bonds(self, i, j, R, J, atoms=None):
+        r"""
+        Add many bonds to the Hamiltonian at once.
+
+        Array version of :py:meth:`.add_bond`, suited for the output of
+        :py:meth:`.Crystal.find_neighbors`:
+
+        .. doctest::
+
+            >>> import numpy as np
+            >>> import radtools as rad
+            >>> model = rad.SpinHamiltonian(rad.Crystal())
+            >>> model.add_atom(rad.Atom("Fe", (0, 0, 0), spin=2))
+            >>> i, j, R, d = model.find_neighbors(1.5)
+            >>> model.add_bonds(i, j, R, J=np.exp(-d))
+            >>> len(model)
+            18
+
+        .. versionadded:: 0.8.10
+
+        Parameters
+        ----------
+        i : (M,) |array_like|_
+            Indices of the first atoms (in (0, 0, 0) unit cell) in ``atoms``.
+        j : (M,) |array_like|_
+            Indices of the second atoms (in ``R`` unit cell) in ``atoms``.
+        R : (M, 3) |array_like|_
+            Radius vectors of the unit cells for the second atoms (relative
+            coordinates).
+        J : (M, 3, 3) or (M,) |array_like|_
+            Exchange matrices or isotropic exchange parameters of the bonds.
+            A single matrix or number is used for all bonds.
+        atoms : list of :py:class:`.Atom`, optional
+            Atoms to which ``i`` and ``j`` refer. By default
+            :py:attr:`.Crystal.atoms`. Atoms, which are not present in the
+            crystal, are added to it.
+        """
+
+        i = np.asarray(i, dtype=int).reshape(-1)
+        j = np.asarray(j, dtype=int).reshape(-1)
+        R = np.asarray(R, dtype=int).reshape((-1, 3))
+        if atoms is None:
+            atoms = self.atoms
+        else:
+            for n in np.unique(np.concatenate((i, j))):
+                if not self._has_atom(atoms[n]):
+                    self.add_atom(atoms[n])
+
+        J = np.asarray(J, dtype=float)
+        if J.ndim < 2:
+            J = J[..., np.newaxis, np.newaxis] * np.eye(3)
+        J = np.broadcast_to(J, (len(i), 3, 3))
+
+        self._bonds.update(i, j, R, J, atoms=atoms)
+
+        # Check for double counting
+        double_counting = False
+        try:
+            double_counting = self.double_counting
+        except NotationError:
+            pass
+        if double_counting:
+            self._bonds.update(
+                j, i, -R, np.transpose(J, (0, 2, 1)), atoms=atoms, overwrite=False
+            )
 
     def __delitem__(self, key):
         self.remove_bond(*key)
@@ -706,13 +820,7 @@ class SpinHamiltonian(Crystal):
         if isinstance(atom, str):
             atom = self.get_atom(atom)
 
-        bonds_for_removal = []
-        for atom1, atom2, R, J in self:
-            if atom1 == atom or atom2 == atom:
-                bonds_for_removal.append((atom1, atom2, R))
-
-        for bond in bonds_for_removal:
-            del self[bond]
+        self._bonds.remove_atom(atom)
 
         super().remove_atom(atom)
 
@@ -763,9 +871,11 @@ class SpinHamiltonian(Crystal):
             else:
                 raise TypeError("Type is not supported, supported: list.")
         bonds_for_removal = set()
-        for atom1, atom2, R, J in self:
+        distances = self.get_distances(
+            self._bonds.i, self._bonds.j, self._bonds.R, atoms=self._bonds.atoms
+        )
+        for (atom1, atom2, R), dis in zip(list(self._bonds), distances):
             i, j, k = R
-            dis = self.get_distance(atom1, atom2, R)
 
             if max_distance is not None and dis > max_distance:
                 bonds_for_removal.add((atom1, atom2, R))
@@ -928,6 +1038,86 @@ class SpinHamiltonian(Crystal):
         new_model.form_model(template=template)
         return new_model
 
+    def make_template(self, magnetic=False, tolerance=1e-5) -> ExchangeTemplate:
+        r"""
+        Template with the bonds grouped by the symmetry of the crystal.
+
+        Each group of the template is one orbit of the space group
+        (see :py:func:`.bond_orbits`). Groups are named "J1", "J2", ...
+        in the order of the distance, atoms are identified by their fullnames.
+
+        .. versionadded:: 0.8.10
+
+        Parameters
+        ----------
+        magnetic : bool, default False
+            Whether to use the magnetic symmetry (see :py:func:`.symmetry_operations`)
+            instead of the symmetry of the atomic structure.
+        tolerance : float, default 1e-5
+            Tolerance for the relative coordinates.
+
+        Returns
+        -------
+        template : :py:class:`.ExchangeTemplate`
+            Template of the Hamiltonian.
+
+        See Also
+        --------
+        form_model
+        symmetrize
+        """
+
+        i, j, R, _ = self._bonds.arrays(self.atoms)
+        order = np.argsort(self.get_distances(i, j, R), kind="stable")
+        i, j, R = i[order], j[order], R[order]
+        orbits = bond_orbits(self, i, j, R, magnetic=magnetic, tolerance=tolerance)
+
+        n_orbits = orbits.max() + 1 if len(orbits) != 0 else 0
+        template = ExchangeTemplate()
+        for n in range(n_orbits):
+            template.names[f"J{n + 1}"] = []
+            template.latex_names[f"J{n + 1}"] = f"$J_{{{n + 1}}}$"
+        for orbit, atom1, atom2, R_vector in zip(orbits, i, j, R.tolist()):
+            template.names[f"J{orbit + 1}"].append(
+                (
+                    self.atoms[atom1].fullname,
+                    self.atoms[atom2].fullname,
+                    tuple(R_vector),
+                )
+            )
+        return template
+
+    def symmetrize(self, magnetic=False, tolerance=1e-5):
+        r"""
+        Force the Hamiltonian to have the symmetry of the crystal.
+
+        Exchange matrices of the equivalent bonds are averaged with the rotation
+        of the matrices (and DMI vectors) by the symmetry operations
+        (see :py:func:`.symmetrize_bonds`). Unlike :py:meth:`.form_model` the
+        directions of the DMI vectors follow the symmetry as well.
+
+        This method modifies an instance on which it was called.
+
+        .. versionadded:: 0.8.10
+
+        Parameters
+        ----------
+        magnetic : bool, default False
+            Whether to use the magnetic symmetry (see :py:func:`.symmetry_operations`)
+            instead of the symmetry of the atomic structure.
+        tolerance : float, default 1e-5
+            Tolerance for the relative coordinates.
+
+        See Also
+        --------
+        make_template
+        """
+
+        i, j, R, J = self._bonds.arrays(self.atoms)
+        self._bonds.J[:] = symmetrize_bonds(
+            self, i, j, R, J, magnetic=magnetic, tolerance=tolerance
+        )
+
     def ferromagnetic_energy(self, theta=0, phi=0):
         r"""
         Compute energy of the Hamiltonian assuming ferromagnetic state.
@@ -965,18 +1155,367 @@ class SpinHamiltonian(Crystal):
             [np.cos(phi) * np.sin(theta), np.sin(phi) * np.sin(theta), np.cos(theta)]
         )
 
-        energy = np.zeros((3, 3), dtype=float)
-        for atom1, atom2, R, J in self:
-            if self.spin_normalized:
-                energy += self.factor * J.matrix
-            else:
-                energy += self.factor * J.matrix * atom1.spin * atom2.spin
+        magnetic_atoms = self.magnetic_atoms
+        i, j, R, J = self._bonds.arrays(magnetic_atoms)
+        if not self.spin_normalized:
+            spins = np.array([atom.spin for atom in magnetic_atoms])
+            J *= (spins[i] * spins[j])[:, None, None]
+        energy = self.factor * J.sum(axis=0)
 
         energy = np.einsum("ni,ij,jn->n", spin_direction.T, energy, spin_direction)
         if len(energy) == 1:
             energy = energy[0]
         return energy
 
+    def _exchange_arrays(self):
+        r"""
+        Bonds of the model as arrays, scaled with the spin values and the factor.
+
+        Returns
+        -------
+        J : (M, 3, 3) :numpy:`ndarray`
+            Exchange matrices, such that the energy is
+            :math:`\sum_{b}\boldsymbol{e}_i^T\boldsymbol{J}_b\boldsymbol{e}_j`
+            for the unit vectors :math:`\boldsymbol{e}` along the spins.
+        i : (M,) :numpy:`ndarray`
+            Indices of the first atom in :py:attr:`.magnetic_atoms`.
+        j : (M,) :numpy:`ndarray`
+            Indices of the second atom in :py:attr:`.magnetic_atoms`.
+        R : (M, 3) :numpy:`ndarray`
+            Lattice vectors of the bonds, in relative coordinates.
+        """
+
+        magnetic_atoms = self.magnetic_atoms
+        i, j, R, J = self._bonds.arrays(magnetic_atoms)
+
+        if not self.spin_normalized:
+            spins = np.array([atom.spin for atom in magnetic_atoms])
+            J *= (spins[i] * spins[j])[:, None, None]
+
+        return self.factor * J, i, j, R
+
+    def exchange_fourier(self, kpoints, relative=False):
+        r"""
+        Fourier transform of the exchange parameters.
+
+        .. math::
+
+            \mathcal{J}^{\alpha\beta}_{ij}(\boldsymbol{q}) = \dfrac{1}{2}\sum_{\boldsymbol{R}}
+            \left(J^{\alpha\beta}_{ij}(\boldsymbol{R})e^{i\boldsymbol{q}\boldsymbol{R}}
+            + J^{\beta\alpha}_{ji}(\boldsymbol{R})e^{-i\boldsymbol{q}\boldsymbol{R}}\right)
+
+        It is Hermitian :math:`3N \times 3N` matrix, which is computed for all
+        k points at once. Spin values and the factor of the notation
+        are included in the exchange parameters.
+
+        .. versionadded:: 0.8.10
+
+        Notes
+        -----
+        Notation of the Hamiltonian has to be known.
+        See :py:meth:`.set_interpretation` and :py:attr:`.notation`.
+
+        Parameters
+        ----------
+        kpoints : (M, 3) |array_like|_
+            Reciprocal vectors.
+        relative : bool, default False
+            Whether ``kpoints`` are in relative coordinates with respect to the
+            reciprocal cell.
+
+        Returns
+        -------
+        J : (M, 3N, 3N) :numpy:`ndarray`
+            Index :math:`3i + \alpha` corresponds to the component :math:`\alpha`
+            of the spin of the atom :math:`i` in :py:attr:`.magnetic_atoms`.
+        """
+
+        kpoints = np.array(kpoints, dtype=float).reshape((-1, 3))
+        if relative:
+            kpoints = kpoints @ self.reciprocal_cell
+
+        J, i, j, R = self._exchange_arrays()
+        N = self.number_spins_in_unit_cell
+        d = R @ self.cell
+        reduction = _pairs_reduction(i, j, N)
+
+        result = np.zeros((len(kpoints), N, 3, N, 3), dtype=complex)
+        chunk = _kpoints_chunk(9 * len(J))
+        for start in range(0, len(kpoints), chunk):
+            phases = np.exp(1j * kpoints[start : start + chunk] @ d.T)
+            # (M, N, N, 3, 3) -> (M, N, 3, N, 3)
+            result[start : start + chunk] = np.transpose(
+                _sum_over_pairs(phases[:, :, None, None] * J, reduction, N),
+                (0, 1, 3, 2, 4),
+            )
+        result = result.reshape((len(kpoints), 3 * N, 3 * N))
+        return (result + np.conjugate(np.transpose(result, (0, 2, 1)))) / 2
+
+    def luttinger_tisza(
+        self, n1=10, n2=10, n3=10, symmetry=False, n_candidates=5, refine=True
+    ):
+        r"""
+        Spiral ground state in the Luttinger-Tisza approximation.
+
+        Minimum eigenvalue :math:`\lambda(\boldsymbol{q})` of
+        :py:meth:`.exchange_fourier` is computed on the uniform grid
+        (see :py:func:`.monkhorst_pack`). Lowest points of the grid are refined with
+        the local optimizer. Spin directions are given by the eigenvector
+        :math:`\boldsymbol{w} = \boldsymbol{e}_1 + i\boldsymbol{e}_2`:
+
+        .. math::
+
+            \boldsymbol{e}_i(\boldsymbol{R}) = \boldsymbol{e}_{1,i}\cos(\boldsymbol{Q}\boldsymbol{R})
+            - \boldsymbol{e}_{2,i}\sin(\boldsymbol{Q}\boldsymbol{R})
+
+        Result is the ground state if the eigenvector satisfies
+        the strong constraint (i.e. spins have the same length). Otherwise the energy
+        is the lower bound of the ground state energy.
+
+        .. versionadded:: 0.8.10
+
+        Notes
+        -----
+        Notation of the Hamiltonian has to be known.
+        See :py:meth:`.set_interpretation` and :py:attr:`.notation`.
+
+        Parameters
+        ----------
+        n1 : int, default 10
+            Number of points along :math:`\boldsymbol{b}_1`.
+        n2 : int, default 10
+            Number of points along :math:`\boldsymbol{b}_2`.
+        n3 : int, default 10
+            Number of points along :math:`\boldsymbol{b}_3`.
+        symmetry : bool, default False
+            Whether to compute only the irreducible points of the grid
+            (see :py:func:`.irreducible_kpoints`). Exchange parameters have to obey
+            the symmetry of the crystal.
+        n_candidates : int, default 5
+            Number of the lowest grid points, which are refined.
+        refine : bool, default True
+            Whether to refine the grid minimum with the local optimizer.
+
+        Returns
+        -------
+        Q : (3,) :numpy:`ndarray`
+            Ordering wave vector, in relative coordinates with respect to the
+            reciprocal cell. Each component is in :math:`(-0.5, 0.5]`.
+        n : (3,) :numpy:`ndarray`
+            Rotation axis of the spiral. For the collinear states it is perpendicular
+            to the spins.
+        energy : float
+            Classical energy per unit cell :math:`N\lambda(\boldsymbol{Q})`,
+            where :math:`N` is the number of the magnetic atoms.
+        """
+
+        def lowest(kpoints):
+            return np.linalg.eigvalsh(self.exchange_fourier(kpoints, relative=True))[
+                :, 0
+            ]
+
+        if symmetry:
+            kpoints, _, _ = irreducible_kpoints(
+                self, n1, n2, n3, magnetic=False, time_reversal=True
+            )
+        else:
+            kpoints = monkhorst_pack(n1, n2, n3)
+
+        values = lowest(kpoints)
+        candidates = kpoints[np.argsort(values)[:n_candidates]]
+
+        Q = candidates[0]
+        energy = values.min()
+        if refine:
+            for candidate in candidates:
+                result = minimize(
+                    lambda x: lowest(x)[0],
+                    candidate,
+                    method="Nelder-Mead",
+                    options=dict(xatol=1e-8, fatol=1e-12),
+                )
+                if result.fun < energy:
+                    Q, energy = result.x, result.fun
+
+        # Q in (-0.5, 0.5]
+        Q = np.array(Q, dtype=float)
+        Q = Q - np.ceil(Q - 0.5)
+
+        _, vectors = np.linalg.eigh(self.exchange_fourier(Q, relative=True)[0])
+        w = vectors[:, 0].reshape((-1, 3))
+        # Global phase, for which the real part is the largest
+        w = w * np.exp(-0.5j * np.angle(np.sum(w * w)))
+        atom = np.argmax(np.linalg.norm(w, axis=1))
+        n = np.cross(w[atom].real, w[atom].imag)
+        if np.linalg.norm(n) < 1e-8 * np.linalg.norm(w[atom]) ** 2:
+            # Collinear state
+            n = span_orthonormal_set(w[atom].real)[0]
+        n = n / np.linalg.norm(n)
+
+        return Q, n, energy * self.number_spins_in_unit_cell
+
+    def _heisenberg_fourier(self, kpoints, quantum=False):
+        r"""
+        Isotropic exchange in the form of :math:`E = -\sum_{ij}\boldsymbol{e}_iM_{ij}\boldsymbol{e}_j`.
+
+        Parameters
+        ----------
+        kpoints : (M, 3) :numpy:`ndarray`
+            Reciprocal vectors, in relative coordinates.
+        quantum : bool, default False
+            Whether to replace :math:`S^2` with :math:`S(S+1)`.
+
+        Returns
+        -------
+        M : (M, N, N) :numpy:`ndarray`
+        """
+
+        J, i, j, R = self._exchange_arrays()
+        N = self.number_spins_in_unit_cell
+        if quantum:
+            spins = np.array([atom.spin for atom in self.magnetic_atoms])
+            J = (
+                J
+                * np.sqrt((spins[i] + 1) * (spins[j] + 1) / spins[i] / spins[j])[
+                    :, None, None
+                ]
+            )
+
+        kpoints = np.array(kpoints, dtype=float).reshape((-1, 3))
+        # Bonds are summed for each (R, i, j) first: phases are computed
+        # only for the distinct unit cells.
+        cells, cell_index = np.unique(R.reshape((-1, 3)), axis=0, return_inverse=True)
+        collect = np.bincount(
+            (cell_index.reshape(-1) * N + i) * N + j,
+            weights=-np.trace(J, axis1=1, axis2=2) / 3,
+            minlength=len(cells) * N * N,
+        ).reshape((len(cells), N * N))
+
+        result = np.zeros((len(kpoints), N, N), dtype=complex)
+        chunk = _kpoints_chunk(max(len(cells), N * N))
+        for start in range(0, len(kpoints), chunk):
+            phases = np.exp(2j * np.pi * kpoints[start : start + chunk] @ cells.T)
+            result[start : start + chunk] = (phases @ collect).reshape((-1, N, N))
+        return (result + np.conjugate(np.transpose(result, (0, 2, 1)))) / 2
+
+    def curie_temperature(
+        self, method="rpa", quantum=False, tolerance=1e-3, n_start=8, max_iterations=4
+    ):
+        r"""
+        Critical temperature of the ferromagnetic state.
+
+        Only the isotropic part of the exchange is used. Let the classical energy be
+
+        .. math::
+
+            E = -\sum_{i,j,\boldsymbol{R}}\boldsymbol{e}_i\mathcal{M}_{ij}(\boldsymbol{R})\boldsymbol{e}_j(\boldsymbol{R})
+
+        where the spin values, the factor and the double counting of the notation are
+        included in :math:`\mathcal{M}`.
+
+        * "mean-field":
+
+          .. math::
+
+              k_BT_C = \dfrac{2}{3}\lambda_{max}(\mathcal{M}(\boldsymbol{0}))
+
+        * "rpa": random phase approximation (Tyablikov), averaged over the
+          magnetic sublattices [1]_:
+
+          .. math::
+
+              k_BT_C = \dfrac{2}{3}\left[\dfrac{1}{N}\sum_i
+              \langle[\boldsymbol{N}^{-1}(\boldsymbol{q})]_{ii}\rangle_{\boldsymbol{q}}\right]^{-1},
+              \quad N_{ij}(\boldsymbol{q}) = \delta_{ij}\sum_k\mathcal{M}_{ik}(\boldsymbol{0})
+              - \mathcal{M}_{ij}(\boldsymbol{q})
+
+          Average over the Brillouin zone is computed on the shifted uniform grids
+          (see :py:func:`.monkhorst_pack`), which do not contain :math:`\Gamma` point.
+          Number of points along each direction is doubled and the averages of two
+          consecutive grids are extrapolated to the infinite grid, until the relative
+          change of the temperature is less than ``tolerance``.
+          Directions without the bonds are not sampled.
+
+        .. versionadded:: 0.8.10
+
+        Notes
+        -----
+        Notation of the Hamiltonian has to be known.
+        See :py:meth:`.set_interpretation` and :py:attr:`.notation`.
+        Energy units are expected to be meV.
+
+        Parameters
+        ----------
+        method : str, default "rpa"
+            Either "mean-field" or "rpa". Case-insensitive.
+        quantum : bool, default False
+            Whether to replace :math:`S^2` with :math:`S(S+1)`
+            (:py:attr:`.Atom.spin` has to be defined for the magnetic atoms).
+        tolerance : float, default 1e-3
+            Relative tolerance of the RPA temperature.
+        n_start : int, default 8
+            Number of the grid points along each direction for the first RPA grid.
+        max_iterations : int, default 4
+            Maximum number of the grid refinements.
+
+        Returns
+        -------
+        temperature : float
+            Critical temperature, in Kelvin.
+
+        References
+        ----------
+        .. [1] Rusz, J., Turek, I. and Diviš, M., 2005.
+            Random-phase approximation for critical temperatures of collinear magnets
+            with multiple sublattices: GdX compounds (X= Mg, Rh, Ni, Pd).
+            Physical Review B, 71(17), p.174408.
+        """
+
+        method = method.lower()
+        if method not in ["mean-field", "rpa"]:
+            raise ValueError(f'Method has to be "mean-field" or "rpa", got "{method}".')
+
+        M_0 = self._heisenberg_fourier(np.zeros((1, 3)), quantum=quantum)[0].real
+        if method == "mean-field":
+            return 2 / 3 * np.linalg.eigvalsh(M_0)[-1] / K_BOLTZMANN
+
+        _, _, _, R = self._exchange_arrays()
+        sampled = (R != 0).any(axis=0)
+        diagonal = np.diag(M_0.sum(axis=1))
+
+        previous_average = None
+        temperature = None
+        n = n_start
+        for _ in range(max_iterations + 1):
+            shape = np.where(sampled, n, 1)
+            kpoints = monkhorst_pack(*shape, shift=np.where(sampled, 0.5, 0))
+            total = 0
+            # Memory of one chunk is limited by the bonds and the (N, N) matrices
+            chunk = _kpoints_chunk(max(len(R), M_0.size))
+            for start in range(0, len(kpoints), chunk):
+                matrices = diagonal[None] - self._heisenberg_fourier(
+                    kpoints[start : start + chunk], quantum=quantum
+                )
+                total += np.linalg.inv(matrices).diagonal(axis1=1, axis2=2).real.sum()
+            average = total / len(kpoints) / len(diagonal)
+
+            if previous_average is not None:
+                # Integrable 1/q^2 singularity at Gamma: error is linear in 1/n
+                new_temperature = 2 / 3 / (2 * average - previous_average) / K_BOLTZMANN
+                if temperature is not None and abs(
+                    new_temperature - temperature
+                ) <= tolerance * abs(temperature):
+                    return new_temperature
+                temperature = new_temperature
+            previous_average = average
+            n *= 2
+
+        warnings.warn(
+            f"RPA temperature is not converged with {tuple(shape)} grid.",
+            RuntimeWarning,
+        )
+        return temperature
+
     def input_for_magnons(self, nodmi=False, noaniso=False, custom_mask=None):
         r"""
         Input from the spin Hamiltonian.
@@ -1003,26 +1542,20 @@ class SpinHamiltonian(Crystal):
         """
 
         Jij = []
-        i = []
-        j = []
-        dij = []
-        magnetic_atoms = self.magnetic_atoms
-        atom_index = dict([(atom, i) for i, atom in enumerate(magnetic_atoms)])
         for atom1, atom2, R, J in self:
             if custom_mask is not None:
                 result = custom_mask(J.matrix)
             else:
                 result = J.matrix
                 if nodmi:
-                    result -= J.dmi_matrix
+                    result = result - J.dmi_matrix
                 if noaniso:
-                    result -= J.aniso
+                    result = result - J.aniso
             Jij.append(result)
-            i.append(atom_index[atom1])
-            j.append(atom_index[atom2])
-            dij.append(self.get_vector(atom1, atom1, R))
+        i, j, R, _ = self._bonds.arrays(self.magnetic_atoms)
+        dij = list(self.get_vectors(i, i, R, atoms=self.magnetic_atoms))
 
-        return Jij, i, j, dij
+        return Jij, i.tolist(), j.tolist(), dij
 
 
 class ExchangeHamiltonian(SpinHamiltonian):
@@ -1031,20 +1564,10 @@ class ExchangeHamiltonian(SpinHamiltonian):
 
 class SpinHamiltonianIterator:
     def __init__(self, exchange_model: SpinHamiltonian) -> None:
-        self._bonds = list(
-            map(
-                lambda x: (x[0], x[1], x[2], exchange_model._bonds[x]),
-                exchange_model._bonds,
-            )
-        )
-        self._index = 0
+        self._items = exchange_model._bonds.items()
 
     def __next__(self) -> Tuple[Atom, Atom, tuple, ExchangeParameter]:
-        if self._index < len(self._bonds):
-            result = self._bonds[self._index]
-            self._index += 1
-            return result
-        raise StopIteration
+        return next(self._items)
 
     def __iter__(self):
         return self
@@ -0,0 +1,72 @@
+from argparse import ArgumentParser
+from time import perf_counter
+
+import numpy as np
+
+from radtools.magnons.diagonalization import solve_via_colpa_stack
+
+
+def random_grand_dynamical_matrices(M, N, rng):
+    # Hermitian and positive-defined matrices
+    X = rng.normal(size=(M, 2 * N, 2 * N)) + 1j * rng.normal(size=(M, 2 * N, 2 * N))
+    return X @ np.conjugate(np.transpose(X, (0, 2, 1))) + np.eye(2 * N)
+
+
+def benchmark(sizes, n_elements, repeat):
+    rng = np.random.default_rng(42)
+    print(
+        f"{'N':>5} {'M':>6} {'eig, ms/k':>12} {'eigh, ms/k':>12} "
+        + f"{'speedup':>8} {'max |dE|':>10}"
+    )
+    for N in sizes:
+        # Keep the total amount of work roughly constant
+        M = max(1, n_elements // (2 * N) ** 2)
+        D = random_grand_dynamical_matrices(M, N, rng)
+
+        timings = {}
+        energies = {}
+        for method in ["eig", "eigh"]:
+            best = None
+            for _ in range(repeat):
+                start = perf_counter()
+                energies[method], _, _ = solve_via_colpa_stack(D, method=method)
+                duration = perf_counter() - start
+                if best is None or duration < best:
+                    best = duration
+            timings[method] = best / M * 1000
+
+        print(
+            f"{N:>5} {M:>6} {timings['eig']:>12.4f} {timings['eigh']:>12.4f} "
+            + f"{timings['eig'] / timings['eigh']:>8.2f} "
+            + f"{np.abs(energies['eig'] - energies['eigh']).max():>10.2e}"
+        )
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Compare 'eig' and 'eigh' methods of the diagonalization via Colpa."
+    )
+    parser.add_argument(
+        "-s",
+        "--sizes",
+        type=int,
+        nargs="*",
+        default=[2, 4, 8, 16, 32, 64, 128, 256],
+        help="Numbers of magnetic sublattices N.",
+    )
+    parser.add_argument(
+        "-ne",
+        "--n-elements",
+        type=int,
+        default=2**20,
+        help="Approximate amount of matrix elements in the stack for each N.",
+    )
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=3,
+        help="Number of repetitions, the best time is reported.",
+    )
+    args = parser.parse_args()
+    benchmark(args.sizes, args.n_elements, args.repeat)
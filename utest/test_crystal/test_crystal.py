@@ -152,3 +152,101 @@ def test_get_distance(name1, position1, name2, position2, R):
         c.get_distance(name1, name2, R=R, index1=1, index2=2, relative=True),
         np.linalg.norm(position2 - position1 + np.array(R)),
     )
+
+
+def test_get_vectors():
+    c = Crystal(cell=[[1, 0, 0], [0, 2, 0], [0, 0, 3]], standardize=False)
+    c.add_atom(name="Cr", position=(0, 0, 0))
+    c.add_atom(name="Fe", position=(0.5, 0.5, 0.5))
+    c.add_atom(name="Ni", position=(0.1, 0.2, 0.3))
+    rng = np.random.default_rng(13)
+    i = rng.integers(3, size=20)
+    j = rng.integers(3, size=20)
+    R = rng.integers(-3, 4, size=(20, 3))
+    for relative in [True, False]:
+        vectors = c.get_vectors(i, j, R, relative=relative)
+        distances = c.get_distances(i, j, R, relative=relative)
+        for n in range(20):
+            atom1, atom2 = c.atoms[i[n]], c.atoms[j[n]]
+            assert np.allclose(
+                vectors[n], c.get_vector(atom1, atom2, R[n], relative=relative)
+            )
+            assert np.allclose(
+                distances[n], c.get_distance(atom1, atom2, R[n], relative=relative)
+            )
+    assert np.allclose(c.get_vectors([0], [1]), [[0.5, 1, 1.5]])
+    assert np.allclose(
+        c.get_distances([0, 0], [1, 0], atoms=c.atoms[::-1]), [np.sqrt(0.88), 0]
+    )
+
+
+def test_atom_lookup():
+    c = Crystal()
+    for n in range(200):
+        c.add_atom(Atom(["Cr", "Fe"][n % 2], (n / 200, 0, 0)))
+    assert c.get_atom("Fe__200") is c.atoms[199]
+    assert c.get_atom("Cr", index=1) is c.atoms[0]
+    assert len(c.get_atom("Cr", return_all=True)) == 100
+    assert c.get_atom_slot("Fe__4") == 3
+    assert c.get_atom_slot(c.atoms[10]) == 10
+    with pytest.raises(ValueError):
+        c.add_atom(Atom("Cr", index=1))
+
+    # Renamed atoms
+    c.atoms[0].name = "Ni"
+    assert c.get_atom("Ni") is c.atoms[0]
+    assert len(c.get_atom("Cr", return_all=True)) == 99
+    c.atoms[0].index = 1000
+    assert c.get_atom("Ni__1000") is c.atoms[0]
+
+    # Modified list of atoms
+    c.remove_atom("Fe__2")
+    assert c.get_atom_slot("Fe__4") == 2
+    c.atoms[0] = Atom("Co", index=1)
+    assert c.get_atom("Co") is c.atoms[0]
+    assert Atom("Co", index=1) in c
+    c.atoms = c.atoms[::-1]
+    assert c.get_atom_slot("Co__1") == 198
+    with pytest.raises(ValueError):
+        c.get_atom("Ni")
+
+    # Replaced atoms with the same name and index
+    c.atoms[5] = Atom(c.atoms[5].name, index=c.atoms[5].index)
+    assert c.get_atom(c.atoms[5].fullname) is c.atoms[5]
+    c.atoms[6], c.atoms[7] = c.atoms[7], c.atoms[6]
+    assert c.get_atom_slot(c.atoms[6].fullname) == 6
+    c.atoms[8].name = "Mn"
+    with pytest.raises(ValueError):
+        c.add_atom(Atom("Mn", index=c.atoms[8].index))
+
+
+def test_find_neighbors():
+    c = Crystal()
+    c.add_atom(Atom("Fe", (0, 0, 0)))
+    i, j, R, d, shells = c.find_neighbors(1.5, shells=True)
+    assert len(d) == 18
+    assert np.bincount(shells).tolist() == [6, 12]
+    assert np.allclose(d[:6], 1)
+    assert np.allclose(d[6:], np.sqrt(2))
+    assert np.allclose(d, c.get_distances(i, j, R))
+    i, j, R, d = c.find_neighbors(1.5, unique=True)
+    assert len(d) == 9
+    assert len(c.find_neighbors(0.5)[0]) == 0
+
+    # Brute force search in the oblique cell with the atoms outside of it
+    rng = np.random.default_rng(0)
+    c = Crystal(cell=np.eye(3) + rng.random((3, 3)), standardize=False)
+    for n in range(3):
+        c.add_atom(Atom("Cr", rng.random(3) * 1.4 - 0.2))
+    cutoff = 2.5
+    expected = set()
+    cells = np.indices((11, 11, 11)).reshape((3, -1)).T - 5
+    for a in range(3):
+        for b in range(3):
+            d = c.get_distances([a] * len(cells), [b] * len(cells), cells)
+            for R in cells[d <= cutoff]:
+                if a != b or R.any():
+                    expected.add((a, b, tuple(R)))
+    i, j, R, d = c.find_neighbors(cutoff)
+    assert set(zip(i, j, map(tuple, R))) == expected
+    assert (np.diff(d) > -1e-10).all()
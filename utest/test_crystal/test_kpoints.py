@@ -1,5 +1,5 @@
 import pytest
-from radtools.crystal.kpoints import Kpoints
+from radtools.crystal.kpoints import Kpoints, monkhorst_pack
 import numpy as np
 
 
@@ -215,3 +215,67 @@ def test_flatten_points(path, corr_flat_points):
         path=path,
     )
     assert (np.abs(kp.flatten_points(relative=True) - corr_flat_points) < 1e-5).all()
+
+
+def test_monkhorst_pack():
+    points = monkhorst_pack(2, 3, 1)
+    assert points.shape == (6, 3)
+    assert np.allclose(points[4], [1 / 2, 1 / 3, 0])
+    assert np.allclose(
+        monkhorst_pack(2, 2, 2, shift=(0.5, 0.5, 0.5)).min(axis=0), [0.25, 0.25, 0.25]
+    )
+    with pytest.raises(ValueError):
+        monkhorst_pack(0, 1, 1)
+
+
+def test_adaptive_points():
+    kp = Kpoints(
+        [2 * np.pi, 0, 0],
+        [0, 2 * np.pi, 0],
+        [0, 0, 2 * np.pi],
+        coordinates=[points["G"], points["X"], points["K"], points["R"]],
+        names=["G", "X", "K", "R"],
+        path="G-X-K|G-R",
+    )
+
+    def function(k):
+        return np.array(
+            [np.cos(k[:, 0]) + np.cos(k[:, 1]) + np.cos(k[:, 2]), -np.cos(k[:, 0])]
+        )
+
+    adaptive, flatten, values = kp.adaptive_points(function, tolerance=1e-3)
+    assert values.shape == (2, len(adaptive))
+    assert np.allclose(values, function(adaptive))
+    assert np.allclose(flatten[[0, -1]], kp.flatten_points()[[0, -1]])
+    assert (np.diff(flatten) >= 0).all()
+    assert len(adaptive) < 3 * 102
+
+    # Scalar function and relative coordinates
+    adaptive, _, values = kp.adaptive_points(
+        lambda k: np.linalg.norm(k, axis=1), relative=True, max_depth=0
+    )
+    assert values.shape == (3 * 12,)
+    kp.n = 10
+    assert np.allclose(adaptive, kp.points(relative=True))
+
+
+def test_adaptive_points_accuracy():
+    kp = Kpoints(
+        [2 * np.pi, 0, 0],
+        [0, 2 * np.pi, 0],
+        [0, 0, 2 * np.pi],
+        coordinates=[points["G"], points["X"]],
+        names=["G", "X"],
+    )
+
+    # Sharp feature in the middle and crossing of two bands
+    def function(k):
+        return np.array([np.exp(-(((k[:, 0] - 1.3) / 0.05) ** 2)), 0.5 - 0.1 * k[:, 0]])
+
+    adaptive, flatten, values = kp.adaptive_points(function, tolerance=1e-3)
+    kp.n = 5000
+    dense = function(kp.points())
+    for band in range(2):
+        interpolated = np.interp(kp.flatten_points(), flatten, values[band])
+        assert np.abs(interpolated - dense[band]).max() < 5e-3
+    assert len(adaptive) < 500
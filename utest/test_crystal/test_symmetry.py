@@ -0,0 +1,141 @@
+import pytest
+
+import numpy as np
+
+from radtools.crystal.atom import Atom
+from radtools.crystal.bravais_lattice import lattice_example
+from radtools.crystal.crystal import Crystal
+from radtools.crystal.symmetry import (
+    bond_orbits,
+    irreducible_kpoints,
+    symmetrize_bonds,
+    symmetry_operations,
+)
+
+
+def cubic(spin=None):
+    crystal = Crystal(lattice_example("CUB"))
+    crystal.add_atom(Atom("Fe", (0, 0, 0), spin=spin))
+    return crystal
+
+
+@pytest.mark.parametrize(
+    "lattice, n_operations", [("CUB", 48), ("FCC", 48), ("BCC", 48), ("HEX", 24)]
+)
+def test_point_group(lattice, n_operations):
+    crystal = Crystal(lattice_example(lattice))
+    crystal.add_atom(Atom("Fe", (0, 0, 0)))
+    rotations, translations = symmetry_operations(crystal)
+    assert len(rotations) == n_operations
+    assert (rotations[0] == np.eye(3)).all()
+    assert np.allclose(translations, 0)
+    metric = crystal.cell @ crystal.cell.T
+    for W in rotations:
+        assert np.allclose(W.T @ metric @ W, metric)
+
+
+def test_magnetic_point_group():
+    # Axial vector along z is kept by 4/m
+    assert len(symmetry_operations(cubic(spin=[0, 0, 1]))[0]) == 8
+    assert len(symmetry_operations(cubic(spin=[0, 0, 1]), magnetic=False)[0]) == 48
+
+
+def test_nonsymmorphic():
+    crystal = Crystal(lattice_example("CUB"))
+    crystal.add_atom(Atom("Fe", (0, 0, 0)))
+    crystal.add_atom(Atom("Fe", (0.25, 0.25, 0.25)))
+    rotations, translations = symmetry_operations(crystal)
+    for W, t in zip(rotations, translations):
+        positions = np.array([[0, 0, 0], [0.25, 0.25, 0.25]]) @ W.T + t
+        difference = positions[:, None] - np.array([[0, 0, 0], [0.25, 0.25, 0.25]])
+        difference -= np.round(difference)
+        assert (np.abs(difference).max(axis=2) < 1e-8).any(axis=1).all()
+
+
+@pytest.mark.parametrize("shift", [(0, 0, 0), (0.5, 0.5, 0.5)])
+def test_irreducible_kpoints(shift):
+    kpoints, weights, mapping = irreducible_kpoints(cubic(), 6, 6, 6, shift=shift)
+    assert weights.dtype.kind == "i"
+    assert weights.sum() == 216
+    assert np.allclose(np.bincount(mapping), weights)
+    # Each point is equivalent to its irreducible point
+    full = (np.indices((6, 6, 6)).reshape((3, -1)).T + shift) / 6
+    assert np.allclose(
+        np.sort(np.abs(full - np.round(full))[:, None], axis=-1)[:, 0],
+        np.sort(
+            np.abs(kpoints[mapping] - np.round(kpoints[mapping]))[:, None], axis=-1
+        )[:, 0],
+    )
+
+
+def test_time_reversal():
+    # Zinc blende structure has no inversion
+    crystal = Crystal(lattice_example("FCC"))
+    crystal.add_atom(Atom("Zn", (0, 0, 0)))
+    crystal.add_atom(Atom("S", (0.25, 0.25, 0.25)))
+    assert len(symmetry_operations(crystal)[0]) == 24
+    n_without = len(irreducible_kpoints(crystal, 4, 4, 4)[0])
+    n_with = len(irreducible_kpoints(crystal, 4, 4, 4, time_reversal=True)[0])
+    assert n_with < n_without
+
+
+def test_bond_orbits():
+    i, j, R, d = cubic().find_neighbors(1.5 * np.pi)
+    assert bond_orbits(cubic(), i, j, R).tolist() == [0] * 6 + [1] * 12
+
+    # Centering translation maps the atoms onto each other
+    crystal = Crystal(standardize=False)
+    crystal.add_atom(Atom("Fe", (0, 0, 0), index=1))
+    crystal.add_atom(Atom("Fe", (0.5, 0.5, 0.5), index=2))
+    orbits = bond_orbits(
+        crystal,
+        [0, 1, 1, 0, 0],
+        [0, 1, 0, 1, 0],
+        [(1, 0, 0), (0, 0, -1), (0, 0, 0), (0, 0, 0), (1, 1, 0)],
+    )
+    assert orbits.tolist() == [0, 0, 1, 1, 2]
+
+
+def zinc_blende():
+    crystal = Crystal(standardize=False)
+    for position in [(0, 0, 0), (0.5, 0.5, 0), (0.5, 0, 0.5), (0, 0.5, 0.5)]:
+        crystal.add_atom(Atom("Zn", position))
+        crystal.add_atom(Atom("S", np.array(position) + 0.25))
+    return crystal
+
+
+def test_symmetrize_bonds():
+    crystal = zinc_blende()
+    i, j, R, d = crystal.find_neighbors(1.0)
+    J = symmetrize_bonds(
+        crystal, i, j, R, np.random.default_rng(0).normal(size=(len(i), 3, 3))
+    )
+    assert np.allclose(symmetrize_bonds(crystal, i, j, R, J), J)
+    orbits = bond_orbits(crystal, i, j, R)
+    traces = np.trace(J, axis1=1, axis2=2)
+    for orbit in range(orbits.max() + 1):
+        assert np.allclose(traces[orbits == orbit], traces[orbits == orbit][0])
+
+    def bond(atom1, atom2, R_vector):
+        return np.nonzero((i == atom1) & (j == atom2) & (R == R_vector).all(axis=1))[0][
+            0
+        ]
+
+    # Zn (0, 0, 0) - Zn (0.5, 0.5, 0) is mapped by the two-fold axis z
+    # and by the mirror plane x = y.
+    J_bond = J[bond(0, 2, (0, 0, 0))]
+    assert np.linalg.norm(J_bond - J_bond.T) > 1e-3
+    W = np.diag([-1, -1, 1])
+    assert np.allclose(J[bond(0, 2, (-1, -1, 0))], W @ J_bond @ W.T)
+    W = np.array([[0, 1, 0], [1, 0, 0], [0, 0, 1]])
+    assert np.allclose(J[bond(0, 2, (0, 0, 0))], W @ J_bond @ W.T)
+
+    # All bonds of the rock salt structure have the inversion centre: no DMI
+    crystal = Crystal(standardize=False)
+    crystal.add_atom(Atom("Na", (0, 0, 0)))
+    crystal.add_atom(Atom("Cl", (0.5, 0.5, 0.5)))
+    i, j, R, d = crystal.find_neighbors(1.0)
+    J = symmetrize_bonds(
+        crystal, i, j, R, np.random.default_rng(0).normal(size=(len(i), 3, 3))
+    )
+    assert np.allclose(J, np.transpose(J, (0, 2, 1)))
@@ -17,6 +17,7 @@ from radtools.crystal.constants import (
 from radtools.geometry import (
     absolute_to_relative,
     angle,
+    fibonacci_sphere,
     parallelepiped_check,
     span_orthonormal_set,
     volume,
@@ -208,3 +209,14 @@ def test_parallelepiped_check(a, b, c, alpha, beta, gamma):
         and compare_numerically(alpha, "<", beta + gamma, ABS_TOL_ANGLE)
         and compare_numerically(beta + gamma, "<", 360.0 - alpha, ABS_TOL_ANGLE)
     )
+
+
+@pytest.mark.parametrize("n", [1, 10, 1000])
+def test_fibonacci_sphere(n):
+    points = fibonacci_sphere(n)
+    assert points.shape == (n, 3)
+    assert np.allclose(np.linalg.norm(points, axis=1), 1)
+    if n > 100:
+        # Uniform sampling: average of x^2 over the sphere is 1/3
+        assert np.allclose(points.mean(axis=0), 0, atol=1e-2)
+        assert np.allclose((points**2).mean(axis=0), 1 / 3, atol=1e-2)
@@ -1,5 +1,6 @@
 import os
 
+import numpy as np
 import pytest
 
 from radtools.io.internal import *
@@ -76,3 +77,20 @@ class ReadTemplate:
             ],
         }
         assert len(self.template.get_list()) == 28
+
+
+def test_dump_npy(tmp_path):
+    data = np.arange(30, dtype=float).reshape(10, 3)
+    filename = os.path.join(tmp_path, "data")
+    chunks = ((start, data[start : start + 4]) for start in range(0, 10, 4))
+    written = dump_npy(
+        filename, chunks, data.shape, metadata={"cell": np.eye(3), "name": "test"}
+    )
+    assert written == 10
+    array, sidecar = load_npy(f"{filename}.npy")
+    assert isinstance(array, np.memmap)
+    assert np.allclose(array, data)
+    assert sidecar["shape"] == [10, 3]
+    assert sidecar["written"] == 10
+    assert sidecar["metadata"]["name"] == "test"
+    assert np.allclose(sidecar["metadata"]["cell"], np.eye(3))
@@ -0,0 +1,113 @@
+import pytest
+
+import numpy as np
+
+from radtools.crystal.atom import Atom
+from radtools.crystal.bravais_lattice import lattice_example
+from radtools.crystal.lattice import Lattice
+from radtools.magnons.correlations import StructureFactor
+from radtools.magnons.dispersion import MagnonDispersion
+from radtools.spinham.hamiltonian import SpinHamiltonian
+
+
+def ferromagnet(S=2):
+    model = SpinHamiltonian(lattice=lattice_example("CUB"), notation="standard")
+    model.add_atom(Atom("Fe", (0, 0, 0), spin=[0, 0, S]))
+    model.add_bond("Fe", "Fe", (1, 0, 0), iso=1)
+    model.add_bond("Fe", "Fe", (0, 1, 0), iso=1)
+    model.add_bond("Fe", "Fe", (0, 0, 1), iso=1)
+    return model
+
+
+def antiferromagnetic_chain(S=1.5):
+    model = SpinHamiltonian(
+        lattice=Lattice([[10, 0, 0], [0, 10, 0], [0, 0, 2]]), notation="standard"
+    )
+    model.add_atom(Atom("Fe", (0, 0, 0), spin=[0, 0, S], index=1))
+    model.add_atom(Atom("Fe", (0, 0, 0.5), spin=[0, 0, -S], index=2))
+    model.add_bond("Fe__1", "Fe__2", (0, 0, 0), iso=-1)
+    model.add_bond("Fe__2", "Fe__1", (0, 0, 0), iso=-1)
+    model.add_bond("Fe__2", "Fe__1", (0, 0, 1), iso=-1)
+    model.add_bond("Fe__1", "Fe__2", (0, 0, -1), iso=-1)
+    return model
+
+
+def test_ferromagnet():
+    structure_factor = StructureFactor(MagnonDispersion(ferromagnet(S=2)))
+    qpoints = np.random.default_rng(3).normal(size=(10, 3))
+    omegas, S = structure_factor.correlations(qpoints)
+    assert np.allclose(omegas, MagnonDispersion(ferromagnet(S=2)).omegas(qpoints).T)
+    assert np.allclose(S[:, 0, 0, 0], 1)
+    assert np.allclose(S[:, 0, 1, 1], 1)
+    assert np.allclose(S[:, 0, 2, 2], 0)
+
+    # Only the transverse part with respect to q is visible
+    _, intensities = structure_factor.intensities(qpoints)
+    directions = qpoints / np.linalg.norm(qpoints, axis=1)[:, None]
+    assert np.allclose(
+        intensities[:, 0], 2 - directions[:, 0] ** 2 - directions[:, 1] ** 2
+    )
+    _, trace = structure_factor.intensities(qpoints, polarization=False)
+    assert np.allclose(trace, 2)
+
+
+@pytest.mark.parametrize("colpa_method", ["eig", "eigh"])
+def test_antiferromagnetic_chain(colpa_method):
+    S = 1.5
+    dispersion = MagnonDispersion(antiferromagnetic_chain(S), colpa_method=colpa_method)
+    q = np.linspace(0.1, 3, 7)
+    qpoints = np.zeros((7, 3))
+    qpoints[:, 2] = q
+
+    _, correlations = StructureFactor(dispersion).correlations(qpoints)
+    expected = S * np.sqrt((1 - np.cos(q)) / (1 + np.cos(q)))
+    assert np.allclose(correlations[:, :, 0, 0].real.sum(axis=1), expected)
+    assert np.allclose(correlations[:, :, 1, 1].real.sum(axis=1), expected)
+
+
+def test_form_factors():
+    dispersion = MagnonDispersion(ferromagnet())
+    qpoints = np.random.default_rng(4).normal(size=(5, 3))
+    _, reference = StructureFactor(dispersion).intensities(qpoints)
+    _, intensities = StructureFactor(
+        dispersion, form_factors=lambda q: np.exp(-q)
+    ).intensities(qpoints)
+    assert np.allclose(
+        intensities, reference * np.exp(-2 * np.linalg.norm(qpoints, axis=1))[:, None]
+    )
+    with pytest.raises(ValueError):
+        StructureFactor(dispersion, form_factors=[None, None])
+
+
+def test_spiral():
+    with pytest.raises(ValueError):
+        StructureFactor(MagnonDispersion(ferromagnet(), Q=[0.1, 0, 0]))
+
+
+def test_map():
+    structure_factor = StructureFactor(MagnonDispersion(antiferromagnetic_chain()))
+    qpoints = np.zeros((5, 3))
+    qpoints[:, 2] = np.linspace(0.5, 2.5, 5)
+    energies = np.linspace(-2, 10, 3001)
+    intensity = structure_factor.map(qpoints, energies, sigma=0.1)
+    assert intensity.shape == (5, 3001)
+    _, intensities = structure_factor.intensities(qpoints)
+    assert np.allclose(
+        np.trapezoid(intensity, energies, axis=1), intensities.sum(axis=1)
+    )
+    resolution = structure_factor.map(
+        qpoints, energies, sigma=lambda omegas: 0.05 + 0.01 * omegas
+    )
+    assert np.allclose(
+        np.trapezoid(resolution, energies, axis=1), intensities.sum(axis=1)
+    )
+
+
+def test_intensities_chunks():
+    structure_factor = StructureFactor(MagnonDispersion(antiferromagnetic_chain()))
+    qpoints = np.random.default_rng(5).normal(size=(11, 3))
+    omegas, intensities = structure_factor.intensities(qpoints)
+    chunks = list(structure_factor.intensities_chunks(qpoints, chunk_size=4))
+    assert [start for start, _, _ in chunks] == [0, 4, 8]
+    assert np.allclose(np.concatenate([chunk[1] for chunk in chunks]), omegas)
+    assert np.allclose(np.concatenate([chunk[2] for chunk in chunks]), intensities)
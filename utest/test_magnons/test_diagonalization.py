@@ -1,7 +1,11 @@
 import pytest
 import numpy as np
 
-from radtools.magnons.diagonalization import solve_via_colpa, ColpaFailed
+from radtools.magnons.diagonalization import (
+    solve_via_colpa,
+    solve_via_colpa_stack,
+    ColpaFailed,
+)
 
 from hypothesis import given, strategies as st
 from hypothesis.extra.numpy import arrays as harrays
@@ -17,9 +21,10 @@ from hypothesis.extra.numpy import arrays as harrays
         ([[2, 0.1, 1, 0], [0.1, 2, 0, 1], [1, 0, 2, 0.1], [0, 1, 0.1, 2]]),
     ],
 )
-def test_solve_via_colpa(D):
+@pytest.mark.parametrize("method", ["eig", "eigh"])
+def test_solve_via_colpa(D, method):
     N = len(D) // 2
-    E, G = solve_via_colpa(D)
+    E, G = solve_via_colpa(D, method=method)
     assert np.allclose(
         np.diag(E), np.linalg.inv(np.conjugate(G).T) @ D @ np.linalg.inv(G), rtol=1e-5
     )
@@ -38,6 +43,36 @@ def test_solve_via_colpa(D):
 
 
 @pytest.mark.parametrize("D", [[[1, 0], [0, 0]], [[1, -1], [-1, -1]]])
-def test_fail_via_colpa(D):
+@pytest.mark.parametrize("method", ["eig", "eigh"])
+def test_fail_via_colpa(D, method):
     with pytest.raises(ColpaFailed):
-        solve_via_colpa(D)
+        solve_via_colpa(D, method=method)
+
+
+def test_solve_via_colpa_wrong_method():
+    with pytest.raises(ValueError):
+        solve_via_colpa(np.eye(2), method="qr")
+
+
+def test_solve_via_colpa_stack():
+    D = np.array(
+        [
+            [[2, 0.1, 1, 0], [0.1, 2, 0, 1], [1, 0, 2, 0.1], [0, 1, 0.1, 2]],
+            [[1, 0, 0, 0], [0, 0, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]],
+            np.diag([1, 2, 2, 1]),
+        ]
+    )
+    E, G, success = solve_via_colpa_stack(D)
+    assert (success == [True, False, True]).all()
+    assert np.isnan(E[1]).all() and np.isnan(G[1]).all()
+    for i in [0, 2]:
+        assert np.allclose(E[i], solve_via_colpa(D[i])[0])
+        assert np.allclose(
+            np.diag(E[i]),
+            np.linalg.inv(np.conjugate(G[i]).T) @ D[i] @ np.linalg.inv(G[i]),
+        )
+
+    E_only, G_only, success_only = solve_via_colpa_stack(D, only_energies=True)
+    assert G_only is None
+    assert (success_only == success).all()
+    assert np.allclose(E_only[success], E[success])
@@ -0,0 +1,68 @@
+import pytest
+
+import numpy as np
+
+from radtools.crystal.atom import Atom
+from radtools.magnons.dispersion import MagnonDispersion
+from radtools.magnons.ensemble import MagnonEnsemble
+from radtools.magnons.kernel import MagnonKernel
+from radtools.spinham.hamiltonian import SpinHamiltonian
+
+
+def antiferromagnet(J1=1, J2=0.1):
+    model = SpinHamiltonian(notation="SpinW")
+    model.cell = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+    Cr1 = Atom("Cr1", (0, 0, 0), spin=[0, 0, 1.5])
+    Cr2 = Atom("Cr2", (0.5, 0.5, 0), spin=[0, 0, -1])
+    for R in [(0, 0, 0), (-1, 0, 0), (0, -1, 0), (-1, -1, 0)]:
+        model.add_bond(Cr1, Cr2, R, iso=J1, dmi=(0, 0, 0.1))
+        model.add_bond(Cr2, Cr1, tuple(-np.array(R)), iso=J1, dmi=(0, 0, -0.1))
+    for R in [(0, 0, 1), (0, 0, -1)]:
+        model.add_bond(Cr1, Cr1, R, iso=J2, aniso=np.diag([0, 0, -0.03]))
+        model.add_bond(Cr2, Cr2, R, iso=J2)
+    return model
+
+
+@pytest.mark.parametrize("Q", [None, (0.1, 0, 0)])
+def test_omegas(Q):
+    kernel = MagnonKernel.from_spinham(antiferromagnet())
+    rng = np.random.default_rng(0)
+    J = kernel.J[None] * (1 + 0.05 * rng.standard_normal((7, len(kernel), 1, 1)))
+    kpoints = rng.random((30, 3)) * 3
+
+    omegas = MagnonEnsemble(kernel, J, Q=Q).omegas(kpoints)
+    assert omegas.shape == (7, 30, 2)
+    for s_i in range(7):
+        sample = MagnonKernel(
+            kernel.cell, J[s_i], kernel.i, kernel.j, kernel.d, kernel.spins
+        )
+        expected = MagnonDispersion(sample, Q=Q).omegas(kpoints).T
+        assert np.allclose(omegas[s_i], np.sort(expected, axis=1))
+
+
+def test_from_models():
+    models = [antiferromagnet(J1, J2) for J1, J2 in [(1, 0.1), (1.1, 0.2), (0.9, 0)]]
+    ensemble = MagnonEnsemble.from_models(models)
+    assert ensemble.n_samples == 3
+
+    kpoints = np.random.default_rng(1).random((10, 3))
+    omegas = ensemble.omegas(kpoints)
+    for s_i, model in enumerate(models):
+        expected = MagnonDispersion(model).omegas(kpoints).T
+        assert np.allclose(omegas[s_i], np.sort(expected, axis=1))
+
+    bands = ensemble.bands(kpoints, percentiles=(0, 50, 100))
+    assert bands.shape == (3, 10, 2)
+    assert np.allclose(bands[0], omegas.min(axis=0))
+    assert np.allclose(bands[2], omegas.max(axis=0))
+
+    different = antiferromagnet()
+    different.remove_bond("Cr1", "Cr1", (0, 0, 1))
+    with pytest.raises(ValueError):
+        MagnonEnsemble.from_models(models + [different])
+
+
+def test_wrong_shape():
+    kernel = MagnonKernel.from_spinham(antiferromagnet())
+    with pytest.raises(ValueError):
+        MagnonEnsemble(kernel, kernel.J)
@@ -0,0 +1,129 @@
+import pytest
+
+import numpy as np
+
+from radtools.crystal.atom import Atom
+from radtools.magnons.dispersion import MagnonDispersion
+from radtools.magnons.fitting import ExchangeFit
+from radtools.spinham.hamiltonian import SpinHamiltonian
+from radtools.spinham.template import ExchangeTemplate
+
+
+def antiferromagnet():
+    model = SpinHamiltonian(notation="SpinW")
+    model.cell = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+    Cr1 = Atom("Cr1", (0, 0, 0), spin=[0, 0, 1.5])
+    Cr2 = Atom("Cr2", (0.5, 0.5, 0), spin=[0, 0, -1])
+    template = ExchangeTemplate()
+    template.names = {"J1": [], "J2": []}
+    for R in [(0, 0, 0), (-1, 0, 0), (0, -1, 0), (-1, -1, 0)]:
+        model.add_bond(Cr1, Cr2, R, iso=1, dmi=(0, 0, 0.1))
+        model.add_bond(Cr2, Cr1, tuple(-np.array(R)), iso=1, dmi=(0, 0, -0.1))
+        template.names["J1"].append(("Cr1", "Cr2", R))
+        template.names["J1"].append(("Cr2", "Cr1", tuple(-np.array(R))))
+    for R in [(0, 0, 1), (0, 0, -1)]:
+        model.add_bond(Cr1, Cr1, R, iso=0.1, aniso=np.diag([0, 0, -0.03]))
+        model.add_bond(Cr2, Cr2, R, iso=0.1)
+        template.names["J2"].append(("Cr1", "Cr1", R))
+        template.names["J2"].append(("Cr2", "Cr2", R))
+    return model, template
+
+
+def test_initial():
+    model, template = antiferromagnet()
+    fit = ExchangeFit(model, template, np.zeros((1, 3)), [1], dmi=True)
+    # Group J2 has no DMI
+    assert fit.names == ["J1", "J1_dmi", "J2"]
+    assert np.allclose(fit.initial, [1, 0.1, 0.095])
+
+
+def test_jacobian():
+    model, template = antiferromagnet()
+    kpoints = np.random.default_rng(1).random((20, 3)) * 3
+    fit = ExchangeFit(model, template, kpoints, np.ones(20), errors=0.5, dmi=True)
+
+    parameters = fit.initial + 0.02
+    jacobian = fit.jacobian(parameters)
+    for p_i in range(len(parameters)):
+        step = np.zeros(len(parameters))
+        step[p_i] = 1e-6
+        derivative = (
+            fit.residuals(parameters + step) - fit.residuals(parameters - step)
+        ) / 2e-6
+        assert np.allclose(jacobian[:, p_i], derivative, atol=1e-6)
+
+
+@pytest.mark.parametrize("with_modes", [True, False])
+def test_fit(with_modes):
+    model, template = antiferromagnet()
+    kpoints = np.random.default_rng(2).random((200, 3)) * 2 * np.pi
+    fit = ExchangeFit(model, template, kpoints, np.ones(200), dmi=True)
+
+    true = fit.initial * [1.2, 0.8, 1.5]
+    omegas = np.sort(MagnonDispersion(fit.model(true)).omegas(kpoints).T, axis=1)
+    modes = np.tile([0, 1], len(kpoints))
+    fit = ExchangeFit(
+        model,
+        template,
+        np.repeat(kpoints, 2, axis=0),
+        omegas.reshape(-1),
+        modes=modes if with_modes else None,
+        dmi=True,
+    )
+    parameters, uncertainties = fit.fit()
+    assert np.allclose(parameters, true, atol=1e-6)
+    assert uncertainties.shape == (3,)
+    assert np.allclose(fit.residuals(parameters), 0, atol=1e-6)
+
+    # Fitted model is a new instance
+    fitted = fit.model(parameters)
+    assert fitted is not model
+    assert np.allclose(model["Cr1", "Cr2", (0, 0, 0)].iso, 1)
+    assert np.allclose(fitted["Cr1", "Cr2", (0, 0, 0)].iso, true[0])
+    assert np.allclose(fitted["Cr1", "Cr2", (0, 0, 0)].dmi, (0, 0, true[1]))
+    assert np.allclose(
+        fitted["Cr1", "Cr1", (0, 0, 1)].aniso, np.diag([0.01, 0.01, -0.02])
+    )
+
+
+def test_one_direction():
+    model, _ = antiferromagnet()
+    # Reversed bonds are not listed
+    template = ExchangeTemplate()
+    template.names = {
+        "J1": [("Cr1", "Cr2", R) for R in [(0, 0, 0), (-1, 0, 0), (0, -1, 0)]]
+        + [("Cr1", "Cr2", (-1, -1, 0))],
+        "J2": [("Cr1", "Cr1", (0, 0, 1)), ("Cr2", "Cr2", (0, 0, 1))],
+    }
+    kpoints = np.random.default_rng(3).random((100, 3)) * 2 * np.pi
+    fit = ExchangeFit(model, template, kpoints, np.ones(100), dmi=True)
+    assert np.allclose(fit.initial, [1, 0.1, 0.095])
+
+    true = fit.initial * [1.2, 0.8, 1.5]
+    truth = fit.model(true)
+    for atom1, atom2, R, J in truth:
+        assert np.allclose(truth[atom2, atom1, tuple(-np.array(R))].matrix, J.matrix.T)
+    omegas = np.sort(MagnonDispersion(truth).omegas(kpoints).T, axis=1)
+
+    fit = ExchangeFit(
+        model,
+        template,
+        np.repeat(kpoints, 2, axis=0),
+        omegas.reshape(-1),
+        modes=np.tile([0, 1], len(kpoints)),
+        dmi=True,
+    )
+    parameters, _ = fit.fit()
+    assert np.allclose(parameters, true, atol=1e-6)
+    fitted = fit.model(parameters)
+    assert np.allclose(fitted["Cr2", "Cr1", (0, 0, 0)].iso, true[0])
+    assert np.allclose(fitted["Cr2", "Cr1", (0, 0, 0)].dmi, (0, 0, -true[1]))
+    assert np.allclose(fitted["Cr1", "Cr1", (0, 0, -1)].iso, true[2])
+
+
+def test_wrong_input():
+    model, template = antiferromagnet()
+    with pytest.raises(TypeError):
+        ExchangeFit(model, template.names, np.zeros((1, 3)), [1])
+    with pytest.raises(ValueError):
+        ExchangeFit(model, template, np.zeros((2, 3)), [1])
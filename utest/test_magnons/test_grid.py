@@ -0,0 +1,86 @@
+import pytest
+
+import numpy as np
+
+from radtools.constants import K_BOLTZMANN
+from radtools.crystal.atom import Atom
+from radtools.crystal.bravais_lattice import lattice_example
+from radtools.magnons.dispersion import MagnonDispersion
+from radtools.magnons.grid import MagnonGrid
+from radtools.spinham.hamiltonian import SpinHamiltonian
+
+
+def ferromagnet():
+    model = SpinHamiltonian(lattice=lattice_example("CUB"), notation="standard")
+    model.add_atom(Atom("Fe", (0, 0, 0), spin=[0, 0, 1]))
+    model.add_bond("Fe", "Fe", (1, 0, 0), iso=1)
+    model.add_bond("Fe", "Fe", (0, 1, 0), iso=1)
+    model.add_bond("Fe", "Fe", (0, 0, 1), iso=1)
+    return model
+
+
+def test_grid():
+    grid = MagnonGrid(MagnonDispersion(ferromagnet()), 4, 5, 6)
+    assert grid.kpoints.shape == (120, 3)
+    assert grid.omegas.shape == (120, 1)
+    assert np.allclose(grid.weights.sum(), 1)
+    assert np.allclose(grid.omegas[0], 0)
+    assert grid.omegas.max() <= 24
+
+
+def test_irreducible_grid():
+    # Antiferromagnet on the bcc lattice
+    model = SpinHamiltonian(lattice=lattice_example("CUB"), notation="standard")
+    model.add_atom(Atom("Fe", (0, 0, 0), spin=[0, 0, 1], index=1))
+    model.add_atom(Atom("Fe", (0.5, 0.5, 0.5), spin=[0, 0, -1], index=2))
+    for R in np.indices((2, 2, 2)).reshape((3, -1)).T:
+        model.add_bond("Fe__1", "Fe__2", tuple(-R), iso=-1)
+    for R in [(1, 0, 0), (0, 1, 0), (0, 0, 1)]:
+        model.add_bond("Fe__1", "Fe__1", R, iso=0.2)
+        model.add_bond("Fe__2", "Fe__2", R, iso=0.2)
+    dispersion = MagnonDispersion(model)
+
+    full = MagnonGrid(dispersion, 6, 6, 6)
+    reduced = MagnonGrid(dispersion, 6, 6, 6, crystal=model)
+    assert reduced.n_irreducible < full.n_irreducible
+    assert np.allclose(full.omegas, reduced.omegas)
+
+
+@pytest.mark.parametrize("method", ["gaussian", "tetrahedron"])
+def test_dos_normalization(method):
+    grid = MagnonGrid(MagnonDispersion(ferromagnet()), 8, 8, 8)
+    energies = np.linspace(-2, 26, 2001)
+    dos = grid.dos(energies, method=method)
+    assert (dos >= 0).all()
+    assert np.allclose(np.trapezoid(dos, energies), 1, rtol=1e-3)
+
+
+def test_dos_wrong_method():
+    grid = MagnonGrid(MagnonDispersion(ferromagnet()), 2, 2, 2)
+    with pytest.raises(ValueError):
+        grid.dos([0, 1], method="histogram")
+
+
+def test_thermodynamics():
+    grid = MagnonGrid(MagnonDispersion(ferromagnet()), 6, 6, 6)
+    temperatures = np.array([5, 20, 100])
+
+    factors = grid.bose_factors(temperatures)
+    assert factors.shape == (3, 216, 1)
+    # Goldstone mode is not occupied
+    assert np.allclose(factors[:, 0], 0)
+    omega = grid.omegas[1, 0]
+    assert np.allclose(
+        factors[:, 1, 0], 1 / (np.exp(omega / K_BOLTZMANN / temperatures) - 1)
+    )
+
+    assert np.allclose(grid.magnon_number(temperatures), factors.sum(axis=(1, 2)) / 216)
+
+    step = 1e-3
+    derivative = (
+        grid.energy(temperatures + step) - grid.energy(temperatures - step)
+    ) / (2 * step)
+    assert np.allclose(grid.specific_heat(temperatures), derivative)
+
+    with pytest.raises(ValueError):
+        grid.bose_factors([0])
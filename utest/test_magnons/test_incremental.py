@@ -0,0 +1,72 @@
+import pytest
+
+import numpy as np
+
+from radtools.crystal.atom import Atom
+from radtools.magnons.dispersion import MagnonDispersion
+from radtools.magnons.incremental import IncrementalDispersion
+from radtools.spinham.hamiltonian import SpinHamiltonian
+
+
+def model():
+    model = SpinHamiltonian(notation="SpinW")
+    model.cell = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+    Cr1 = Atom("Cr1", (0, 0, 0), spin=[0, 0, 1.5])
+    Cr2 = Atom("Cr2", (0.5, 0.5, 0), spin=[0, 0, -1])
+    for R in [(0, 0, 0), (-1, 0, 0), (0, -1, 0), (-1, -1, 0)]:
+        model.add_bond(Cr1, Cr2, R, iso=1, dmi=(0, 0, 0.1))
+        model.add_bond(Cr2, Cr1, tuple(-np.array(R)), iso=1, dmi=(0, 0, -0.1))
+    model.add_bond(Cr1, Cr1, (0, 0, 0), aniso=np.diag([0, 0, -0.1]))
+    return model
+
+
+@pytest.mark.parametrize("Q", [None, (0.1, 0, 0)])
+def test_updates(Q):
+    dispersion = MagnonDispersion(model(), Q=Q)
+    kpoints = np.random.default_rng(0).random((50, 3)) * 3
+    incremental = IncrementalDispersion(dispersion, kpoints)
+    assert len(incremental) == 9
+    assert np.allclose(incremental.omegas(), dispersion.omegas(kpoints))
+
+    incremental.add_bond(0, 0, (0, 0, 1), np.diag([0.2, 0.2, 0.3]))
+    assert (0, 0, (0, 0, -1)) in incremental
+    incremental.add_bond(1, 1, (0, 0, 0), np.diag([0, 0, -0.05]))
+    incremental.update_bond(0, 1, (0, 0, 0), np.eye(3) * 1.2)
+    incremental.remove_bond(1, 0, (1, 0, 0))
+    assert (0, 1, (-1, 0, 0)) not in incremental
+    assert len(incremental) == 10
+
+    reference = MagnonDispersion(incremental.kernel, Q=Q)
+    assert np.allclose(incremental.h(), reference.h(kpoints))
+    assert np.allclose(incremental.omegas(), reference.omegas(kpoints))
+
+    # Initial dispersion is not modified
+    assert np.allclose(
+        IncrementalDispersion(dispersion, kpoints).h(), dispersion.h(kpoints)
+    )
+
+
+def test_replace_bond():
+    dispersion = MagnonDispersion(model())
+    kpoints = np.random.default_rng(1).random((20, 3)) * 3
+    incremental = IncrementalDispersion(dispersion, kpoints)
+    J = np.array([[0.5, 0.2, 0], [-0.2, 0.5, 0], [0, 0, 0.7]])
+    incremental.add_bond(0, 1, (0, 0, 0), J)
+    assert len(incremental) == 9
+
+    h = incremental.h()
+    assert np.allclose(h, np.conjugate(np.transpose(h, (0, 2, 1))))
+    assert np.allclose(h, MagnonDispersion(incremental.kernel).h(kpoints))
+
+    incremental.update_bond(1, 0, (0, 0, 0), J.T)
+    assert np.allclose(incremental.h(), h)
+
+
+def test_errors():
+    incremental = IncrementalDispersion(MagnonDispersion(model()), np.zeros((1, 3)))
+    with pytest.raises(KeyError):
+        incremental.remove_bond(0, 0, (1, 0, 0))
+    with pytest.raises(KeyError):
+        incremental.update_bond(0, 0, (1, 0, 0), np.eye(3))
+    with pytest.raises(ValueError):
+        incremental.add_bond(0, 2, (1, 0, 0), np.eye(3))
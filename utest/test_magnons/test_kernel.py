@@ -0,0 +1,111 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from radtools.crystal.atom import Atom
+from radtools.crystal.bravais_lattice import lattice_example
+from radtools.magnons.dispersion import MagnonDispersion
+from radtools.magnons.kernel import MagnonKernel
+from radtools.spinham.hamiltonian import SpinHamiltonian
+
+
+def prepare_model(notation):
+    model = SpinHamiltonian(lattice=lattice_example("TET"))
+    model.add_atom(Atom("Fe", (0, 0, 0), spin=[0, 0, 2], index=1))
+    model.add_atom(Atom("Ni", (0.5, 0.5, 0.5), spin=[0, 1, 1], index=2))
+    model.notation = notation
+    model.add_bond("Fe", "Ni", (0, 0, 0), iso=1, dmi=(0.1, 0, 0.2))
+    model.add_bond("Fe", "Fe", (1, 0, 0), iso=-2, aniso=np.diag([0.1, 0.1, -0.2]))
+    model.add_bond("Ni", "Ni", (0, 0, 1), iso=0.5)
+    model.add_bond("Fe", "Fe", (0, 0, 0), aniso=np.diag([0, 0, -0.1]))
+    return model
+
+
+@pytest.mark.parametrize("notation", ["standard", "TB2J", "SpinW", "vampire"])
+def test_from_spinham(notation):
+    model = prepare_model(notation)
+    kernel = MagnonKernel.from_spinham(model)
+
+    assert model.notation == prepare_model(notation).notation
+    assert len(model) == len(prepare_model(notation))
+
+    model.notation = "SpinW"
+    assert kernel.N == 2
+    assert len(kernel) == len(model)
+    for J, i, j, d in zip(kernel.J, kernel.i, kernel.j, kernel.d):
+        atom1 = model.magnetic_atoms[i]
+        atom2 = model.magnetic_atoms[j]
+        R = tuple(np.rint(d @ np.linalg.inv(model.cell)).astype(int).tolist())
+        assert np.allclose(J, model[atom1, atom2, R].matrix)
+
+
+def test_from_spinham_without_notation():
+    model = SpinHamiltonian(lattice=lattice_example("TET"))
+    model.add_atom(Atom("Fe", (0, 0, 0), spin=[0, 0, 2], index=1))
+    model.add_atom(Atom("Ni", (0.5, 0.5, 0.5), spin=[0, 0, 1], index=2))
+    model.add_bond("Fe", "Ni", (0, 0, 0), iso=-1, dmi=(0, 0, 0.2))
+    model.add_bond("Fe", "Fe", (1, 0, 0), iso=-2, aniso=np.diag([0.1, 0.1, -0.2]))
+    model.add_bond("Ni", "Ni", (0, 0, 1), iso=-0.5)
+    kernel = MagnonKernel.from_spinham(model)
+    assert len(model) == 3
+
+    # Missing bonds are added, but parameters are not scaled
+    model.notation = "SpinW"
+    assert len(kernel) == len(model) == 6
+    for J, i, j, d in zip(kernel.J, kernel.i, kernel.j, kernel.d):
+        atom1 = model.magnetic_atoms[i]
+        atom2 = model.magnetic_atoms[j]
+        R = tuple(np.rint(d @ np.linalg.inv(model.cell)).astype(int).tolist())
+        assert np.allclose(J, model[atom1, atom2, R].matrix)
+    omegas = MagnonDispersion(kernel)(np.array([[0.1, 0.2, 0.3]]))
+    assert not np.allclose(omegas, 0)
+    assert np.allclose(omegas, MagnonDispersion(model)(np.array([[0.1, 0.2, 0.3]])))
+
+
+def test_masks():
+    model = prepare_model("SpinW")
+    kernel = MagnonKernel.from_spinham(model, nodmi=True, noaniso=True)
+    for J in kernel.J:
+        assert np.allclose(J, np.trace(J) / 3 * np.identity(3))
+    kernel = MagnonKernel.from_spinham(model, custom_mask=lambda x: 2 * x)
+    assert np.allclose(kernel.J, 2 * MagnonKernel.from_spinham(model).J)
+    # Model is not modified by the masks
+    assert np.allclose(model["Fe__1", "Ni__2", (0, 0, 0)].dmi, [0.1, 0, 0.2])
+
+    with pytest.raises(ValueError):
+        MagnonDispersion(kernel, nodmi=True)
+
+
+def test_immutable_and_picklable():
+    kernel = MagnonKernel.from_spinham(prepare_model("SpinW"))
+    with pytest.raises(AttributeError):
+        kernel.J = np.zeros((1, 3, 3))
+    with pytest.raises(ValueError):
+        kernel.J[0, 0, 0] = 1
+
+    restored = pickle.loads(pickle.dumps(kernel))
+    for name in ["cell", "J", "i", "j", "d", "spins", "positions", "u", "v"]:
+        assert np.allclose(getattr(kernel, name), getattr(restored, name))
+    assert not restored.J.flags.writeable
+
+
+def test_dispersion_from_kernel():
+    model = prepare_model("TB2J")
+    kpoints = np.linspace([0, 0, 0], [1, 2, 3], 10)
+    kernel = MagnonKernel.from_spinham(model)
+    assert np.allclose(
+        MagnonDispersion(model, Q=(0, 0, 0.1)).omegas(kpoints),
+        MagnonDispersion(kernel, Q=(0, 0, 0.1)).omegas(kpoints),
+    )
+
+
+def test_wrong_input():
+    with pytest.raises(ValueError):
+        MagnonKernel(
+            np.eye(3), np.zeros((2, 3, 3)), [0, 0], [0], np.zeros((2, 3)), [[0, 0, 1]]
+        )
+    with pytest.raises(ValueError):
+        MagnonKernel(
+            np.eye(3), np.zeros((1, 3, 3)), [0], [1], np.zeros((1, 3)), [[0, 0, 1]]
+        )
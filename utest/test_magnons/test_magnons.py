@@ -40,3 +40,122 @@ def test_ferromagnetic():
         )
 
     assert np.allclose(computed_omegas, analytical_omegas)
+
+
+def test_batched_matrices():
+    model = SpinHamiltonian(lattice=lattice_example("ORC"), notation="SpinW")
+    model.add_atom(Atom("Fe", (0, 0, 0), spin=[0, 0, 1.5], index=1))
+    model.add_atom(Atom("Cr", (0.5, 0.5, 0), spin=[1, 0, 1], index=2))
+    model.add_bond("Fe", "Cr", (0, 0, 0), iso=1, dmi=(0, 0, 0.1))
+    model.add_bond("Cr", "Fe", (0, 0, 0), iso=1, dmi=(0, 0, -0.1))
+    model.add_bond("Fe", "Fe", (1, 0, 0), iso=-0.5, aniso=np.diag([0.1, 0, -0.1]))
+    model.add_bond("Fe", "Fe", (-1, 0, 0), iso=-0.5, aniso=np.diag([0.1, 0, -0.1]))
+    model.add_bond("Cr", "Fe", (0, 1, 0), iso=0.3)
+
+    dispersion = MagnonDispersion(model, Q=(0.1, 0, 0))
+    kpoints = np.linspace([0, 0, 0], [1, 2, 3], 7)
+
+    for name in ["J", "A", "B", "h"]:
+        function = getattr(dispersion, name)
+        assert np.allclose(function(kpoints), [function(k) for k in kpoints])
+    assert np.allclose(
+        dispersion.omegas(kpoints), np.array([dispersion.omega(k) for k in kpoints]).T
+    )
+
+    dispersion_eigh = MagnonDispersion(model, Q=(0.1, 0, 0), colpa_method="eigh")
+    assert np.allclose(dispersion.omegas(kpoints), dispersion_eigh.omegas(kpoints))
+
+
+def test_parallel_omegas():
+    model = SpinHamiltonian(lattice=lattice_example("CUB"), notation="SpinW")
+    model.add_atom(Atom("Fe", (0, 0, 0), spin=[0, 0, 1], index=1))
+    model.add_atom(Atom("Fe", (0.5, 0.5, 0.5), spin=[0, 0, -1], index=2))
+    model.add_bond("Fe__1", "Fe__2", (0, 0, 0), iso=1)
+    model.add_bond("Fe__2", "Fe__1", (0, 0, 0), iso=1)
+    model.add_bond("Fe__1", "Fe__1", (1, 0, 0), iso=-0.1)
+    model.add_bond("Fe__1", "Fe__1", (-1, 0, 0), iso=-0.1)
+
+    dispersion = MagnonDispersion(model)
+    kpoints = np.linspace([0, 0, 0], [1, 2, 3], 13)
+    assert np.allclose(
+        dispersion.omegas(kpoints), dispersion.omegas(kpoints, n_workers=2)
+    )
+
+
+def test_omegas_chunks():
+    model = SpinHamiltonian(lattice=lattice_example("CUB"), notation="SpinW")
+    model.add_atom(Atom("Fe", (0, 0, 0), spin=[0, 0, 1], index=1))
+    model.add_atom(Atom("Fe", (0.5, 0.5, 0.5), spin=[0, 0, -1], index=2))
+    model.add_bond("Fe__1", "Fe__2", (0, 0, 0), iso=1)
+    model.add_bond("Fe__2", "Fe__1", (0, 0, 0), iso=1)
+    model.add_bond("Fe__1", "Fe__1", (1, 0, 0), iso=-0.1)
+    model.add_bond("Fe__1", "Fe__1", (-1, 0, 0), iso=-0.1)
+
+    dispersion = MagnonDispersion(model)
+    kpoints = np.linspace([0, 0, 0], [1, 2, 3], 13)
+    chunks = list(dispersion.omegas_chunks(kpoints, chunk_size=5))
+    assert [start for start, _ in chunks] == [0, 5, 10]
+    assert np.allclose(
+        np.concatenate([omegas for _, omegas in chunks]), dispersion.omegas(kpoints).T
+    )
+
+
+def test_modes():
+    model = SpinHamiltonian(lattice=lattice_example("CUB"), notation="SpinW")
+    model.add_atom(Atom("Fe", (0, 0, 0), spin=[0, 0, 1], index=1))
+    model.add_atom(Atom("Fe", (0.5, 0.5, 0.5), spin=[0, 0, -1], index=2))
+    model.add_bond("Fe__1", "Fe__2", (0, 0, 0), iso=1)
+    model.add_bond("Fe__2", "Fe__1", (0, 0, 0), iso=1)
+    model.add_bond("Fe__1", "Fe__1", (1, 0, 0), iso=-0.1)
+    model.add_bond("Fe__1", "Fe__1", (-1, 0, 0), iso=-0.1)
+
+    dispersion = MagnonDispersion(model)
+    kpoints = np.linspace([0.1, 0, 0], [1, 2, 3], 5)
+    E, G = dispersion.modes(kpoints)
+    assert np.allclose(E[:, :2], dispersion.omegas(kpoints).T)
+    G_inv = np.linalg.inv(G)
+    assert np.allclose(
+        np.conjugate(np.transpose(G_inv, (0, 2, 1))) @ dispersion.h(kpoints) @ G_inv,
+        np.einsum("mi,ij->mij", E, np.eye(4)),
+    )
+
+
+def test_sparse():
+    model = SpinHamiltonian(lattice=lattice_example("ORC"), notation="SpinW")
+    model.add_atom(Atom("Fe", (0, 0, 0), spin=[0, 0, 1.5], index=1))
+    model.add_atom(Atom("Cr", (0.5, 0.5, 0), spin=[1, 0, 1], index=2))
+    model.add_bond("Fe", "Cr", (0, 0, 0), iso=1, dmi=(0, 0, 0.1))
+    model.add_bond("Cr", "Fe", (0, 0, 0), iso=1, dmi=(0, 0, -0.1))
+    model.add_bond("Fe", "Fe", (1, 0, 0), iso=-0.5, aniso=np.diag([0.1, 0, -0.1]))
+    dispersion = MagnonDispersion(model, Q=(0.1, 0, 0))
+    for k in np.linspace([0, 0, 0], [1, 2, 3], 4):
+        assert np.allclose(dispersion.h_sparse(k).toarray(), dispersion.h(k))
+
+
+def test_lowest_omegas():
+    # Ferromagnetic chain of 12 spins with random exchange and easy axis
+    rng = np.random.default_rng(7)
+    model = SpinHamiltonian(lattice=lattice_example("CUB"), notation="SpinW")
+    atoms = []
+    for a_i in range(12):
+        atom = Atom("Fe", (a_i / 12, 0, 0), spin=[0, 0, 1], index=a_i + 1)
+        model.add_atom(atom)
+        atoms.append(atom)
+    for a_i in range(12):
+        J = -0.5 - rng.random()
+        R = (1, 0, 0) if a_i == 11 else (0, 0, 0)
+        aniso = np.diag([0, 0, -0.1])
+        model.add_bond(atoms[a_i], atoms[(a_i + 1) % 12], R, iso=J, aniso=aniso)
+        model.add_bond(
+            atoms[(a_i + 1) % 12], atoms[a_i], tuple(-np.array(R)), iso=J, aniso=aniso
+        )
+
+    dispersion = MagnonDispersion(model)
+    kpoints = np.linspace([0, 0, 0], [0.5, 0.2, 0.1], 3)
+    lowest = dispersion.lowest_omegas(kpoints, n_modes=4)
+    assert lowest.shape == (4, 3)
+    assert np.allclose(
+        lowest, np.sort(dispersion.omegas(kpoints), axis=0)[:4], atol=1e-6
+    )
+    with pytest.raises(ValueError):
+        dispersion.lowest_omegas(kpoints, n_modes=12)
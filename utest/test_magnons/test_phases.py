@@ -0,0 +1,58 @@
+import pytest
+
+import numpy as np
+
+from radtools.crystal.atom import Atom
+from radtools.crystal.bravais_lattice import lattice_example
+from radtools.magnons.dispersion import MagnonDispersion
+from radtools.magnons.phases import PhaseCache
+from radtools.spinham.hamiltonian import SpinHamiltonian
+
+
+def test_phase_cache():
+    cache = PhaseCache()
+    kpoints = np.linspace([0, 0, 0], [1, 2, 3], 10)
+    vectors = np.array([[1, 0, 0], [0, 1, 0], [1, 1, 1]])
+    phases = cache(kpoints, vectors)
+    assert np.allclose(phases, np.exp(-1j * kpoints @ vectors.T))
+    assert cache(kpoints.copy(), vectors.copy()) is phases
+    with pytest.raises(ValueError):
+        phases[0, 0] = 0
+    assert cache(kpoints, vectors[:2]) is not phases
+    assert len(cache) == 2
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.memory == 0
+
+
+def test_phase_cache_lru():
+    kpoints = np.zeros((1024, 3))
+    # Each table is 1024 * 64 * 16 bytes = 1 Mb
+    cache = PhaseCache(max_memory=2.5)
+    tables = []
+    for i in range(3):
+        vectors = np.full((64, 3), i)
+        tables.append(cache(kpoints, vectors))
+        assert np.isclose(cache.memory, min(i + 1, 2))
+    assert len(cache) == 2
+    assert cache(kpoints, np.full((64, 3), 2)) is tables[2]
+    assert cache(kpoints, np.full((64, 3), 0)) is not tables[0]
+    # Does not fit into the cache
+    cache(np.zeros((4096, 3)), np.zeros((64, 3)))
+    assert len(cache) == 2
+
+
+def test_dispersion_with_phase_cache():
+    cache = PhaseCache()
+    kpoints = np.linspace([0, 0, 0], [1, 2, 3], 10)
+    omegas = []
+    for scale in [1, 2]:
+        model = SpinHamiltonian(lattice=lattice_example("CUB"), notation="SpinW")
+        model.add_atom(Atom("Fe", (0, 0, 0), spin=[0, 0, 1]))
+        model.add_bond("Fe", "Fe", (1, 0, 0), iso=-scale)
+        model.add_bond("Fe", "Fe", (0, 1, 0), iso=-scale)
+        reference = MagnonDispersion(model).omegas(kpoints)
+        omegas.append(MagnonDispersion(model, phase_cache=cache).omegas(kpoints))
+        assert np.allclose(omegas[-1], reference)
+    assert len(cache) == 1
+    assert np.allclose(2 * omegas[0], omegas[1])
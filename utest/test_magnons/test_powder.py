@@ -0,0 +1,55 @@
+import pytest
+
+import numpy as np
+
+from radtools.crystal.atom import Atom
+from radtools.crystal.bravais_lattice import lattice_example
+from radtools.geometry import fibonacci_sphere
+from radtools.magnons.correlations import StructureFactor
+from radtools.magnons.dispersion import MagnonDispersion
+from radtools.magnons.powder import powder_average
+from radtools.spinham.hamiltonian import SpinHamiltonian
+
+
+def structure_factor():
+    model = SpinHamiltonian(lattice=lattice_example("CUB"), notation="standard")
+    model.add_atom(Atom("Fe", (0, 0, 0), spin=[0, 0, 1]))
+    model.add_bond("Fe", "Fe", (1, 0, 0), iso=1)
+    model.add_bond("Fe", "Fe", (0, 1, 0), iso=1)
+    model.add_bond("Fe", "Fe", (0, 0, 1), iso=1)
+    return StructureFactor(MagnonDispersion(model))
+
+
+def test_histogram():
+    q_norms = np.linspace(0.2, 4, 20)
+    energies = np.linspace(-1, 30, 311)
+    intensity = powder_average(structure_factor(), q_norms, energies, n_directions=300)
+    assert intensity.shape == (20, 310)
+
+    # Total intensity of each shell is the average over the directions
+    qpoints = (q_norms[:, None, None] * fibonacci_sphere(300)[None]).reshape((-1, 3))
+    _, reference = structure_factor().intensities(qpoints)
+    reference = reference.reshape((20, 300)).mean(axis=1)
+    assert np.allclose((intensity * np.diff(energies)).sum(axis=1), reference)
+
+
+def test_batches_and_broadening(monkeypatch):
+    q_norms = np.linspace(0.2, 4, 7)
+    energies = np.linspace(-1, 30, 621)
+    reference = powder_average(structure_factor(), q_norms, energies, n_directions=50)
+
+    # Shells are split in several batches
+    monkeypatch.setattr("radtools.magnons.powder._CHUNK_SIZE", 100)
+    assert np.allclose(
+        powder_average(structure_factor(), q_norms, energies, n_directions=50),
+        reference,
+    )
+
+    broadened = powder_average(
+        structure_factor(), q_norms, energies, n_directions=50, sigma=0.3
+    )
+    assert np.allclose(
+        (broadened * np.diff(energies)).sum(axis=1),
+        (reference * np.diff(energies)).sum(axis=1),
+        rtol=1e-3,
+    )
@@ -0,0 +1,73 @@
+import pytest
+
+import numpy as np
+
+from radtools.crystal.atom import Atom
+from radtools.magnons.dispersion import MagnonDispersion
+from radtools.magnons.topology import BerryCurvature
+from radtools.spinham.hamiltonian import SpinHamiltonian
+
+
+def honeycomb(D):
+    model = SpinHamiltonian(notation="SpinW")
+    model.cell = [[1, 0, 0], [-0.5, np.sqrt(3) / 2, 0], [0, 0, 10]]
+    A = Atom("A", (1 / 3, 2 / 3, 0), spin=[0, 0, 1])
+    B = Atom("B", (2 / 3, 1 / 3, 0), spin=[0, 0, 1])
+    for R in [(0, 0, 0), (-1, 0, 0), (0, 1, 0)]:
+        model.add_bond(A, B, R, iso=-1)
+        model.add_bond(B, A, tuple(-np.array(R)), iso=-1)
+    # Second neighbors, DMI of the magnon Haldane model
+    for R in [(1, 0, 0), (0, 1, 0), (-1, -1, 0)]:
+        for atom, sign in [(A, 1), (B, -1)]:
+            model.add_bond(atom, atom, R, dmi=(0, 0, sign * D))
+            model.add_bond(atom, atom, tuple(-np.array(R)), dmi=(0, 0, -sign * D))
+    return model
+
+
+def test_chern_numbers():
+    dispersion = MagnonDispersion(honeycomb(0.1))
+    berry = BerryCurvature(dispersion, 24, 24)
+    assert (berry.chern_numbers == [1, -1]).all()
+    assert berry.omegas.shape == (24 * 24, 2)
+    assert (berry.omegas[:, 0] <= berry.omegas[:, 1]).all()
+
+    area = np.linalg.norm(
+        np.cross(
+            dispersion.kernel.reciprocal_cell[0], dispersion.kernel.reciprocal_cell[1]
+        )
+    )
+    assert np.allclose(
+        berry.curvature.sum(axis=0) * area / 24**2, [2 * np.pi, -2 * np.pi]
+    )
+
+    # Opposite DMI and opposite orientation of the plane
+    assert (
+        BerryCurvature(MagnonDispersion(honeycomb(-0.1)), 24, 24).chern_numbers
+        == [-1, 1]
+    ).all()
+    assert (
+        BerryCurvature(dispersion, 24, 24, plane=(1, 0)).chern_numbers == [-1, 1]
+    ).all()
+
+
+def test_thermal_hall():
+    kappa = BerryCurvature(MagnonDispersion(honeycomb(0.1)), 24, 24).thermal_hall(
+        [10, 50]
+    )
+    opposite = BerryCurvature(MagnonDispersion(honeycomb(-0.1)), 24, 24).thermal_hall(
+        [10, 50]
+    )
+    assert kappa.shape == (2,)
+    assert (np.abs(kappa) > 1e-3).all()
+    assert np.allclose(kappa, -opposite)
+
+    no_dmi = BerryCurvature(MagnonDispersion(honeycomb(0)), 24, 24)
+    assert np.allclose(no_dmi.thermal_hall([10, 50]), 0)
+
+
+def test_wrong_plane():
+    dispersion = MagnonDispersion(honeycomb(0.1))
+    with pytest.raises(ValueError):
+        BerryCurvature(dispersion, 10, 10, plane=(0, 0))
+    with pytest.raises(ValueError):
+        BerryCurvature(dispersion, 10, 10, plane=(0, 3))
@@ -0,0 +1,181 @@
+import pickle
+from copy import deepcopy
+
+import numpy as np
+import pytest
+
+from radtools.crystal.atom import Atom
+from radtools.spinham.bonds import BondTable
+from radtools.spinham.hamiltonian import SpinHamiltonian
+from radtools.spinham.parameter import ExchangeParameter
+
+
+def test_table():
+    Cr1 = Atom("Cr", (0, 0, 0), index=1)
+    Cr2 = Atom("Cr", (0.5, 0.5, 0), index=2)
+    table = BondTable()
+    bonds = [(Cr1, Cr2, (0, 0, 0)), (Cr2, Cr1, (1, 0, 0)), (Cr1, Cr1, (0, 1, 0))]
+    for n, bond in enumerate(bonds):
+        table[bond] = ExchangeParameter(iso=n + 1)
+    assert len(table) == 3
+    assert list(table) == bonds
+    assert np.allclose(table.J.trace(axis1=1, axis2=2), [3, 6, 9])
+    assert np.allclose(table.R, [(0, 0, 0), (1, 0, 0), (0, 1, 0)])
+    assert table.i.tolist() == [0, 1, 0]
+    assert table.j.tolist() == [1, 0, 0]
+    with pytest.raises(ValueError):
+        table.i[0] = 1
+
+    # Removal moves the last row into the removed one
+    del table[Cr1, Cr2, (0, 0, 0)]
+    assert len(table) == 2
+    assert (Cr1, Cr2, (0, 0, 0)) not in table
+    assert table[Cr1, Cr1, (0, 1, 0)].iso == 3
+    assert table[Cr2, Cr1, (1, 0, 0)].iso == 2
+    with pytest.raises(KeyError):
+        del table[Cr1, Cr2, (0, 0, 0)]
+    with pytest.raises(KeyError):
+        table[Cr1, Cr2, (0, 0, 0)]
+
+    i, j, R, J = table.arrays([Cr2, Cr1])
+    assert i.tolist() == [1, 0]
+    assert j.tolist() == [1, 1]
+
+
+def test_parameter_view():
+    Cr = Atom("Cr", (0, 0, 0), index=1)
+    table = BondTable()
+    table[Cr, Cr, (1, 0, 0)] = ExchangeParameter(iso=1)
+    table[Cr, Cr, (-1, 0, 0)] = ExchangeParameter(iso=2)
+    J = table[Cr, Cr, (1, 0, 0)]
+    assert J is table[Cr, Cr, (1, 0, 0)]
+    J.iso = 5
+    J.xy = 1
+    assert np.allclose(table.J[0], [[5, 1, 0], [0, 5, 0], [0, 0, 5]])
+    table.J[0] *= 2
+    assert J.iso == 10
+
+    # Removed bond keeps the last values
+    del table[Cr, Cr, (1, 0, 0)]
+    assert J.iso == 10
+    J.iso = 1
+    assert table[Cr, Cr, (-1, 0, 0)].iso == 2
+
+    copy = deepcopy(table[Cr, Cr, (-1, 0, 0)])
+    assert type(copy) is ExchangeParameter
+    copy.iso = 3
+    assert table[Cr, Cr, (-1, 0, 0)].iso == 2
+
+
+def test_model():
+    model = SpinHamiltonian(notation="standard")
+    Cr1 = Atom("Cr", (0, 0, 0), index=1, spin=1)
+    Cr2 = Atom("Cr", (0.5, 0.5, 0), index=2, spin=1)
+    model.add_atom(Cr1)
+    model.add_atom(Cr2)
+    for n in range(1, 100):
+        model.add_bond(Cr1, Cr2, (n, 0, 0), iso=n)
+    assert len(model) == 2 * 99
+    assert len(model.bonds) == 2 * 99
+    assert np.allclose(model["Cr__2", "Cr__1", (-7, 0, 0)].iso, 7)
+
+    for n in range(1, 100, 2):
+        del model[Cr1, Cr2, (n, 0, 0)]
+    assert len(model) == 2 * 49
+    for atom1, atom2, R, J in model:
+        assert J.iso == abs(R[0])
+        assert R[0] % 2 == 0
+
+    for other in [deepcopy(model), pickle.loads(pickle.dumps(model))]:
+        assert len(other) == len(model)
+        other[Cr1, Cr2, (2, 0, 0)].iso = 100
+        assert model[Cr1, Cr2, (2, 0, 0)].iso == 2
+
+
+def test_remove_atom():
+    model = SpinHamiltonian()
+    Cr1 = Atom("Cr", (0, 0, 0), index=1)
+    Cr2 = Atom("Cr", (0.5, 0.5, 0), index=2)
+    model.add_bond(Cr1, Cr2, (0, 0, 0), iso=1)
+    model.add_bond(Cr2, Cr2, (1, 0, 0), iso=2)
+    model.add_bond(Cr1, Cr1, (1, 0, 0), iso=3)
+    model.remove_atom(Cr1)
+    assert len(model) == 1
+    assert model.magnetic_atoms == [Cr2]
+
+    # New atom with the same name and index is not confused with the removed one
+    new_Cr1 = Atom("Cr", (0.25, 0, 0), index=1)
+    model.add_bond(new_Cr1, Cr2, (0, 0, 0), iso=4)
+    atom1, atom2, R, J = list(model)[-1]
+    assert atom1 is new_Cr1
+    assert J.iso == 4
+
+
+def test_partners():
+    Cr1 = Atom("Cr", (0, 0, 0), index=1)
+    Cr2 = Atom("Cr", (0.5, 0.5, 0), index=2)
+    table = BondTable()
+    table[Cr1, Cr2, (1, 0, 0)] = np.eye(3)
+    table[Cr1, Cr1, (0, 0, 0)] = np.eye(3)
+    table[Cr1, Cr1, (0, 2, -1)] = np.eye(3)
+    table[Cr2, Cr1, (-1, 0, 0)] = np.eye(3)
+    assert table.partners().tolist() == [3, 1, -1, 0]
+
+
+def test_double_counting_conversion():
+    model = SpinHamiltonian()
+    Cr1 = Atom("Cr", (0, 0, 0), index=1, spin=1)
+    Cr2 = Atom("Cr", (0.5, 0.5, 0), index=2, spin=2)
+    model.add_bond(Cr1, Cr2, (0, 0, 0), matrix=[[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+    model.add_bond(Cr2, Cr1, (1, 0, 0), iso=2)
+    model.add_bond(Cr1, Cr1, (0, -1, 0), iso=3)
+    model.add_bond(Cr1, Cr1, (0, 0, 0), iso=4)
+    model.set_interpretation(double_counting=False, spin_normalized=True, factor=1)
+    J = model[Cr2, Cr1, (1, 0, 0)]
+
+    model.notation = (True, False, -1)
+    assert len(model) == 7
+    assert np.allclose(
+        model[Cr2, Cr1, (0, 0, 0)].matrix,
+        -np.array([[1, 4, 7], [2, 5, 8], [3, 6, 9]]) / 4,
+    )
+    assert model[Cr1, Cr2, (-1, 0, 0)].iso == -0.5
+    assert model[Cr1, Cr1, (0, 1, 0)].iso == -1.5
+    # On-site terms are not affected by double counting
+    assert model[Cr1, Cr1, (0, 0, 0)].iso == -4
+    assert J.iso == -0.5
+
+    model.notation = (False, True, 1)
+    assert len(model) == 4
+    assert (Cr2, Cr1, (1, 0, 0)) in model
+    assert (Cr1, Cr2, (-1, 0, 0)) not in model
+    assert (Cr1, Cr1, (0, 1, 0)) in model
+    assert model[Cr1, Cr1, (0, 1, 0)].iso == 3
+    assert J.iso == 2
+
+
+def test_update():
+    Cr1 = Atom("Cr", (0, 0, 0), index=1)
+    Cr2 = Atom("Cr", (0.5, 0.5, 0), index=2)
+    Cr3 = Atom("Cr", (0.5, 0, 0), index=3)
+    table = BondTable()
+    table[Cr1, Cr2, (1, 0, 0)] = np.eye(3)
+    J = table[Cr1, Cr2, (1, 0, 0)]
+    table.update(
+        [0, 1, 2, 1],
+        [1, 0, 0, 0],
+        [(1, 0, 0), (0, 0, 0), (0, 1, 0), (0, 0, 0)],
+        [2 * np.eye(3), 3 * np.eye(3), 4 * np.eye(3), 5 * np.eye(3)],
+        atoms=[Cr1, Cr2, Cr3],
+    )
+    assert len(table) == 3
+    assert J.iso == 2
+    assert table[Cr2, Cr1, (0, 0, 0)].iso == 5
+    assert table[Cr3, Cr1, (0, 1, 0)].iso == 4
+
+    table.update(
+        [0, 0], [1, 2], [(1, 0, 0), (0, 0, 1)], np.zeros((2, 3, 3)), overwrite=False
+    )
+    assert len(table) == 4
+    assert J.iso == 2
+    assert table[Cr1, Cr3, (0, 0, 1)].iso == 0
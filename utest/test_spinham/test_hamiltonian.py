@@ -703,3 +703,177 @@ def test_add_remove_bond_with_notation():
     model.remove_bond(Cr2, Cr1, (0, 0, 0))
     assert (Cr1, Cr2, (0, 0, 0)) not in model
     assert (Cr2, Cr1, (0, 0, 0)) not in model
+
+
+def test_exchange_fourier():
+    model = SpinHamiltonian()
+    model.cell = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+    Cr1 = Atom("Cr1", (0, 0, 0), spin=2)
+    Cr2 = Atom("Cr2", (0.5, 0, 0), spin=1)
+    model.add_bond(Cr1, Cr2, (0, 0, 0), iso=1, dmi=(0, 0, 0.3))
+    model.add_bond(Cr1, Cr1, (0, -1, 0), iso=2)
+    model.add_bond(Cr2, Cr1, (0, 0, -3), iso=3, aniso=np.diag([1, 2, -3]))
+    model.notation = (False, False, -1)
+
+    kpoints = np.random.default_rng(5).normal(size=(4, 3))
+    J = model.exchange_fourier(kpoints)
+    assert J.shape == (4, 6, 6)
+    assert np.allclose(J, np.conjugate(np.transpose(J, (0, 2, 1))))
+    assert np.allclose(
+        model.exchange_fourier([0.1, 0.2, 0.3], relative=True),
+        model.exchange_fourier(np.array([0.1, 0.2, 0.3]) @ model.reciprocal_cell),
+    )
+
+    # Energy of the ferromagnetic state
+    for theta, phi in [(0, 0), (90, 0), (90, 90), (30, 45)]:
+        direction = np.array(
+            [
+                np.cos(np.radians(phi)) * np.sin(np.radians(theta)),
+                np.sin(np.radians(phi)) * np.sin(np.radians(theta)),
+                np.cos(np.radians(theta)),
+            ]
+        )
+        e = np.tile(direction, 2)
+        assert np.allclose(
+            e @ model.exchange_fourier([0, 0, 0])[0] @ e,
+            model.ferromagnetic_energy(theta=theta, phi=phi),
+        )
+
+
+@pytest.mark.parametrize("J1, J2", [(-1, 0.5), (-1, 1), (1, 0.5)])
+def test_luttinger_tisza_chain(J1, J2):
+    model = SpinHamiltonian(notation="SpinW")
+    model.cell = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+    Fe = Atom("Fe", (0, 0, 0), spin=1)
+    for R, J in [((1, 0, 0), J1), ((2, 0, 0), J2)]:
+        model.add_bond(Fe, Fe, R, iso=J)
+        model.add_bond(Fe, Fe, tuple(-np.array(R)), iso=J)
+
+    Q, n, energy = model.luttinger_tisza(n1=12, n2=1, n3=1)
+    # Spiral, if |J1| < 4 J2
+    cos = np.clip(-J1 / (4 * J2), -1, 1)
+    assert np.allclose(abs(Q[0]), np.arccos(cos) / 2 / np.pi, atol=1e-5)
+    expected = 2 * (J1 * cos + J2 * (2 * cos**2 - 1))
+    assert np.allclose(energy, expected)
+    assert np.allclose(np.linalg.norm(n), 1)
+
+
+def test_luttinger_tisza_antiferromagnet():
+    model = SpinHamiltonian(notation="SpinW")
+    model.cell = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+    Fe1 = Atom("Fe1", (0, 0, 0), spin=1)
+    Fe2 = Atom("Fe2", (0.5, 0.5, 0.5), spin=1)
+    for R in np.indices((2, 2, 2)).reshape((3, -1)).T:
+        model.add_bond(Fe1, Fe2, tuple(-R), iso=1)
+        model.add_bond(Fe2, Fe1, tuple(R), iso=1)
+
+    Q, _, energy = model.luttinger_tisza(n1=4, n2=4, n3=4)
+    assert np.allclose(Q, 0)
+    assert np.allclose(energy, -16)
+    _, _, energy = model.luttinger_tisza(n1=4, n2=4, n3=4, symmetry=True, refine=False)
+    assert np.allclose(energy, -16)
+
+
+def test_curie_temperature():
+    from radtools.constants import K_BOLTZMANN
+
+    model = SpinHamiltonian(notation="SpinW")
+    model.cell = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+    Fe = Atom("Fe", (0, 0, 0), spin=2)
+    for R in [(1, 0, 0), (0, 1, 0), (0, 0, 1)]:
+        model.add_bond(Fe, Fe, R, iso=-1)
+        model.add_bond(Fe, Fe, tuple(-np.array(R)), iso=-1)
+
+    # 2/3 * z * J * S^2
+    mean_field = model.curie_temperature(method="mean-field")
+    assert np.allclose(mean_field * K_BOLTZMANN, 16)
+    # Watson integral of the simple cubic lattice
+    rpa = model.curie_temperature(method="RPA")
+    assert abs(mean_field / rpa - 1.516386) < 1e-3
+    assert np.allclose(model.curie_temperature(quantum=True), rpa * 3 / 2, rtol=1e-3)
+
+    with pytest.raises(ValueError):
+        model.curie_temperature(method="monte-carlo")
+
+
+def test_curie_temperature_sublattices():
+    Fe = Atom("Fe", (0, 0, 0), spin=1)
+    primitive = SpinHamiltonian(notation="SpinW")
+    primitive.cell = [[-0.5, 0.5, 0.5], [0.5, -0.5, 0.5], [0.5, 0.5, -0.5]]
+    for R in [(1, 0, 0), (0, 1, 0), (0, 0, 1), (1, 1, 1)]:
+        primitive.add_bond(Fe, Fe, R, iso=-1)
+        primitive.add_bond(Fe, Fe, tuple(-np.array(R)), iso=-1)
+
+    conventional = SpinHamiltonian(notation="SpinW")
+    conventional.cell = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+    Fe1 = Atom("Fe1", (0, 0, 0), spin=1)
+    Fe2 = Atom("Fe2", (0.5, 0.5, 0.5), spin=1)
+    for R in np.indices((2, 2, 2)).reshape((3, -1)).T:
+        conventional.add_bond(Fe1, Fe2, tuple(-R), iso=-1)
+        conventional.add_bond(Fe2, Fe1, tuple(R), iso=-1)
+
+    for method in ["mean-field", "rpa"]:
+        assert np.allclose(
+            primitive.curie_temperature(method=method),
+            conventional.curie_temperature(method=method),
+            rtol=1e-3,
+        )
+
+
+def test_add_bonds():
+    Cr1 = Atom("Cr", (0, 0, 0), index=1, spin=1)
+    Cr2 = Atom("Cr", (0.5, 0.5, 0.5), index=2, spin=1)
+    i, j, R = [0, 1, 0], [1, 0, 0], [(0, 0, 0), (1, 0, 0), (0, 0, 1)]
+    J = [np.diag([1, 2, 3]), np.eye(3), 3 * np.eye(3)]
+
+    model = SpinHamiltonian()
+    model.add_bonds(i, j, R, J, atoms=[Cr1, Cr2])
+    assert len(model.atoms) == 2
+    assert len(model) == 3
+
+    model = SpinHamiltonian(notation="standard")
+    model.add_bonds(i, j, R, J, atoms=[Cr1, Cr2])
+    assert len(model) == 6
+    assert np.allclose(model[Cr2, Cr1, (0, 0, 0)].matrix, np.diag([1, 2, 3]))
+    assert model[Cr1, Cr2, (-1, 0, 0)].iso == 1
+
+    model.add_bonds([1], [0], [(0, 0, 0)], 5)
+    assert len(model) == 6
+    assert model[Cr2, Cr1, (0, 0, 0)].iso == 5
+    assert np.allclose(model[Cr1, Cr2, (0, 0, 0)].matrix, np.diag([1, 2, 3]))
+
+    # Equivalent to the bonds added one by one
+    reference = SpinHamiltonian(notation="standard")
+    for k in range(3):
+        atoms = [Cr1, Cr2]
+        reference.add_bond(atoms[i[k]], atoms[j[k]], R[k], matrix=J[k])
+    reference.add_bond(Cr2, Cr1, (0, 0, 0), iso=5)
+    assert len(reference) == len(model)
+    for atom1, atom2, R, J in reference:
+        assert np.allclose(model[atom1, atom2, R].matrix, J.matrix)
+
+
+def test_make_template():
+    model = SpinHamiltonian(notation="standard")
+    model.add_atom(Atom("Fe", (0, 0, 0), index=1, spin=1))
+    model.add_atom(Atom("Fe", (0.5, 0.5, 0.5), index=2, spin=1))
+    i, j, R, d = model.find_neighbors(1.5)
+    model.add_bonds(i, j, R, np.random.default_rng(0).normal(size=(len(i), 3, 3)))
+
+    template = model.make_template()
+    assert list(template.names) == ["J1", "J2", "J3"]
+    assert template.latex_names["J1"] == "$J_{1}$"
+    assert [len(bonds) for bonds in template.names.values()] == [16, 12, 24]
+    assert ("Fe__1", "Fe__2", (0, 0, 0)) in template.names["J1"]
+    assert len(model.formed_model(template)) == len(model)
+
+    model.symmetrize()
+    for name in template.names:
+        iso = [
+            model[model.get_atom(atom1), model.get_atom(atom2), R].iso
+            for atom1, atom2, R in template.names[name]
+        ]
+        assert np.allclose(iso, iso[0])
+    # Inversion centre in the middle of every bond
+    for atom1, atom2, R, J in model:
+        assert np.allclose(J.dmi, 0)